@@ -0,0 +1,111 @@
+"""
+How many alerts would each interval setting have fired on recorded prices?
+
+Reads a tick log written with `src/main.py --record` or a CSV (either with a
+header containing a "price" column, or Binance's historical trades format:
+id,price,qty,quote_qty,time,...) and runs IntervalTracker.process_prices()
+over it once per interval.
+
+Usage:
+    python scripts/backtest_intervals.py ticks.bin [--intervals 10,25,50,100,250,500]
+    python scripts/backtest_intervals.py BTCUSDT-trades-2024-03-12.csv --aggregate
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.interval_logic import IntervalTracker
+from core.tick_recorder import TICK_LOG_MAGIC, load_tick_log
+
+TIME_COLUMNS = ("time", "timestamp", "event_time", "trade_time", "t")
+
+
+def load_csv(path, price_col=None, time_col=None):
+    """(prices, times in ms or None) from a CSV file."""
+    with open(path) as f:
+        first = f.readline().strip().split(",")
+    # Binance rows end in true/false flags, so only a non-numeric id/price means a header
+    try:
+        [float(x) for x in first[:2]]
+        header = None
+    except ValueError:
+        header = [name.strip().lower() for name in first]
+    if header:
+        if price_col is None:
+            price_col = header.index("price")
+        if time_col is None:
+            time_col = next((header.index(name) for name in TIME_COLUMNS if name in header), None)
+    else:
+        if price_col is None:
+            price_col = 1 if len(first) > 1 else 0
+        if time_col is None and len(first) >= 5:
+            time_col = 4  # Binance trades CSV
+    cols = [price_col] + ([time_col] if time_col is not None else [])
+    data = np.loadtxt(path, delimiter=",", skiprows=1 if header else 0, usecols=cols, ndmin=2)
+    prices = data[:, 0]
+    times = None
+    if time_col is not None:
+        times = data[:, 1]
+        if len(times) and times[0] > 1e14:
+            times = times / 1000.0  # Microsecond timestamps
+    return prices, times
+
+
+def load_prices(path, price_col=None, time_col=None):
+    with open(path, "rb") as f:
+        magic = f.read(len(TICK_LOG_MAGIC))
+    if magic == TICK_LOG_MAGIC:
+        ticks = load_tick_log(path)
+        return np.asarray(ticks["price"]), np.asarray(ticks["event_time"], dtype=np.float64)
+    return load_csv(path, price_col, time_col)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest alert intervals on recorded prices")
+    parser.add_argument("path", help="Tick log (--record) or CSV file")
+    parser.add_argument("--intervals", default="10,25,50,100,250,500,1000", help="Comma-separated intervals in USD")
+    parser.add_argument("--aggregate", action="store_true",
+                        help="Also count alerts with aggregate_crossings (one per gap move)")
+    parser.add_argument("--price-col", type=int, help="CSV price column index")
+    parser.add_argument("--time-col", type=int, help="CSV time column index (ms or us)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    prices, times = load_prices(args.path, args.price_col, args.time_col)
+    load_s = time.perf_counter() - start
+    if len(prices) == 0:
+        print("No prices found")
+        return
+    hours = (times[-1] - times[0]) / 3_600_000 if times is not None and len(times) > 1 else 0
+    span = f", {hours:.1f} h" if hours else ""
+    print(f"{len(prices):,} ticks{span}, price {prices.min():,.2f} - {prices.max():,.2f} (loaded in {load_s:.2f}s)")
+    print()
+
+    header = f"{'interval':>9} {'alerts':>9} {'up':>8} {'down':>8} {'gap_moves':>10}"
+    if args.aggregate:
+        header += f" {'aggregated':>11}"
+    if hours:
+        header += f" {'alerts/h':>9}"
+    print(header + f" {'Mticks/s':>9}")
+    for interval in (float(i) for i in args.intervals.split(",")):
+        start = time.perf_counter()
+        events = IntervalTracker(interval).process_prices(prices)
+        elapsed = time.perf_counter() - start
+        up = int((events["direction"] > 0).sum())
+        per_tick = np.bincount(events["tick"]) if len(events) else np.zeros(0, dtype=np.int64)
+        gap_moves = int((per_tick > 1).sum())
+        row = f"{interval:>9g} {len(events):>9} {up:>8} {len(events) - up:>8} {gap_moves:>10}"
+        if args.aggregate:
+            row += f" {int((per_tick > 0).sum()):>11}"
+        if hours:
+            row += f" {len(events) / hours:>9.1f}"
+        print(row + f" {len(prices) / elapsed / 1e6 if elapsed else 0:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
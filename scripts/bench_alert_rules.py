@@ -0,0 +1,99 @@
+"""
+Per-tick cost of RuleEngine with 10 and 10,000 rules.
+
+Rules are a mix of absolute levels (spread around the start price), interval
+grids, percent moves and range breakouts. A levels-only set is also run
+through a naive loop that checks every rule on every tick, to show what the
+sorted-level index saves.
+
+Usage:
+    python scripts/bench_alert_rules.py [--ticks 200000] [--rules 10,10000] [--naive-ticks 20000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.alert_rules import GridRule, LevelRule, PercentRule, RangeBreakoutRule, RuleEngine
+from simulator.price_paths import make_path
+
+
+def make_rules(n, start, rng):
+    """About 97% levels, the rest grids, percents and breakouts."""
+    rules = []
+    for i in range(n):
+        r = i % 100
+        if r < 1:
+            rules.append(GridRule(rng.choice((10.0, 50.0, 100.0, 500.0))))
+        elif r < 2:
+            rules.append(PercentRule(rng.choice((0.5, 1.0, 2.0))))
+        elif r < 3:
+            rules.append(RangeBreakoutRule(rng.choice((60.0, 300.0, 3600.0))))
+        else:
+            rules.append(LevelRule(round(start + rng.gauss(0, 1500)), rng.choice((None, "UP", "DOWN"))))
+    return rules
+
+
+def run_engine(rules, prices, times):
+    engine = RuleEngine(rules)
+    fired = [0]
+    engine.rule_triggered.connect(lambda rule, level, d: fired.__setitem__(0, fired[0] + 1))
+    start = time.perf_counter()
+    for price, now in zip(prices, times):
+        engine.process_price(price, now)
+    return time.perf_counter() - start, fired[0]
+
+
+def run_naive(rules, prices, on_fire):
+    """Every level rule checked on every tick."""
+    prev = prices[0]
+    start = time.perf_counter()
+    for price in prices[1:]:
+        for rule in rules:
+            level = rule.price
+            if prev < level < price or prev > level > price:
+                on_fire(rule, level)
+        prev = price
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=200_000)
+    parser.add_argument("--rules", default="10,10000", help="Comma-separated rule counts")
+    parser.add_argument("--naive-ticks", type=int, default=20_000, help="Ticks for the naive scan (it is slow)")
+    args = parser.parse_args()
+
+    path = make_path("gap_jump", step=5.0, gap=250.0, gap_prob=0.001, seed=1)
+    prices = [round(path.next_price(), 2) for _ in range(args.ticks)]
+    times = [i * 0.01 for i in range(args.ticks)]  # 100 trades/sec
+    counts = [int(c) for c in args.rules.split(",")]
+    print(f"{args.ticks:,} ticks, price {min(prices):,.0f} - {max(prices):,.0f}")
+
+    print()
+    print("Mixed rules (levels, grids, percents, breakouts)")
+    print(f"{'rules':>7} {'us/tick':>9} {'ticks/s':>10} {'fired/tick':>11}")
+    for n in counts:
+        elapsed, fired = run_engine(make_rules(n, prices[0], random.Random(n)), prices, times)
+        print(f"{n:>7} {elapsed / len(prices) * 1e6:>9.2f} {len(prices) / elapsed:>10,.0f} "
+              f"{fired / len(prices):>11.3f}")
+
+    print()
+    print(f"Levels only: index vs checking every rule ({args.naive_ticks:,} ticks)")
+    print(f"{'rules':>7} {'index us/tick':>14} {'naive us/tick':>14} {'speedup':>8}")
+    sample, sample_times = prices[:args.naive_ticks], times[:args.naive_ticks]
+    for n in counts:
+        rng = random.Random(n)
+        levels = [LevelRule(round(prices[0] + rng.gauss(0, 1500))) for _ in range(n)]
+        elapsed, fired = run_engine(levels, sample, sample_times)
+        hits = []
+        naive_elapsed = run_naive(levels, sample, lambda rule, level: hits.append(level))
+        us, naive_us = elapsed / len(sample) * 1e6, naive_elapsed / len(sample) * 1e6
+        print(f"{n:>7} {us:>14.2f} {naive_us:>14.2f} {naive_us / us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
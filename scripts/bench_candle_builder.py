@@ -0,0 +1,82 @@
+"""
+Benchmark: incremental candle building.
+
+Feeds synthetic ticks (random walk, 0-200 ms apart) through CandleBuilder
+and reports ns/tick and bars closed per timeframe. The same bars are then
+rebuilt in one vectorized NumPy pass over the whole tick array, to check the
+incremental result and to show what a from-scratch recompute costs each
+time candles are needed.
+
+Usage:
+    python scripts/bench_candle_builder.py [--ticks 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.candle_builder import CandleBuilder, DEFAULT_TIMEFRAMES
+
+
+def synth_ticks(n, seed=7):
+    rng = np.random.default_rng(seed)
+    times = 1_700_000_000_000 + np.cumsum(rng.integers(0, 200, n))
+    prices = 95000.0 + np.cumsum(rng.uniform(-5.0, 5.0, n))
+    qtys = rng.uniform(0.001, 1.0, n)
+    return times, prices, qtys
+
+
+def recompute(times, prices, qtys, ms):
+    """All bars from scratch: group by bucket with reduceat."""
+    buckets = times - times % ms
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    return {
+        "open_time": buckets[starts],
+        "open": prices[starts],
+        "high": np.maximum.reduceat(prices, starts),
+        "low": np.minimum.reduceat(prices, starts),
+        "close": prices[np.r_[starts[1:] - 1, len(prices) - 1]],
+        "volume": np.add.reduceat(qtys, starts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    times, prices, qtys = synth_ticks(args.ticks)
+    hours = (times[-1] - times[0]) / 3_600_000
+    print(f"{args.ticks:,} ticks covering {hours:.1f}h")
+
+    # Keep every closed bar so the whole run can be checked
+    builder = CandleBuilder(history=args.ticks)
+    closed = [0]
+    builder.bar_closed.connect(lambda tf, bar: closed.__setitem__(0, closed[0] + 1))
+    t_list, p_list, q_list = times.tolist(), prices.tolist(), qtys.tolist()
+
+    start = time.perf_counter()
+    add = builder.add
+    for t, p, q in zip(t_list, p_list, q_list):
+        add(t, p, q)
+    elapsed = time.perf_counter() - start
+    print(f"incremental: {elapsed:.2f}s, {elapsed / args.ticks * 1e9:,.0f} ns/tick "
+          f"({len(DEFAULT_TIMEFRAMES)} timeframes), {closed[0]:,} bar_closed events")
+
+    print(f"{'tf':<4} {'bars':>9} {'recompute_ms':>13} {'match':>6}")
+    for tf, ms in DEFAULT_TIMEFRAMES.items():
+        start = time.perf_counter()
+        ref = recompute(times, prices, qtys, ms)
+        ref_ms = (time.perf_counter() - start) * 1000
+        bars = builder.bars(tf)
+        n = len(bars)  # The open bar is not closed yet
+        match = all(np.allclose(bars[k], ref[k][:n]) for k in ref) and n == len(ref["open"]) - 1
+        print(f"{tf:<4} {n:>9,} {ref_ms:>13.1f} {'yes' if match else 'NO':>6}")
+
+
+if __name__ == "__main__":
+    main()
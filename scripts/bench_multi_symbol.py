@@ -0,0 +1,133 @@
+"""
+Benchmark: CPU and memory per symbol for PriceMonitor ingestion.
+
+Compares one combined-stream connection (multi-symbol mode) against one
+connection per symbol, at 1, 10 and 100 symbols. The stand-in server runs in
+a subprocess so its CPU is not counted against the client.
+
+Usage:
+    python scripts/bench_multi_symbol.py [--rate 10] [--duration 5] [--counts 1,10,100]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PyQt6.QtCore import Qt
+
+from core.price_monitor import PriceMonitor
+
+
+def current_rss_kb():
+    """Resident set size in KB (Linux /proc), or None where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def start_server(port, rate):
+    server_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'simulator', 'binance_server.py')
+    proc = subprocess.Popen(
+        [sys.executable, server_script, "--port", str(port), "--rate", str(rate)],
+        stdout=subprocess.PIPE, text=True
+    )
+    proc.stdout.readline()  # Wait for "listening" banner
+    return proc
+
+
+def run_case(base_url, n_symbols, mode, duration):
+    symbols = [f"sym{i:03d}usdt" for i in range(n_symbols)]
+    received = [0]
+    lock = threading.Lock()
+
+    def on_tick(*_):
+        with lock:
+            received[0] += 1
+
+    tracemalloc.start()
+    rss_before = current_rss_kb()
+    if mode == "combined":
+        monitors = [PriceMonitor(symbols=symbols, base_url=base_url)]
+        monitors[0].symbol_price_updated.connect(on_tick, Qt.ConnectionType.DirectConnection)
+    else:
+        monitors = [PriceMonitor(symbol=s, base_url=base_url) for s in symbols]
+        for m in monitors:
+            m.price_updated.connect(on_tick, Qt.ConnectionType.DirectConnection)
+
+    for m in monitors:
+        m.start()
+    time.sleep(1.0)  # Let connections settle before measuring
+
+    with lock:
+        received[0] = 0
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    time.sleep(duration)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    with lock:
+        msgs = received[0]
+    threads = threading.active_count()
+
+    py_mem, _ = tracemalloc.get_traced_memory()
+    rss_after = current_rss_kb()
+    tracemalloc.stop()
+
+    for m in monitors:
+        m.keep_running = False
+        if m.ws:
+            m.ws.close()
+    for m in monitors:
+        if m.thread:
+            m.thread.join(timeout=2.0)
+
+    rss_delta = (rss_after - rss_before) if rss_before is not None and rss_after is not None else None
+    return {
+        "msgs_per_sec": msgs / wall,
+        "cpu_pct": cpu / wall * 100,
+        "cpu_us_per_msg": (cpu / msgs * 1e6) if msgs else float("nan"),
+        "cpu_pct_per_symbol": cpu / wall * 100 / n_symbols,
+        "py_kb_per_symbol": py_mem / 1024 / n_symbols,
+        "rss_kb_per_symbol": (rss_delta / n_symbols) if rss_delta is not None else None,
+        "threads": threads,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9555)
+    parser.add_argument("--rate", type=float, default=10.0, help="Msgs/sec per symbol")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--counts", default="1,10,100")
+    parser.add_argument("--modes", default="combined,single")
+    args = parser.parse_args()
+
+    server = start_server(args.port, args.rate)
+    base_url = f"ws://127.0.0.1:{args.port}"
+    try:
+        # Warm-up so lazy imports and first-connection costs don't land on the first row
+        run_case(base_url, 1, "combined", 0.5)
+        print(f"{'mode':<9} {'symbols':>7} {'msg/s':>9} {'cpu%':>7} {'us/msg':>8} "
+              f"{'cpu%/sym':>9} {'pyKB/sym':>9} {'rssKB/sym':>10} {'threads':>8}")
+        for mode in args.modes.split(","):
+            for n in (int(c) for c in args.counts.split(",")):
+                r = run_case(base_url, n, mode, args.duration)
+                rss = f"{r['rss_kb_per_symbol']:.1f}" if r["rss_kb_per_symbol"] is not None else "n/a"
+                print(f"{mode:<9} {n:>7} {r['msgs_per_sec']:>9.1f} {r['cpu_pct']:>7.2f} "
+                      f"{r['cpu_us_per_msg']:>8.1f} {r['cpu_pct_per_symbol']:>9.3f} "
+                      f"{r['py_kb_per_symbol']:>9.1f} {rss:>10} {r['threads']:>8}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Cache hit rate and CPU cost of predictive alert pre-synthesis.
+
+Replays a simulated price path in (compressed) real time through
+IntervalTracker. Each crossing is spoken from the cache if present,
+otherwise synthesized on the spot; synthesis is simulated by burning CPU for
+--synth-ms, and a live synthesis aborts the prefetch in flight as in
+TTSService. The run is repeated with AlertWarmer + SpeechPrefetcher filling
+the cache ahead of the price, and the hit rate, the phrases prefetched per
+alert and the CPU spent on them are compared.
+
+Usage:
+    python scripts/bench_prefetch.py [--ticks 3000] [--tick-ms 5] [--synth-ms 150] [--interval 50]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.alert_warmer import AlertWarmer
+from core.interval_logic import IntervalTracker
+from services.speech_prefetcher import SpeechPrefetcher
+from simulator.price_paths import make_path
+from utils.alert_text import crossing_text
+
+
+class SimulatedSpeech:
+    """The cache logic of TTSService with synthesis replaced by a CPU burn."""
+
+    def __init__(self, synth_ms):
+        self.synth_s = synth_ms / 1000.0
+        self.cache = set()
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+        self.live_cpu_s = 0.0
+        self.abort = threading.Event()  # The RunOptions terminate flag of TTSService
+        self.prefetcher = SpeechPrefetcher(self._prefetch_one, self._is_cached, self.abort.set)
+
+    def _is_cached(self, key):
+        with self.lock:
+            return key in self.cache
+
+    def _synthesize(self, key, abort=None):
+        end = time.perf_counter() + self.synth_s
+        while time.perf_counter() < end:
+            if abort is not None and abort.is_set():
+                return False
+        with self.lock:
+            self.cache.add(key)
+        return True
+
+    def _prefetch_one(self, key):
+        self.abort.clear()
+        if self.prefetcher.interrupt_pending:
+            self.abort.set()
+        return self._synthesize(key, self.abort)
+
+    def speak(self, key):
+        """Runs on a thread per alert, like TTSService._process_speech."""
+        if not self._is_cached(key):
+            self.prefetcher.wait_for(key)
+        if self._is_cached(key):
+            self.hits += 1
+            return
+        self.misses += 1
+        self.prefetcher.live_started()
+        cpu = time.process_time()
+        try:
+            self._synthesize(key)
+        finally:
+            self.live_cpu_s += time.process_time() - cpu
+            self.prefetcher.live_finished()
+
+
+def run(prices, args, warm):
+    speech = SimulatedSpeech(args.synth_ms)
+    tracker = IntervalTracker(args.interval)
+    evaluators = [tracker]
+    phrase = lambda price, direction: (crossing_text("English", price, direction), "F1", "en")
+    if warm:
+        speech.prefetcher.start()
+        evaluators.append(AlertWarmer(tracker, phrase, speech.prefetcher.want))
+    threads = []
+
+    def on_crossed(price, direction):
+        t = threading.Thread(target=speech.speak, args=(phrase(price, direction),))
+        t.start()
+        threads.append(t)
+
+    tracker.interval_crossed.connect(on_crossed)
+    tick_s = args.tick_ms / 1000.0
+    start = time.perf_counter()
+    for i, price in enumerate(prices):
+        for evaluator in evaluators:
+            evaluator.process_price(price)
+        delay = start + (i + 1) * tick_s - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    for t in threads:
+        t.join()
+    speech.prefetcher.stop()
+    return speech
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=3000)
+    parser.add_argument("--tick-ms", type=float, default=5.0, help="Wall time between simulated ticks")
+    parser.add_argument("--synth-ms", type=float, default=150.0, help="Simulated synthesis time per phrase")
+    parser.add_argument("--interval", type=float, default=50.0)
+    args = parser.parse_args()
+
+    path = make_path("gap_jump", step=4.0, gap=120.0, gap_prob=0.002, seed=7)
+    prices = [path.next_price() for _ in range(args.ticks)]
+    print(f"{args.ticks} ticks over {args.ticks * args.tick_ms / 1000:.1f}s, "
+          f"price {min(prices):,.0f} - {max(prices):,.0f}, interval {args.interval:g}, "
+          f"synthesis {args.synth_ms:g} ms")
+    print()
+    print(f"{'warmer':>7} {'alerts':>7} {'hit rate':>9} {'prefetched':>11} {'per alert':>10} "
+          f"{'warm cpu s':>11} {'live cpu s':>11}")
+    for warm in (False, True):
+        speech = run(prices, args, warm)
+        alerts = speech.hits + speech.misses
+        stats = speech.prefetcher.stats()
+        print(f"{'on' if warm else 'off':>7} {alerts:>7} {speech.hits / max(alerts, 1):>9.0%} "
+              f"{stats['prefetched']:>11} {stats['prefetched'] / max(alerts, 1):>10.2f} "
+              f"{stats['cpu_s']:>11.2f} {speech.live_cpu_s:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
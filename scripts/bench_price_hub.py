@@ -0,0 +1,141 @@
+"""
+Fan-out cost of the local price hub, measured against the local stand-in.
+
+Starts src/simulator/binance_server.py and src/core/price_hub.py in
+subprocesses, then for each client count connects that many raw hub
+subscribers (one selector thread in this process) to btcusdt. Reports
+records/sec per client, hub -> client latency (hub receive time stamped in
+each record vs client receive time) and the hub's CPU use. However many
+clients there are, the stand-in only ever sees one upstream connection.
+
+Usage:
+    python scripts/bench_price_hub.py [--rate 1000] [--clients 1,10,50] [--duration 5]
+"""
+import argparse
+import os
+import selectors
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.hub_protocol import HUB_DTYPE, connect_hub, encode_request
+from core.latency import LatencyHistogram
+
+import numpy as np
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+SERVER_SCRIPT = os.path.join(SRC_DIR, 'simulator', 'binance_server.py')
+HUB_SCRIPT = os.path.join(SRC_DIR, 'core', 'price_hub.py')
+
+
+def cpu_seconds(pid):
+    """User + system CPU of another process (Linux only; None elsewhere)."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def measure(address, n_clients, duration, hub_pid):
+    sel = selectors.DefaultSelector()
+    socks = []
+    for _ in range(n_clients):
+        sock = connect_hub(address)
+        sock.sendall(encode_request("SUBSCRIBE", ["btcusdt"], 1))
+        sock.setblocking(False)
+        sel.register(sock, selectors.EVENT_READ, bytearray())
+        socks.append(sock)
+
+    hist = LatencyHistogram()
+    counts = [0]
+    measuring = threading.Event()
+    done = threading.Event()
+    size = HUB_DTYPE.itemsize
+
+    def reader():
+        while not done.is_set():
+            for key, _ in sel.select(timeout=0.1):
+                try:
+                    data = key.fileobj.recv(65536)
+                except BlockingIOError:
+                    continue
+                now_ns = time.time_ns()
+                buf = key.data
+                buf += data
+                n = len(buf) // size
+                if not n:
+                    continue
+                recs = np.frombuffer(bytes(buf[:n * size]), dtype=HUB_DTYPE)
+                del buf[:n * size]
+                if measuring.is_set():
+                    counts[0] += n
+                    for hub_ns in recs["recv_time"].tolist():
+                        hist.record((now_ns - hub_ns) // 1000)
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    time.sleep(1.0)  # Subscribe and skip the snapshot records
+    cpu0 = cpu_seconds(hub_pid)
+    measuring.set()
+    time.sleep(duration)
+    measuring.clear()
+    cpu1 = cpu_seconds(hub_pid)
+    done.set()
+    thread.join()
+    for sock in socks:
+        sel.unregister(sock)
+        sock.close()
+    return {
+        "recs": counts[0] / duration / n_clients,
+        "p50": hist.percentile(50) / 1000,
+        "p99": hist.percentile(99) / 1000,
+        "max": hist.max / 1000,
+        "hub_cpu": None if cpu0 is None else (cpu1 - cpu0) / duration * 100,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9558)
+    parser.add_argument("--rate", type=float, default=1000.0, help="Trades/sec")
+    parser.add_argument("--clients", default="1,10,50", help="Comma-separated subscriber counts")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per client count")
+    args = parser.parse_args()
+
+    address = os.path.join(tempfile.mkdtemp(), "hub.sock") if hasattr(os, "fork") else "127.0.0.1:9561"
+    server = subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT, "--port", str(args.port), "--rate", str(args.rate), "--seed", "1"],
+        stdout=subprocess.PIPE, text=True
+    )
+    server.stdout.readline()  # Wait for "listening" banner
+    hub = subprocess.Popen(
+        [sys.executable, HUB_SCRIPT, "--address", address, "--ws", f"ws://127.0.0.1:{args.port}",
+         "--board", f"bittalker_bench_{os.getpid()}"],
+        stdout=subprocess.PIPE, text=True
+    )
+    hub.stdout.readline()
+    try:
+        rows = [(n, measure(address, n, args.duration, hub.pid))
+                for n in (int(c) for c in args.clients.split(","))]
+    finally:
+        hub.terminate()
+        hub.wait()
+        server.terminate()
+        server.wait()
+
+    print()
+    print(f"stand-in: {args.rate:g} trades/sec, 1 upstream connection, {args.duration:g}s per row")
+    print(f"{'clients':>7} {'recs/s/client':>14} {'p50_ms':>7} {'p99_ms':>7} {'max_ms':>7} {'hub_cpu%':>9}")
+    for n, r in rows:
+        cpu = "n/a" if r["hub_cpu"] is None else f"{r['hub_cpu']:.1f}"
+        print(f"{n:>7} {r['recs']:>14.1f} {r['p50']:>7.2f} {r['p99']:>7.2f} {r['max']:>7.2f} {cpu:>9}")
+
+
+if __name__ == "__main__":
+    main()
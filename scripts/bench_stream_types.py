@@ -0,0 +1,103 @@
+"""
+Message rate by Binance stream type, measured against the local stand-in.
+
+Starts src/simulator/binance_server.py in a subprocess and, for each stream
+type, runs a PriceMonitor on that stream for a few seconds. Reports
+messages/sec, wire bytes/sec (frame payloads as received), distinct price
+updates/sec and CPU use of this process.
+
+Usage:
+    python scripts/bench_stream_types.py [--rate 100] [--fills 3] [--duration 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PyQt6.QtCore import Qt
+
+from core.price_monitor import PriceMonitor
+from core.trade_decoder import STREAM_DECODERS, make_decoder
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'simulator', 'binance_server.py')
+
+
+class CountingDecoder:
+    """Wraps a decoder to count frames and payload bytes."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.frames = 0
+        self.bytes = 0
+
+    def decode(self, message):
+        self.frames += 1
+        self.bytes += len(message)
+        return self.inner.decode(message)
+
+
+def measure(stream_type, port, duration):
+    decoder = CountingDecoder(make_decoder(stream_type))
+    monitor = PriceMonitor(base_url=f"ws://127.0.0.1:{port}", stream_type=stream_type,
+                           decoder=decoder, backfill=False)
+    lock = threading.Lock()
+    prices = [0, None]  # distinct updates, last price
+
+    def on_price(price):
+        with lock:
+            if price != prices[1]:
+                prices[0] += 1
+                prices[1] = price
+
+    monitor.price_updated.connect(on_price, Qt.ConnectionType.DirectConnection)
+    monitor.start()
+    time.sleep(1.0)  # Connect and skip the first partial second
+    frames0, bytes0, updates0 = decoder.frames, decoder.bytes, prices[0]
+    cpu0 = time.process_time()
+    time.sleep(duration)
+    cpu = time.process_time() - cpu0
+    result = {
+        "msgs": (decoder.frames - frames0) / duration,
+        "bytes": (decoder.bytes - bytes0) / duration,
+        "updates": (prices[0] - updates0) / duration,
+        "cpu_pct": cpu / duration * 100,
+    }
+    monitor.stop()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9557)
+    parser.add_argument("--rate", type=float, default=100.0, help="Trades/sec")
+    parser.add_argument("--fills", type=float, default=3.0, help="Mean trades per taker order")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per stream type")
+    args = parser.parse_args()
+
+    server = subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT, "--port", str(args.port), "--rate", str(args.rate),
+         "--fills", str(args.fills), "--seed", "1"],
+        stdout=subprocess.PIPE, text=True
+    )
+    server.stdout.readline()  # Wait for "listening" banner
+    try:
+        rows = [(kind, measure(kind, args.port, args.duration)) for kind in STREAM_DECODERS]
+    finally:
+        server.terminate()
+        server.wait()
+
+    base = rows[0][1]["msgs"]
+    print()
+    print(f"stand-in: {args.rate:g} trades/sec, {args.fills:g} fills per taker order, {args.duration:g}s per stream")
+    print(f"{'stream':<11} {'msgs/s':>8} {'vs trade':>9} {'bytes/s':>9} {'price_upd/s':>12} {'cpu%':>6}")
+    for kind, r in rows:
+        print(f"{kind:<11} {r['msgs']:>8.1f} {r['msgs'] / base:>8.2f}x {r['bytes']:>9.0f} "
+              f"{r['updates']:>12.1f} {r['cpu_pct']:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
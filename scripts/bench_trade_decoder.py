@@ -0,0 +1,104 @@
+"""
+Micro-benchmark: trade frame decoding.
+
+Compares the original PriceMonitor path (json.loads + float(data['p'])),
+the full JSON decoder and the fast-path decoder on Binance trade payloads
+(tests/data/binance_trades.jsonl), as raw-stream str, combined-stream str and bytes.
+
+Reports decoded messages/sec and, per message:
+- bytes: peak transient allocation (tracemalloc)
+- blocks: heap blocks still alive per decoded result (sys.getallocatedblocks)
+
+Usage:
+    python scripts/bench_trade_decoder.py [--repeat 40]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.trade_decoder import FastTradeDecoder, JsonTradeDecoder
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'data', 'binance_trades.jsonl')
+
+
+def legacy_decode(message):
+    # What PriceMonitor._on_message did before the decoder layer
+    data = json.loads(message)
+    if 'p' in data:
+        return float(data['p'])
+    return None
+
+
+def measure_rate(decode, messages, repeat, rounds=5):
+    # Best of several rounds, to filter out scheduler noise
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for m in messages:
+                decode(m)
+        best = min(best, time.perf_counter() - start)
+    return len(messages) * repeat / best
+
+
+def measure_bytes(decode, messages):
+    tracemalloc.start()
+    total = 0
+    for m in messages:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        decode(m)
+        _, peak = tracemalloc.get_traced_memory()
+        total += peak - base
+    tracemalloc.stop()
+    return total / len(messages)
+
+
+def measure_blocks(decode, messages):
+    gc.collect()
+    before = sys.getallocatedblocks()
+    results = [decode(m) for m in messages]
+    after = sys.getallocatedblocks()
+    del results
+    # Blocks kept alive by each decoded result (dict/Tick plus its fields)
+    return (after - before) / len(messages)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=40)
+    args = parser.parse_args()
+
+    with open(DATA_FILE) as f:
+        raw = [line.strip() for line in f if line.strip()]
+    combined = ['{"stream":"btcusdt@trade","data":%s}' % m for m in raw]
+    as_bytes = [m.encode() for m in raw]
+
+    fast = FastTradeDecoder()
+    cases = [
+        ("legacy json.loads", legacy_decode, raw),
+        ("JsonTradeDecoder", JsonTradeDecoder().decode, raw),
+        ("FastTradeDecoder", fast.decode, raw),
+        ("Json (combined)", JsonTradeDecoder().decode, combined),
+        ("Fast (combined)", fast.decode, combined),
+        ("Fast (bytes)", fast.decode, as_bytes),
+    ]
+
+    print(f"{len(raw)} payloads x {args.repeat} repeats, best of 5 rounds")
+    print(f"{'decoder':<20} {'msgs/sec':>12} {'bytes/msg':>10} {'blocks/msg':>11}")
+    for name, decode, messages in cases:
+        rate = measure_rate(decode, messages, args.repeat)
+        alloc = measure_bytes(decode, messages)
+        blocks = measure_blocks(decode, messages)
+        print(f"{name:<20} {rate:>12,.0f} {alloc:>10.0f} {blocks:>11.1f}")
+    print(f"fast path hits: {fast.fast_hits}, fallbacks: {fast.fallbacks}")
+
+
+if __name__ == "__main__":
+    main()
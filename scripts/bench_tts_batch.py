@@ -0,0 +1,85 @@
+"""
+Throughput of batched vs sequential synthesis of alert phrases.
+
+Builds the UP/DOWN message for every boundary in a price range (what
+TTSService.render_batch pre-renders), then synthesizes them once with one
+TextToSpeech call per phrase and once through TextToSpeech.batch in
+length-bucketed groups, and prints phrases per second and padding waste for
+each batch size. Needs the ONNX models (scripts/download_assets.py).
+
+Usage:
+    python scripts/bench_tts_batch.py [--language English] [--lo 90000 --hi 100000 --interval 500]
+                                      [--batch-sizes 4,8,16] [--onnx-dir assets/onnx]
+                                      [--voice-style assets/voice_styles/F1.json]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from services.helper import load_text_to_speech, load_voice_style, length_buckets, repeat_style, trim_batch
+from utils.alert_text import crossing_text
+from utils.settings_manager import LANG_CODE_MAP
+
+ASSETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'assets')
+TOTAL_STEP = 5
+SPEED = 1.05
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--language", default="English", choices=sorted(LANG_CODE_MAP))
+    parser.add_argument("--voice", default="F1")
+    parser.add_argument("--onnx-dir", default=os.path.join(ASSETS, "onnx"))
+    parser.add_argument("--voice-style", help="Voice style file (default: assets/voice_styles/<voice>.json)")
+    parser.add_argument("--lo", type=float, default=90000)
+    parser.add_argument("--hi", type=float, default=100000)
+    parser.add_argument("--interval", type=float, default=500)
+    parser.add_argument("--batch-sizes", default="4,8,16")
+    args = parser.parse_args()
+
+    engine = load_text_to_speech(args.onnx_dir)
+    style = load_voice_style([args.voice_style or os.path.join(ASSETS, "voice_styles", f"{args.voice}.json")])
+    lang = LANG_CODE_MAP[args.language]
+    levels = np.arange(args.lo, args.hi + args.interval / 2, args.interval)
+    texts = [crossing_text(args.language, level, d) for level in levels for d in ("UP", "DOWN")]
+    print(f"{len(texts)} phrases ({args.language}, {min(map(len, texts))}-{max(map(len, texts))} chars)")
+
+    # Warm up both paths so session initialization is not timed
+    engine(texts[0], lang, style, TOTAL_STEP, SPEED)
+    engine.batch(texts[:2], [lang] * 2, repeat_style(style, 2), TOTAL_STEP, SPEED)
+
+    start = time.perf_counter()
+    audio_s = 0.0
+    for text in texts:
+        _, duration = engine(text, lang, style, TOTAL_STEP, SPEED)
+        audio_s += float(np.sum(duration))
+    sequential = time.perf_counter() - start
+    print()
+    print(f"{'batch':>6} {'batches':>8} {'seconds':>8} {'phrases/s':>10} {'speedup':>8} {'pad waste':>10}")
+    print(f"{'seq':>6} {len(texts):>8} {sequential:>8.2f} {len(texts) / sequential:>10.1f} {1.0:>7.1f}x {0:>10.0%}")
+
+    lengths = [len(t) for t in texts]
+    for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+        buckets = length_buckets(lengths, batch_size)
+        padded = sum(max(lengths[i] for i in b) * len(b) for b in buckets)
+        start = time.perf_counter()
+        clips = 0
+        for bucket in buckets:
+            batch = [texts[i] for i in bucket]
+            wav, duration = engine.batch(batch, [lang] * len(batch), repeat_style(style, len(batch)),
+                                         TOTAL_STEP, SPEED)
+            clips += len(trim_batch(wav, duration, engine.sample_rate))
+        elapsed = time.perf_counter() - start
+        print(f"{batch_size:>6} {len(buckets):>8} {elapsed:>8.2f} {clips / elapsed:>10.1f} "
+              f"{sequential / elapsed:>7.1f}x {padded / sum(lengths) - 1:>10.0%}")
+    print()
+    print(f"{audio_s:.0f}s of audio in total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Per-utterance latency and allocations of the denoising loop, with and
+without IOBinding.
+
+Synthesizes the same alert phrases (same noise) through
+TextToSpeech._denoise (a session.run() per step, which returns a freshly
+allocated latent and takes a freshly built current_step array) and
+TextToSpeech._denoise_iobinding (two preallocated latents ping-ponged through
+bound OrtValues), checks that both give the same audio, and prints the
+latency of the whole utterance and of the loop alone, the number of distinct
+latent output buffers the estimator wrote per utterance and the peak numpy
+memory traced per utterance. Needs the ONNX models
+(scripts/download_assets.py).
+
+Usage:
+    python scripts/bench_tts_iobinding.py [--runs 30] [--steps 5] [--onnx-dir assets/onnx]
+                                          [--voice-style assets/voice_styles/F1.json]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from services.helper import load_text_to_speech, load_voice_style
+from utils.alert_text import crossing_text
+
+ASSETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'assets')
+SPEED = 1.05
+
+
+class CountingSession:
+    """Wraps the vector estimator session and records where its outputs land."""
+
+    def __init__(self, sess):
+        self.sess = sess
+        self.reset()
+
+    def reset(self):
+        self.outputs = []  # Kept alive so a freed buffer's address is not reused
+        self.buffers = set()
+        self.steps = 0
+
+    def run(self, output_names, feeds):
+        out = self.sess.run(output_names, feeds)
+        self.steps += 1
+        self.outputs.append(out[0])
+        self.buffers.add(out[0].__array_interface__["data"][0])
+        return out
+
+    def run_with_iobinding(self, binding):
+        self.sess.run_with_iobinding(binding)
+        self.steps += 1
+        self.buffers.add(binding.get_outputs()[0].data_ptr())
+
+    def __getattr__(self, name):
+        return getattr(self.sess, name)
+
+
+def pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--onnx-dir", default=os.path.join(ASSETS, "onnx"))
+    parser.add_argument("--voice-style", default=os.path.join(ASSETS, "voice_styles", "F1.json"))
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--steps", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = load_text_to_speech(args.onnx_dir)
+    style = load_voice_style([args.voice_style])
+    counter = CountingSession(engine.vector_est_ort)
+    engine.vector_est_ort = counter
+    texts = [crossing_text("English", 95000 + 500 * i, ("UP", "DOWN")[i % 2]) for i in range(args.runs)]
+
+    # Time the loop alone by wrapping both implementations
+    loop_ms = []
+    for name in ("_denoise", "_denoise_iobinding"):
+        method = getattr(engine, name)
+
+        def timed(*a, _method=method, **kw):
+            start = time.perf_counter()
+            out = _method(*a, **kw)
+            loop_ms.append((time.perf_counter() - start) * 1000)
+            return out
+
+        setattr(engine, name, timed)
+
+    print(f"{args.runs} utterances, {args.steps} denoising steps")
+    print()
+    print(f"{'loop':>10} {'p50 ms':>8} {'p90 ms':>8} {'loop p50':>9} {'buffers':>8} {'new arrays':>11} "
+          f"{'peak KiB':>9}")
+    results = {}
+    for use_iobinding in (False, True):
+        engine.use_iobinding = use_iobinding
+        engine(texts[0], "en", style, args.steps, SPEED)  # Warm-up
+        total_ms, loop_ms[:], wavs, buffers, peaks = [], [], [], [], []
+        new_arrays = 0
+        for i, text in enumerate(texts):
+            np.random.seed(i)
+            counter.reset()
+            tracemalloc.start()
+            start = time.perf_counter()
+            wav, _ = engine(text, "en", style, args.steps, SPEED)
+            total_ms.append((time.perf_counter() - start) * 1000)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            wavs.append(wav)
+            buffers.append(len(counter.buffers))
+            new_arrays += len(counter.outputs)
+        results[use_iobinding] = wavs
+        print(f"{'iobinding' if use_iobinding else 'run':>10} {statistics.median(total_ms):>8.2f} "
+              f"{pct(total_ms, 0.9):>8.2f} {statistics.median(loop_ms):>9.2f} "
+              f"{max(buffers):>8} {new_arrays / args.runs:>11.1f} {max(peaks) / 1024:>9.0f}")
+
+    same = all(np.array_equal(a, b) for a, b in zip(results[False], results[True]))
+    print()
+    print("buffers: distinct latent buffers written by the estimator per utterance")
+    print("new arrays: latents returned to Python by session.run() per utterance")
+    print("peak: peak traced numpy memory per utterance (includes the vocoder output)")
+    print(f"identical audio: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Cold vs warm latency of the first alert, per TTS stage.
+
+Each trial runs in a fresh process, so ORT starts with empty arenas and the
+model weights not yet paged in. The process loads the engine, optionally
+runs TextToSpeech.warm_up on the UP/DOWN phrases (what MainWindow does at
+startup), then times the first real alert phrase per session (dp,
+text_enc, vector_est, vocoder; TextToSpeech.stage_times) and a few more
+for the steady state. Prints the median over trials of each. Needs the ONNX
+models (scripts/download_assets.py).
+
+Usage:
+    python scripts/bench_tts_warmup.py [--trials 5] [--language English] [--onnx-dir assets/onnx]
+                                       [--voice-style assets/voice_styles/F1.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from services.helper import load_text_to_speech, load_voice_style
+from utils.alert_text import crossing_text
+from utils.settings_manager import LANG_CODE_MAP
+
+ASSETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'assets')
+TOTAL_STEP = 5
+SPEED = 1.05
+WARM_UP_PRICE = 105550.0  # As in MainWindow
+STAGES = ("dp", "text_enc", "vector_est", "vocoder")
+STEADY_CALLS = 5
+
+
+def child(args):
+    """One trial; prints a JSON line with the per-stage ms of each call."""
+    engine = load_text_to_speech(args.onnx_dir, optimized_dir=args.optimized_dir)
+    style = load_voice_style([args.voice_style])
+    lang = LANG_CODE_MAP[args.language]
+    warm_up_ms = 0.0
+    if args.child == "warm":
+        phrases = [crossing_text(args.language, WARM_UP_PRICE, d) for d in ("UP", "DOWN")]
+        warm_up_ms = engine.warm_up(phrases, [lang] * len(phrases), style, TOTAL_STEP, SPEED) * 1000
+    calls = []
+    for i in range(1 + STEADY_CALLS):
+        text = crossing_text(args.language, 97250.0 + 50 * i, ("UP", "DOWN")[i % 2])
+        engine.stage_times = {}
+        start = time.perf_counter()
+        engine(text, lang, style, TOTAL_STEP, SPEED)
+        times = {stage: s * 1000 for stage, s in engine.stage_times.items()}
+        times["total"] = (time.perf_counter() - start) * 1000
+        calls.append(times)
+    print(json.dumps({"warm_up_ms": warm_up_ms, "calls": calls}))
+
+
+def run_trial(args, mode):
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", mode, "--language", args.language,
+           "--onnx-dir", args.onnx_dir, "--voice-style", args.voice_style]
+    if args.optimized_dir:
+        cmd += ["--optimized-dir", args.optimized_dir]
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--onnx-dir", default=os.path.join(ASSETS, "onnx"))
+    parser.add_argument("--voice-style", default=os.path.join(ASSETS, "voice_styles", "F1.json"))
+    parser.add_argument("--optimized-dir", default=None, help="Optimized graph cache (see helper.load_onnx)")
+    parser.add_argument("--language", default="English", choices=sorted(LANG_CODE_MAP))
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--child", choices=("cold", "warm"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args)
+        return
+
+    results = {mode: [run_trial(args, mode) for _ in range(args.trials)] for mode in ("cold", "warm")}
+    print(f"{args.trials} trials per mode, {args.language}, first alert after load (ms, median)")
+    print()
+    print(f"{'stage':>11} {'cold first':>11} {'warm first':>11} {'steady':>8}")
+    for stage in STAGES + ("total",):
+        cold = statistics.median(r["calls"][0][stage] for r in results["cold"])
+        warm = statistics.median(r["calls"][0][stage] for r in results["warm"])
+        steady = statistics.median(c[stage] for r in results["cold"] + results["warm"] for c in r["calls"][1:])
+        print(f"{stage:>11} {cold:>11.1f} {warm:>11.1f} {steady:>8.1f}")
+    print()
+    print(f"warm-up pass: {statistics.median(r['warm_up_ms'] for r in results['warm']):.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
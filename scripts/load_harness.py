@@ -0,0 +1,223 @@
+"""
+Load-test harness against the local Binance stand-in.
+
+For each load profile, starts src/simulator/binance_server.py in a subprocess
+(so its CPU is not counted) and runs the app's ingest pipeline headless,
+wired like MainWindow: raw ticks go from PriceMonitor to both AlertWorker
+(IntervalTracker on its own thread) and TickConflator (display only, on the
+GUI thread).
+
+Reports per profile:
+- received / dropped trades (gaps in the per-symbol trade id sequence)
+- reconnect time (connection lost -> connection open again)
+- trades recovered over REST after reconnects (these are not counted as dropped)
+- CPU use of this process, and UI updates after conflation
+- p99 receive -> alert worker dispatch latency of raw ticks, and p99
+  receive -> display latency of conflated windows (--latency prints the full
+  histograms, including alert emit)
+
+--stall MS blocks the GUI thread for MS milliseconds every second (a modal
+dialog, a layout rebuild) to exercise the bounded ingest queue; --policy picks
+its overflow policy. Alerts should not notice: only the display latency grows.
+
+Usage:
+    python scripts/load_harness.py [--duration 8] [--profiles calm,busy,flaky]
+    python scripts/load_harness.py --profiles busy --stall 700 --policy keep_latest
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from PyQt6.QtCore import QCoreApplication, QTimer, Qt
+
+from core.alert_worker import AlertWorker
+from core.price_monitor import PriceMonitor
+from core.tick_conflator import TickConflator
+from core.interval_logic import IntervalTracker
+from core.latency import LatencyRecorder
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'simulator', 'binance_server.py')
+
+# name: (price path, msgs/sec, extra server args, duration override)
+PROFILES = {
+    "calm": ("random_walk", 1, [], None),
+    "steady": ("random_walk", 100, [], None),
+    "busy": ("random_walk", 1000, [], None),
+    "gap_storm": ("gap_jump", 2000, [], None),
+    "boundary": ("oscillation", 500, [], None),
+    "firehose": ("random_walk", 10000, [], None),
+    "flaky": ("random_walk", 100, ["--disconnect-every", "4", "--downtime", "1"], 15.0),
+}
+
+
+class PipelineProbe:
+    """Counts what the ingest pipeline sees. All callbacks run on the WS thread."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.received = 0
+        self.dropped = 0
+        self.last_trade_id = None
+        self.down_since = None
+        self.reconnects = []
+        self.connected_once = False
+
+    def on_tick(self, tick):
+        with self.lock:
+            self.received += 1
+            if self.last_trade_id is not None and tick.trade_id > self.last_trade_id + 1:
+                self.dropped += tick.trade_id - self.last_trade_id - 1
+            self.last_trade_id = tick.trade_id
+
+    def on_status(self, connected):
+        now = time.perf_counter()
+        with self.lock:
+            if connected:
+                if self.down_since is not None:
+                    self.reconnects.append(now - self.down_since)
+                self.down_since = None
+                self.connected_once = True
+            elif self.connected_once and self.down_since is None:
+                self.down_since = now
+
+
+def run_profile(app, name, port, duration, interval, stall_ms=0, policy="drop_oldest"):
+    path, rate, extra, override = PROFILES[name]
+    duration = override or duration
+    server = subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT, "--port", str(port), "--rate", str(rate), "--path", path] + extra,
+        stdout=subprocess.PIPE, text=True
+    )
+    server.stdout.readline()  # Wait for "listening" banner
+
+    probe = PipelineProbe()
+    monitor = PriceMonitor(base_url=f"ws://127.0.0.1:{port}", rest_url=f"http://127.0.0.1:{port}")
+    conflator = TickConflator(interval_ms=50, policy=policy)
+    tracker = IntervalTracker(interval=interval)
+    worker = AlertWorker([tracker])
+    latency = LatencyRecorder()
+    alerts = [0]
+
+    def on_live_price(price):
+        """WebSocket thread, as in MainWindow.on_live_price"""
+        stamp = (monitor.last_event_ms, monitor.last_recv_ns)
+        worker.push(price, stamp)
+        conflator.push(price, stamp)
+
+    def on_backfilled(ticks):
+        prices = [t.price for t in ticks if t.symbol == monitor.symbol]
+        worker.push_path(prices)
+        conflator.push_path(prices)
+
+    def on_window(window):
+        """GUI thread: display only"""
+        display_ns = time.time_ns()
+        stamp = window.last_stamp
+        if stamp and stamp[0]:
+            latency.record_span("tick event -> recv", stamp[0] * 1_000_000, stamp[1])
+            latency.record_span("tick recv -> display", stamp[1], display_ns)
+
+    def on_alert(*_):
+        """Alert worker thread"""
+        alerts[0] += 1
+        if worker.origin:
+            stamp, dispatch_ns = worker.origin
+            event_ms, recv_ns = stamp or (None, None)
+            trace = latency.trace(event_ms, recv_ns)
+            trace.mark("dispatch", dispatch_ns)
+            trace.mark("emit")
+            trace.finish()
+
+    monitor.tick_received.connect(probe.on_tick, Qt.ConnectionType.DirectConnection)
+    monitor.connection_status.connect(probe.on_status, Qt.ConnectionType.DirectConnection)
+    monitor.price_updated.connect(on_live_price, Qt.ConnectionType.DirectConnection)
+    monitor.backfilled.connect(on_backfilled, Qt.ConnectionType.DirectConnection)
+    conflator.window_ready.connect(on_window)
+    tracker.interval_crossed.connect(on_alert, Qt.ConnectionType.DirectConnection)
+
+    stall_timer = QTimer()
+    stall_timer.timeout.connect(lambda: time.sleep(stall_ms / 1000.0))
+
+    try:
+        if stall_ms:
+            stall_timer.start(1000)
+        worker.start()
+        conflator.start()
+        monitor.start()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        QTimer.singleShot(int(duration * 1000), app.quit)
+        app.exec()
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+    finally:
+        stall_timer.stop()
+        monitor.stop()
+        worker.stop()
+        conflator.stop()
+        server.terminate()
+        server.wait()
+
+    stats = conflator.stats()
+    reconnects = probe.reconnects
+    hists = latency.histograms()
+    dispatch = hists.get("recv -> dispatch")
+    display = hists.get("tick recv -> display")
+    return {
+        "rate": rate,
+        "received": probe.received,
+        "dropped": probe.dropped,
+        "drop_pct": probe.dropped / max(1, probe.received + probe.dropped) * 100,
+        "reconnects": len(reconnects),
+        "reconnect_avg": sum(reconnects) / len(reconnects) if reconnects else None,
+        "backfilled": monitor.total_backfilled,
+        "cpu_pct": cpu / wall * 100,
+        "ui_updates": stats["windows"],
+        "queue_max": stats["queue_max_depth"],
+        "merged": stats["dropped_windows"],
+        "alerts": alerts[0],
+        "dispatch_p99": dispatch.percentile(99) / 1000 if dispatch else None,
+        "display_p99": display.percentile(99) / 1000 if display else None,
+        "latency": latency,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9556)
+    parser.add_argument("--duration", type=float, default=8.0, help="Seconds per profile")
+    parser.add_argument("--interval", type=float, default=10.0, help="Alert interval in USD")
+    parser.add_argument("--profiles", default=",".join(PROFILES))
+    parser.add_argument("--latency", action="store_true", help="Print latency histograms per profile")
+    parser.add_argument("--stall", type=int, default=0, metavar="MS", help="Block the GUI thread this long every second")
+    parser.add_argument("--policy", default="drop_oldest", help="Ingest queue policy")
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv[:1])
+    rows = []
+    for name in args.profiles.split(","):
+        rows.append((name, run_profile(app, name, args.port, args.duration, args.interval, args.stall, args.policy)))
+
+    print()
+    print(f"{'profile':<10} {'msg/s':>6} {'received':>9} {'dropped':>8} {'drop%':>6} "
+          f"{'reconn':>6} {'reconn_s':>8} {'backfill':>8} {'cpu%':>6} {'ui_upd':>7} {'q_max':>5} {'merged':>6} {'alerts':>6} {'alert_p99':>9} {'disp_p99':>8}")
+    for name, r in rows:
+        reconn = f"{r['reconnect_avg']:.2f}" if r["reconnect_avg"] is not None else "-"
+        p99 = f"{r['dispatch_p99']:.1f}" if r["dispatch_p99"] is not None else "-"
+        disp = f"{r['display_p99']:.1f}" if r["display_p99"] is not None else "-"
+        print(f"{name:<10} {r['rate']:>6} {r['received']:>9} {r['dropped']:>8} {r['drop_pct']:>6.2f} "
+              f"{r['reconnects']:>6} {reconn:>8} {r['backfilled']:>8} {r['cpu_pct']:>6.1f} {r['ui_updates']:>7} "
+              f"{r['queue_max']:>5} {r['merged']:>6} {r['alerts']:>6} {p99:>9} {disp:>8}")
+    if args.latency:
+        for name, r in rows:
+            print(f"\n[{name}]")
+            print(r["latency"].dump())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Long-running soak of IntervalTracker boundary state.
+
+Feeds a drifting gap-jump walk (the price keeps visiting new boundaries, as
+over weeks of real trading) through a windowed and an unbounded tracker at a
+$1 interval. Prints, at each checkpoint, how many boundary states each one
+holds and the size of its table, and checks that both raised
+exactly the same alerts.
+
+Usage:
+    python scripts/soak_interval_tracker.py [--ticks 2000000] [--window 256] [--drift 0.05]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from core.interval_logic import IntervalTracker
+from simulator.price_paths import make_path
+
+
+def table_kb(tracker):
+    states = tracker.boundary_states
+    return (sys.getsizeof(states) + sum(sys.getsizeof(k) for k in states)) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=2_000_000)
+    parser.add_argument("--interval", type=float, default=1.0)
+    parser.add_argument("--window", type=int, default=256, help="Boundaries kept either side of the price")
+    parser.add_argument("--drift", type=float, default=0.05, help="Price drift per tick")
+    parser.add_argument("--checkpoints", type=int, default=10)
+    args = parser.parse_args()
+
+    path = make_path("gap_jump", step=2.0, gap=40.0, gap_prob=0.002, seed=1)
+    bounded = IntervalTracker(args.interval, window=args.window)
+    unbounded = IntervalTracker(args.interval, window=None)
+    alerts = {"bounded": [], "unbounded": []}
+    bounded.interval_crossed.connect(lambda p, d: alerts["bounded"].append((p, d)))
+    unbounded.interval_crossed.connect(lambda p, d: alerts["unbounded"].append((p, d)))
+    total = mismatches = 0
+
+    every = max(1, args.ticks // args.checkpoints)
+    print(f"{'ticks':>10} {'price':>12} {'states(win)':>12} {'states(all)':>12} {'kb(win)':>8} {'kb(all)':>8} {'alerts':>9}")
+    start = time.perf_counter()
+    for i in range(1, args.ticks + 1):
+        price = path.next_price() + i * args.drift
+        bounded.process_price(price)
+        unbounded.process_price(price)
+        if alerts["bounded"] or alerts["unbounded"]:
+            total += len(alerts["bounded"])
+            mismatches += alerts["bounded"] != alerts["unbounded"]
+            alerts["bounded"].clear()
+            alerts["unbounded"].clear()
+        if i % every == 0:
+            print(f"{i:>10} {price:>12.2f} {len(bounded.boundary_states):>12} "
+                  f"{len(unbounded.boundary_states):>12} {table_kb(bounded):>8.1f} "
+                  f"{table_kb(unbounded):>8.1f} {total:>9}")
+    elapsed = time.perf_counter() - start
+
+    print()
+    print(f"{args.ticks / elapsed:,.0f} ticks/s (both trackers)")
+    print(f"{total} alerts, ticks where windowed and unbounded differ: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Volatility-adaptive alert interval.
+"""
+import math
+import time
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+
+NICE_STEPS = (1.0, 2.0, 2.5, 5.0)
+NARROW_MARGIN = 1.5  # Narrow only once the target is this far below the next smaller step
+CHATTER_HALF_LIVES = 2  # k changes with the market's microstructure, slower than volatility
+
+
+def nice_interval(x):
+    """Smallest 1 / 2 / 2.5 / 5 x 10^k step that is >= x."""
+    if x <= 0:
+        return NICE_STEPS[0]
+    scale = 10.0 ** math.floor(math.log10(x))
+    for step in NICE_STEPS + (10.0,):
+        if step * scale >= x * (1 - 1e-9):
+            return step * scale
+    return 10.0 * scale
+
+
+class AdaptiveInterval(QObject):
+    """
+    Widens or narrows an IntervalTracker's interval to hold a target alert
+    rate as the market speeds up or calms down.
+
+    For a random walk whose price variance grows by sigma^2 per second, a grid
+    of spacing I is crossed about k * sigma^2 / I^2 times per second, so
+    holding N alerts per minute needs I = sigma * sqrt(60 * k / N). sigma is
+    the realized volatility of the price sampled every sample_s seconds,
+    kept as exponentially weighted sums so each tick costs O(1):
+
+        S = S * w + dp^2,  T = T * w + dt,  sigma^2 = S / T,  w = 2^(-dt / half_life)
+
+    k would be 1 for a price that only ever moved on to the next boundary,
+    but real trades chatter back and forth across a level before leaving
+    it, and the tracker announces each of those crossings. So k is
+    calibrated from the alerts the tracker actually raised against the
+    variance seen in units of its interval (A / sum(dp^2 / I^2), with a
+    longer half-life), starting from 1.
+
+    The interval is rounded up to a 1/2/2.5/5 step so alerts stay on round
+    prices, and clamped to [min_interval, max_interval]. It widens as soon as
+    the rate would exceed the target, but only narrows after hold_s seconds at
+    the wider step and once the target has dropped by a margin, so it does
+    not flap between two steps. Until warmup_s seconds of prices are seen the
+    base interval is used.
+
+    Runs as an AlertWorker evaluator (process_price), on the same thread as
+    the tracker it adjusts. interval_changed is emitted on every change.
+    """
+
+    interval_changed = pyqtSignal(float)
+
+    def __init__(self, tracker, alerts_per_minute=4.0, base_interval=None, min_interval=None,
+                 max_interval=None, half_life_s=300.0, sample_s=1.0, warmup_s=60.0, hold_s=120.0):
+        super().__init__()
+        self.tracker = tracker
+        self.alerts_per_minute = float(alerts_per_minute)
+        self.half_life_s = half_life_s
+        self.sample_s = sample_s
+        self.warmup_s = warmup_s
+        self.hold_s = hold_s
+        self._min = min_interval
+        self._max = max_interval
+
+        self._sample_price = None
+        self._sample_time = None
+        self._sum_sq = 0.0   # Decayed sum of squared sampled price changes
+        self._sum_dt = 0.0   # Decayed sum of sample spans (seconds)
+        self._alerts = 0.0   # Decayed count of alerts raised by the tracker
+        self._sum_norm = 0.0  # Decayed sum of dp^2 / interval^2
+        self._pending_alerts = 0
+        self._seen_s = 0.0
+        self._changed_at = None
+        self.set_base(base_interval or tracker.interval)
+
+        direct = Qt.ConnectionType.DirectConnection
+        tracker.interval_crossed.connect(self._count_alert, direct)
+        tracker.interval_jumped.connect(self._count_alert, direct)
+
+    def set_base(self, interval):
+        """
+        The configured interval: used while warming up and to derive default
+        bounds. Applied immediately; the next sample adapts from there.
+        """
+        self.base_interval = float(interval)
+        self.min_interval = self._min or max(1.0, self.base_interval / 10)
+        self.max_interval = self._max or self.base_interval * 50
+        if self.tracker.interval != self.base_interval:
+            self._apply(self.base_interval, None)
+
+    @property
+    def volatility(self):
+        """Realized volatility in price units per sqrt(second), or None while warming up."""
+        if self._seen_s < self.warmup_s or self._sum_dt <= 0:
+            return None
+        return math.sqrt(self._sum_sq / self._sum_dt)
+
+    @property
+    def chatter(self):
+        """Calibrated k: alerts per unit of variance in interval^2 (see class docstring)."""
+        prior = 0.25  # Pulls k towards 1 until a few alerts have been seen
+        return (self._alerts + prior) / (self._sum_norm + prior)
+
+    def target_interval(self):
+        """Interval for alerts_per_minute at the current volatility (unrounded), or None."""
+        sigma = self.volatility
+        if sigma is None:
+            return None
+        return sigma * math.sqrt(60.0 * self.chatter / self.alerts_per_minute)
+
+    def _count_alert(self, *args):
+        self._pending_alerts += 1
+
+    def process_price(self, price, now=None):
+        now = time.monotonic() if now is None else now
+        if self._sample_time is None:
+            self._sample_price, self._sample_time = price, now
+            return
+        dt = now - self._sample_time
+        if dt < self.sample_s:
+            return
+        w = 0.5 ** (dt / self.half_life_s)
+        dp = price - self._sample_price
+        self._sum_sq = self._sum_sq * w + dp * dp
+        self._sum_dt = self._sum_dt * w + dt
+        wk = 0.5 ** (dt / (self.half_life_s * CHATTER_HALF_LIVES))
+        self._sum_norm = self._sum_norm * wk + dp * dp / (self.tracker.interval ** 2)
+        self._alerts = self._alerts * wk + self._pending_alerts
+        self._pending_alerts = 0
+        self._seen_s += dt
+        self._sample_price, self._sample_time = price, now
+        self._adapt(now)
+
+    def _clamp(self, interval):
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def _adapt(self, now):
+        raw = self.target_interval()
+        if raw is None:
+            return
+        current = self.tracker.interval
+        wider = self._clamp(nice_interval(raw))
+        if wider > current:
+            self._apply(wider, now)
+            return
+        # Narrow only with a margin below the next step, and not too soon
+        narrower = self._clamp(nice_interval(raw * NARROW_MARGIN))
+        if narrower < current and (self._changed_at is None or now - self._changed_at >= self.hold_s):
+            self._apply(narrower, now)
+
+    def _apply(self, interval, now):
+        self.tracker.set_interval(interval)
+        self._changed_at = now
+        self.interval_changed.emit(interval)
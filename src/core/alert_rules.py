@@ -0,0 +1,468 @@
+"""
+Price alert rules beyond the single IntervalTracker interval.
+
+RuleEngine evaluates any number of rules per tick in O(log n + fired):
+every rule that fires on a price level (absolute levels, interval grids,
+percent moves) is kept in two sorted level arrays, one per direction, and a
+tick only bisects the span between the previous and the current price.
+Crossing semantics match IntervalTracker: a level fires when the price
+passes strictly through it; landing exactly on it fires nothing, but the
+side it came from is remembered.
+
+Rolling-window range breakouts have no fixed level: breakout rules are
+grouped by window, and each window keeps a monotonic-deque high/low
+(amortized O(1) per window per tick).
+"""
+import bisect
+import heapq
+import math
+import time
+from collections import deque
+from PyQt6.QtCore import QObject, pyqtSignal
+
+DIRECTIONS = ("UP", "DOWN")
+
+
+class AlertRule:
+    """Base class. direction: "UP", "DOWN" or None for both."""
+
+    kind = "rule"
+
+    def __init__(self, direction=None, name=None):
+        if direction is not None and direction not in DIRECTIONS:
+            raise ValueError(f"Unknown direction: {direction}")
+        self.direction = direction
+        self.name = name
+        self.fired = 0
+
+    def fires(self, direction):
+        return self.direction is None or self.direction == direction
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.describe()})"
+
+    def describe(self):
+        return self.name or ""
+
+
+class LevelRule(AlertRule):
+    """One absolute price level. once: remove the rule after it fires."""
+
+    kind = "level"
+
+    def __init__(self, price, direction=None, once=False, name=None):
+        super().__init__(direction, name)
+        self.price = float(price)
+        self.once = once
+
+    def levels(self, lo, hi):
+        return [self.price]
+
+    def describe(self):
+        return self.name or f"{self.price:g}"
+
+
+class GridRule(AlertRule):
+    """Every multiple of interval (shifted by offset), like IntervalTracker."""
+
+    kind = "grid"
+
+    def __init__(self, interval, offset=0.0, direction=None, name=None):
+        super().__init__(direction, name)
+        if interval <= 0:
+            raise ValueError("Grid interval must be positive")
+        self.interval = float(interval)
+        self.offset = float(offset)
+
+    def levels(self, lo, hi):
+        """Grid levels in [lo, hi]."""
+        first = math.ceil((lo - self.offset) / self.interval)
+        last = math.floor((hi - self.offset) / self.interval)
+        return [k * self.interval + self.offset for k in range(first, last + 1)]
+
+    def describe(self):
+        return self.name or f"every {self.interval:g}" + (f" +{self.offset:g}" if self.offset else "")
+
+
+class PercentRule(AlertRule):
+    """
+    Price moved percent% up or down from a reference (the first price seen
+    if not given). rebase: the level that fired becomes the new reference, so
+    the rule keeps firing every percent% step; otherwise it fires once per
+    direction.
+    """
+
+    kind = "percent"
+
+    def __init__(self, percent, reference=None, rebase=True, direction=None, name=None):
+        super().__init__(direction, name)
+        if percent <= 0:
+            raise ValueError("Percent must be positive")
+        self.percent = float(percent)
+        self.reference = None if reference is None else float(reference)
+        self.rebase = rebase
+        self.spent = set()  # Directions already fired (no rebase)
+
+    def level(self, direction):
+        step = self.percent / 100.0
+        return self.reference * (1 + step if direction == "UP" else 1 - step)
+
+    def describe(self):
+        return self.name or f"{self.percent:g}% from {self.reference}"
+
+
+class RangeBreakoutRule(AlertRule):
+    """
+    Price broke above the high (UP) or below the low (DOWN) of the previous
+    window_s seconds. Re-arms once the price is back inside the range it
+    broke out of.
+    """
+
+    kind = "breakout"
+
+    def __init__(self, window_s, direction=None, name=None):
+        super().__init__(direction, name)
+        if window_s <= 0:
+            raise ValueError("Breakout window must be positive")
+        self.window_s = float(window_s)
+
+    def describe(self):
+        return self.name or f"{self.window_s:g}s range"
+
+
+RULE_TYPES = {
+    "level": LevelRule,
+    "grid": GridRule,
+    "percent": PercentRule,
+    "breakout": RangeBreakoutRule,
+}
+
+
+def make_rule(spec):
+    """Rule from a settings dict, e.g. {"type": "level", "price": 100000}."""
+    spec = dict(spec)
+    kind = spec.pop("type", None)
+    try:
+        cls = RULE_TYPES[kind]
+    except KeyError:
+        raise ValueError(f"Unknown rule type: {kind} (choose from {', '.join(RULE_TYPES)})")
+    return cls(**spec)
+
+
+def make_rules(specs):
+    """Rules from settings dicts; a malformed spec is reported and skipped."""
+    rules = []
+    for spec in specs:
+        try:
+            rules.append(make_rule(spec))
+        except (TypeError, ValueError) as e:
+            print(f"Ignoring alert rule {spec!r}: {e}")
+    return rules
+
+
+class _RollingRange:
+    """
+    High and low of the last window_s seconds (monotonic deques). None until
+    the prices seen span a whole window (again after a gap longer than one).
+    """
+
+    def __init__(self, window_s):
+        self.window_s = window_s
+        self._max = deque()  # (t, price), prices decreasing
+        self._min = deque()  # (t, price), prices increasing
+        self._since = None  # Start of the current unbroken run of prices
+
+    def range(self, now):
+        if self._since is None or now - self._since < self.window_s:
+            return None
+        cutoff = now - self.window_s
+        for q in (self._max, self._min):
+            while q and q[0][0] < cutoff:
+                q.popleft()
+        if not self._max:
+            return None
+        return self._min[0][1], self._max[0][1]
+
+    def add(self, now, price):
+        if not self._max or now - self._max[-1][0] > self.window_s:
+            self._since = now
+        while self._max and self._max[-1][1] <= price:
+            self._max.pop()
+        self._max.append((now, price))
+        while self._min and self._min[-1][1] >= price:
+            self._min.pop()
+        self._min.append((now, price))
+
+
+class _BreakoutGroup:
+    """Breakout rules sharing one window: one range and one armed state."""
+
+    def __init__(self, window_s):
+        self.range = _RollingRange(window_s)
+        self.rules = []
+        self.broken = {}  # direction -> level broken (disarmed until back inside)
+
+
+class _SortedLevels:
+    """
+    Level prices of one direction in ascending order, with the rule owning
+    each level; rules sharing a level keep the order they were added in.
+
+    A rule firing must not cost an O(n) list insert or delete, so removed
+    entries are only marked dead (owner None) and new ones go to a short
+    sorted side list. Both are folded into the main arrays in one pass
+    once they reach a fraction of its size, so the rebuild is amortized
+    O(1) per change and a change is otherwise one bisect.
+    """
+
+    def __init__(self, rows=()):
+        self._reset(rows)
+
+    def _reset(self, rows):
+        self.levels = [e[0] for e in rows]
+        self.owners = [e[1] for e in rows]
+        self.new_levels = []
+        self.new_owners = []
+        self.dead = 0
+
+    def insert(self, level, rule):
+        i = bisect.bisect_right(self.new_levels, level)
+        self.new_levels.insert(i, level)
+        self.new_owners.insert(i, rule)
+        if len(self.new_levels) > 16 + len(self.levels) // 8:
+            self._compact()
+
+    def remove(self, level, rule):
+        for levels, owners in ((self.levels, self.owners), (self.new_levels, self.new_owners)):
+            i = bisect.bisect_left(levels, level)
+            while i < len(levels) and levels[i] == level:
+                if owners[i] is rule:
+                    owners[i] = None
+                    self.dead += 1
+                    if self.dead > 16 + len(self.levels) // 2:
+                        self._compact()
+                    return
+                i += 1
+
+    def _compact(self):
+        # Stable sort: at equal levels the main entries stay ahead of the newer ones
+        rows = sorted((e for e in zip(self.levels + self.new_levels, self.owners + self.new_owners)
+                       if e[1] is not None), key=lambda e: e[0])
+        self._reset(rows)
+
+    def between(self, lo, lo_inclusive, hi, hi_inclusive):
+        """Live (level, rule) entries in the span, ascending."""
+        found = []
+        for levels, owners in ((self.levels, self.owners), (self.new_levels, self.new_owners)):
+            start = bisect.bisect_left(levels, lo) if lo_inclusive else bisect.bisect_right(levels, lo)
+            end = bisect.bisect_right(levels, hi) if hi_inclusive else bisect.bisect_left(levels, hi)
+            if start < end:
+                found.append([e for e in zip(levels[start:end], owners[start:end]) if e[1] is not None])
+        if len(found) == 2:
+            return list(heapq.merge(*found, key=lambda e: e[0]))
+        return found[0] if found else []
+
+
+class _LevelIndex:
+    """Sorted level prices per direction, with the rule owning each level."""
+
+    def __init__(self):
+        self.sides = {d: _SortedLevels() for d in DIRECTIONS}
+
+    def build(self, entries):
+        """entries: (level, direction, rule) in the order rules were added."""
+        for direction in DIRECTIONS:
+            rows = sorted(((e[0], e[2]) for e in entries if e[1] == direction), key=lambda e: e[0])
+            self.sides[direction] = _SortedLevels(rows)
+
+    def insert(self, level, direction, rule):
+        self.sides[direction].insert(level, rule)
+
+    def remove(self, level, direction, rule):
+        self.sides[direction].remove(level, rule)
+
+    def crossed(self, prev, price, bias):
+        """(level, rule) for every level passed from prev to price, in the order passed."""
+        if price > prev:
+            # A level the previous price sat on counts if it was approached from below
+            return self.sides["UP"].between(prev, bias < 0, price, False)
+        crossed = self.sides["DOWN"].between(price, False, prev, bias > 0)
+        # Highest level first; rules sharing a level still fire in the order they were added
+        return sorted(crossed, key=lambda e: -e[0]) if crossed else []
+
+
+class RuleEngine(QObject):
+    """
+    Evaluates alert rules on every price, alongside IntervalTracker.
+
+    Levels and percent rules live in one index. Grid rules have their own,
+    holding only grid_band levels either side of the price; it is rebuilt
+    (amortized) when the price leaves that band, always covering the whole
+    move, so gap moves still fire every level in order.
+    """
+
+    rule_triggered = pyqtSignal(object, float, str)  # (rule, level price, "UP" or "DOWN")
+
+    def __init__(self, rules=(), grid_band=64):
+        super().__init__()
+        self.grid_band = grid_band
+        self.last_price = None
+        self._bias = 0  # Last price sits exactly on a level: -1 came from below, +1 from above, 0 unknown
+        self._rules = {}  # Level and percent rules (insertion-ordered, O(1) removal)
+        self._grids = []
+        self._groups = {}  # window_s -> _BreakoutGroup
+        self._static = _LevelIndex()
+        self._grid = _LevelIndex()
+        self._band = (-math.inf, math.inf)  # Price span the grid index covers
+        self.add_rules(rules)
+
+    @property
+    def rules(self):
+        return list(self._rules) + self._grids + [r for g in self._groups.values() for r in g.rules]
+
+    def add_rule(self, rule):
+        self.add_rules([rule])
+        return rule
+
+    def add_rules(self, rules):
+        static = grids = False
+        for rule in rules:
+            if isinstance(rule, RangeBreakoutRule):
+                if rule.window_s not in self._groups:
+                    self._groups[rule.window_s] = _BreakoutGroup(rule.window_s)
+                self._groups[rule.window_s].rules.append(rule)
+            elif isinstance(rule, GridRule):
+                self._grids.append(rule)
+                grids = True
+            else:
+                self._rules[rule] = None
+                static = True
+        if static:
+            self._build_static()
+        if grids and self.last_price is not None:
+            self._build_grids(self.last_price, self.last_price)
+
+    def remove_rule(self, rule):
+        if isinstance(rule, RangeBreakoutRule):
+            group = self._groups[rule.window_s]
+            group.rules.remove(rule)
+            if not group.rules:
+                del self._groups[rule.window_s]
+        elif isinstance(rule, GridRule):
+            self._grids.remove(rule)
+            if self.last_price is not None:
+                self._build_grids(self.last_price, self.last_price)
+        else:
+            del self._rules[rule]
+            for level, direction in self._static_levels(rule):
+                self._static.remove(level, direction, rule)
+
+    # Index
+
+    @staticmethod
+    def _static_levels(rule):
+        if isinstance(rule, PercentRule):
+            if rule.reference is None:
+                return []
+            return [(rule.level(d), d) for d in DIRECTIONS if rule.fires(d) and d not in rule.spent]
+        return [(rule.price, d) for d in DIRECTIONS if rule.fires(d)]
+
+    def _build_static(self):
+        self._static.build([(level, d, rule) for rule in self._rules for level, d in self._static_levels(rule)])
+
+    def _build_grids(self, lo, hi):
+        """Grid levels covering [lo, hi] plus grid_band intervals either side."""
+        entries = []
+        band_lo, band_hi = -math.inf, math.inf
+        for rule in self._grids:
+            margin = self.grid_band * rule.interval
+            rule_lo, rule_hi = lo - margin, hi + margin
+            band_lo, band_hi = max(band_lo, rule_lo), min(band_hi, rule_hi)
+            entries.extend((level, d, rule) for level in rule.levels(rule_lo, rule_hi)
+                           for d in DIRECTIONS if rule.fires(d))
+        self._grid.build(entries)
+        self._band = (band_lo, band_hi)
+
+    # Evaluation
+
+    def process_price(self, price, now=None):
+        """Fire every rule crossed by the move from the previous price."""
+        prev = self.last_price
+        if prev is None:
+            self.last_price = price
+            pending = [r for r in self._rules if isinstance(r, PercentRule) and r.reference is None]
+            for rule in pending:
+                rule.reference = price
+            if pending:
+                self._build_static()
+            self._build_grids(price, price)
+        elif price != prev:
+            self._process_levels(prev, price)
+            self._bias = -1 if price > prev else 1
+            self.last_price = price
+        if self._groups:
+            self._process_breakouts(price, time.monotonic() if now is None else now)
+
+    def _process_levels(self, prev, price):
+        direction = "UP" if price > prev else "DOWN"
+        crossed = self._static.crossed(prev, price, self._bias)
+        if self._grids:
+            lo, hi = (prev, price) if prev < price else (price, prev)
+            if lo < self._band[0] or hi > self._band[1]:
+                self._build_grids(lo, hi)
+            grid_crossed = self._grid.crossed(prev, price, self._bias)
+            if grid_crossed and crossed:
+                crossed = list(heapq.merge(crossed, grid_crossed, key=lambda e: e[0], reverse=direction == "DOWN"))
+            elif grid_crossed:
+                crossed = grid_crossed
+
+        for level, rule in crossed:
+            if isinstance(rule, PercentRule):
+                self._fire_percent(rule, level, direction, price)
+            else:
+                self._fire(rule, level, direction)
+                if isinstance(rule, LevelRule) and rule.once:
+                    self.remove_rule(rule)
+
+    def _fire(self, rule, level, direction):
+        rule.fired += 1
+        self.rule_triggered.emit(rule, level, direction)
+
+    def _fire_percent(self, rule, level, direction, price):
+        for old_level, d in self._static_levels(rule):
+            self._static.remove(old_level, d, rule)
+        self._fire(rule, level, direction)
+        if not rule.rebase:
+            rule.spent.add(direction)
+        else:
+            rule.reference = level
+            # A gap move may cover several steps at once
+            while rule.fires(direction) and self._passed(rule.level(direction), direction, price):
+                level = rule.level(direction)
+                self._fire(rule, level, direction)
+                rule.reference = level
+        for new_level, d in self._static_levels(rule):
+            self._static.insert(new_level, d, rule)
+
+    @staticmethod
+    def _passed(level, direction, price):
+        return level < price if direction == "UP" else level > price
+
+    def _process_breakouts(self, price, now):
+        for group in self._groups.values():
+            span = group.range.range(now)
+            if span is not None:
+                low, high = span
+                for direction, level in (("UP", high), ("DOWN", low)):
+                    broken = group.broken.get(direction)
+                    if broken is not None:
+                        # Back inside the range it broke out of: re-arm
+                        if not self._passed(broken, direction, price):
+                            del group.broken[direction]
+                        continue
+                    if self._passed(level, direction, price):
+                        group.broken[direction] = level
+                        for rule in group.rules:
+                            if rule.fires(direction):
+                                self._fire(rule, level, direction)
+            group.range.add(now, price)
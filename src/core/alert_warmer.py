@@ -0,0 +1,53 @@
+"""
+Predictive pre-synthesis of the next boundary alerts.
+"""
+import math
+
+
+class AlertWarmer:
+    """
+    Watches the price against an IntervalTracker's boundaries and asks for
+    the alerts that can fire next to be synthesized ahead of time.
+
+    Runs as an AlertWorker evaluator (process_price). Whenever the price
+    moves into a new interval (or the interval changes), the `ahead`
+    boundaries above it (UP) and below it (DOWN) are sent to prefetch(),
+    nearest to the price first, as phrase(boundary, direction) values;
+    e.g. TTSService.prefetch with (text, voice, lang) phrases. A crossing
+    then nearly always plays from cache.
+
+    Call refresh() when phrase() would return something else for the same
+    boundary (language or voice changed).
+    """
+
+    def __init__(self, tracker, phrase, prefetch, ahead=2):
+        self.tracker = tracker
+        self.phrase = phrase
+        self.prefetch = prefetch
+        self.ahead = ahead
+        self._cell = None
+
+    def refresh(self):
+        self._cell = None
+
+    def boundaries(self, price):
+        """(boundary, direction) pairs that can fire next, nearest first."""
+        interval = self.tracker.interval
+        k = math.floor(price / interval)
+        if k * interval > price:  # Float rounding
+            k -= 1
+        up = [((k + 1 + i) * interval, "UP") for i in range(self.ahead)]
+        down = [((k - i) * interval, "DOWN") for i in range(self.ahead)]
+        # On a boundary exactly, it can still be crossed either way
+        if k * interval == price:
+            up.insert(0, (price, "UP"))
+            down.pop()
+        return sorted(up + down, key=lambda bd: abs(bd[0] - price))
+
+    def process_price(self, price):
+        interval = self.tracker.interval
+        cell = (math.floor(price / interval), price % interval == 0, interval)
+        if cell == self._cell:
+            return
+        self._cell = cell
+        self.prefetch([self.phrase(boundary, direction) for boundary, direction in self.boundaries(price)])
@@ -0,0 +1,90 @@
+"""
+Alert evaluation off the GUI thread.
+"""
+import queue
+import threading
+import time
+from PyQt6.QtCore import QObject
+
+
+class AlertWorker(QObject):
+    """
+    Evaluates alerts on a dedicated thread, fed straight from the WebSocket
+    thread, so a busy GUI thread (a dialog, a relayout, heavy repaints)
+    never delays a crossing.
+
+    push() never blocks. Prices are evaluated in exactly the order they were
+    pushed by every evaluator (IntervalTracker, RuleEngine: anything with
+    process_price(price)). Connect evaluator signals with
+    Qt.ConnectionType.DirectConnection so their handlers run on this thread
+    too; handlers must not touch widgets.
+
+    call(fn, *args) runs fn on the worker between two prices, e.g. changing the
+    tracker interval without racing process_price().
+
+    While a handler runs, `origin` is the (stamp, dispatch ns) of the price
+    being evaluated, for latency tracing.
+    """
+
+    def __init__(self, evaluators=(), parent=None):
+        super().__init__(parent)
+        self.evaluators = list(evaluators)
+        self.origin = None
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+
+        # Stats
+        self.prices_total = 0
+        self.max_backlog = 0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="AlertWorker", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Evaluate everything already pushed, then stop the thread."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def push(self, price, stamp=None):
+        """Any thread; never blocks."""
+        self._queue.put((price, stamp))
+
+    def push_path(self, prices):
+        """A burst of prices that must all be evaluated, in order (e.g. backfill)."""
+        for price in prices:
+            self._queue.put((price, None))
+
+    def call(self, fn, *args):
+        """Run fn(*args) on the worker thread, after every price pushed so far."""
+        self._queue.put((fn, args))
+
+    def _run(self):
+        get = self._queue.get
+        while True:
+            item = get()
+            if item is None:
+                return
+            backlog = self._queue.qsize()
+            if backlog > self.max_backlog:
+                self.max_backlog = backlog
+            head, arg = item
+            try:
+                if callable(head):
+                    head(*arg)
+                else:
+                    self._evaluate(head, arg)
+            except Exception as e:
+                print(f"[AlertWorker] Error: {e}")
+
+    def _evaluate(self, price, stamp):
+        self.origin = (stamp, time.time_ns())
+        try:
+            for evaluator in self.evaluators:
+                evaluator.process_price(price)
+        finally:
+            self.origin = None
+        self.prices_total += 1
@@ -0,0 +1,50 @@
+"""
+REST backfill of trades missed while the WebSocket was down.
+"""
+import requests
+
+from core.trade_decoder import Tick
+
+BINANCE_REST_URL = "https://api.binance.com"
+
+
+class AggTradesClient:
+    """
+    Minimal client for GET /api/v3/aggTrades.
+
+    The trade stream gives us trade ids, while aggTrades is keyed by
+    aggregate id. Each aggregate carries the range of trade ids it covers
+    (f..l), so we query by time from the last seen trade and drop aggregates
+    whose last trade id we already have.
+    """
+
+    def __init__(self, base_url=BINANCE_REST_URL, timeout=5.0, page_size=1000, max_pages=10):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.session = requests.Session()
+
+    def _get(self, params):
+        resp = self.session.get(f"{self.base_url}/api/v3/aggTrades", params=params, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def fetch_since(self, symbol, last_trade_id, last_trade_time):
+        """
+        Ticks traded after last_trade_id, oldest first.
+        Backfilled ticks carry the aggregate's last trade id, so live trades
+        can be de-duplicated against them by trade id.
+        """
+        ticks = []
+        params = {"symbol": symbol.upper(), "startTime": last_trade_time, "limit": self.page_size}
+        for _ in range(self.max_pages):
+            page = self._get(params)
+            for agg in page:
+                if agg["l"] <= last_trade_id:
+                    continue
+                ticks.append(Tick(symbol.lower(), float(agg["p"]), float(agg["q"]), int(agg["T"]), int(agg["l"])))
+            if len(page) < self.page_size:
+                break
+            params = {"symbol": symbol.upper(), "fromId": page[-1]["a"] + 1, "limit": self.page_size}
+        return ticks
@@ -0,0 +1,128 @@
+"""
+Incremental OHLCV candles for several timeframes at once.
+"""
+import threading
+from collections import namedtuple
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+
+CANDLE_DTYPE = np.dtype([
+    ("open_time", "<i8"),  # Bar start (ms since epoch)
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("volume", "<f8"),
+    ("trades", "<i8"),
+])
+
+DEFAULT_TIMEFRAMES = {
+    "1s": 1_000,
+    "1m": 60_000,
+    "5m": 300_000,
+    "1h": 3_600_000,
+}
+
+Candle = namedtuple("Candle", CANDLE_DTYPE.names)
+
+
+class _Series:
+    """Open bar as plain scalars plus a ring of closed bars."""
+
+    __slots__ = ("ms", "bar", "ring", "closed")
+
+    def __init__(self, ms, history):
+        self.ms = ms
+        self.bar = None  # [open_time, open, high, low, close, volume, trades]
+        self.ring = np.zeros(2 * history, dtype=CANDLE_DTYPE)  # Mirrored, see CandleBuilder.bars()
+        self.closed = 0
+
+
+class CandleBuilder(QObject):
+    """
+    Builds OHLCV bars from the trade stream, O(1) per tick per timeframe.
+
+    The open bar of each timeframe is kept as a handful of Python scalars; when
+    a tick lands in a later bucket the bar is written into that timeframe's
+    ring of the last `history` closed bars and bar_closed is emitted. Periods
+    without trades produce no bar. A tick older than the open bar (it can only
+    happen if exchange timestamps go backwards) is folded into the open bar.
+
+    append() is meant to be connected to PriceMonitor.tick_received with
+    Qt.ConnectionType.DirectConnection, so bar_closed fires on the WebSocket
+    thread; use a queued connection for GUI slots.
+    """
+
+    bar_closed = pyqtSignal(str, object)  # (timeframe, Candle)
+
+    def __init__(self, timeframes=None, history=1440, parent=None):
+        super().__init__(parent)
+        self.history = int(history)
+        self._series = {name: _Series(int(ms), self.history)
+                        for name, ms in (timeframes or DEFAULT_TIMEFRAMES).items()}
+        self._lock = threading.Lock()
+
+    @property
+    def timeframes(self):
+        return list(self._series)
+
+    def append(self, tick):
+        self.add(tick.trade_time, tick.price, tick.qty)
+
+    def add(self, time_ms, price, qty):
+        closed = None
+        with self._lock:
+            for name, s in self._series.items():
+                bar = s.bar
+                start = time_ms - time_ms % s.ms
+                if bar is not None and start <= bar[0]:
+                    if price > bar[2]:
+                        bar[2] = price
+                    elif price < bar[3]:
+                        bar[3] = price
+                    bar[4] = price
+                    bar[5] += qty
+                    bar[6] += 1
+                    continue
+                if bar is not None:
+                    self._store(s, bar)
+                    if closed is None:
+                        closed = []
+                    closed.append((name, Candle(*bar)))
+                s.bar = [start, price, price, price, price, qty, 1]
+        if closed:
+            for name, candle in closed:
+                self.bar_closed.emit(name, candle)
+
+    def _store(self, s, bar):
+        rec = tuple(bar)
+        i = s.closed % self.history
+        s.ring[i] = rec
+        s.ring[i + self.history] = rec
+        s.closed += 1
+
+    def current(self, timeframe):
+        """The open (not yet closed) bar, or None before the first tick."""
+        with self._lock:
+            bar = self._series[timeframe].bar
+            return Candle(*bar) if bar is not None else None
+
+    def bars(self, timeframe):
+        """
+        Read-only view of the retained closed bars, oldest first, no copy.
+        The view is live: a bar is overwritten `history` closes later.
+        """
+        s = self._series[timeframe]
+        with self._lock:
+            end = s.closed
+        n = min(end, self.history)
+        hi = (end - 1) % self.history + 1 if end else 0
+        if hi < n:
+            hi += self.history
+        v = s.ring[hi - n:hi]
+        v.flags.writeable = False
+        return v
+
+    def closed_count(self, timeframe):
+        """Bars closed since creation, including ones no longer retained."""
+        return self._series[timeframe].closed
@@ -0,0 +1,228 @@
+"""
+Wire format and shared-memory board of the local price hub (core.price_hub).
+
+Stream: subscribers connect to the hub over a Unix socket (TCP loopback where
+AF_UNIX is unavailable, e.g. Windows) and send JSON lines in the Binance
+request shape, with symbols as params:
+    {"method": "SUBSCRIBE", "params": ["btcusdt"], "id": 1}
+The hub answers with fixed-width binary records (HUB_DTYPE, 56 bytes): the
+symbol and trade id followed by a tick-log record (core.tick_recorder.TICK_DTYPE).
+
+Board: the hub also keeps the latest tick of every symbol in a shared-memory
+table guarded by a per-slot seqlock, so scripts can poll prices without a
+socket at all.
+"""
+import json
+import os
+import socket
+import struct
+import tempfile
+import time
+import numpy as np
+from multiprocessing import shared_memory
+
+from core.tick_recorder import TICK_DTYPE
+from core.trade_decoder import Tick
+
+HUB_DTYPE = np.dtype([("symbol", "S16"), ("trade_id", "<i8")] + TICK_DTYPE.descr)
+_HUB_STRUCT = struct.Struct("<16sqqqdd")  # Same layout as HUB_DTYPE
+assert _HUB_STRUCT.size == HUB_DTYPE.itemsize
+
+BOARD_NAME = "bittalker_prices"
+BOARD_MAGIC = b"BTBOARD1"
+BOARD_HEADER = 16  # magic + u4 slot count + u4 owner pid
+BOARD_DTYPE = np.dtype([("seq", "<u8"), ("symbol", "S16"), ("trade_id", "<i8")] + TICK_DTYPE.descr)
+
+
+def default_hub_address():
+    if hasattr(socket, "AF_UNIX"):
+        return os.path.join(tempfile.gettempdir(), "bittalker-hub.sock")
+    return "127.0.0.1:9560"
+
+
+def parse_hub_address(address):
+    """
+    'host:port' -> TCP, anything else -> Unix socket path. Returns (family, sockaddr).
+    Raises ValueError for a path where AF_UNIX is unavailable (Windows).
+    """
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and host:
+        return socket.AF_INET, (host, int(port))
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError(f"Hub address must be host:port on this platform (no Unix sockets): {address!r}")
+    return socket.AF_UNIX, address
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    return True
+
+
+def connect_hub(address, timeout=2.0):
+    family, sockaddr = parse_hub_address(address)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(sockaddr)
+    except OSError:
+        sock.close()
+        raise
+    sock.settimeout(None)
+    if family == socket.AF_INET:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def encode_request(method, params, request_id=None):
+    return (json.dumps({"method": method, "params": list(params), "id": request_id}) + "\n").encode()
+
+
+def pack_record(tick, recv_ns):
+    return _HUB_STRUCT.pack(tick.symbol.encode("ascii"), tick.trade_id, tick.trade_time, recv_ns,
+                            tick.price, tick.qty)
+
+
+class HubRecordReader:
+    """Reassembles records from arbitrary socket reads."""
+
+    def __init__(self):
+        self._buf = b""
+
+    def feed(self, data):
+        """Ticks for every complete record received so far, in order."""
+        buf = self._buf + data if self._buf else data
+        n = len(buf) // HUB_DTYPE.itemsize
+        end = n * HUB_DTYPE.itemsize
+        self._buf = buf[end:]
+        if not n:
+            return []
+        recs = np.frombuffer(buf, dtype=HUB_DTYPE, count=n)
+        return [Tick(sym.decode("ascii"), price, qty, event_time, trade_id)
+                for sym, trade_id, event_time, _, price, qty in recs.tolist()]
+
+
+class PriceBoard:
+    """
+    Shared-memory table of the latest tick per symbol.
+
+    Exactly one writer (the hub) publishes; any number of processes read.
+    Each slot has a sequence counter that is odd while the slot is being
+    written, so read() retries instead of returning a torn record. This
+    relies on the writer's stores becoming visible in order, which holds on
+    x86 and for the single-writer use here.
+    """
+
+    def __init__(self, shm, owner):
+        self._shm = shm
+        self.owner = owner
+        header = bytes(shm.buf[:BOARD_HEADER])
+        if header[:8] != BOARD_MAGIC:
+            raise ValueError(f"Not a price board: {shm.name}")
+        self.slots = int(np.frombuffer(header, dtype="<u4", count=1, offset=8)[0])
+        self._rows = np.ndarray((self.slots,), dtype=BOARD_DTYPE, buffer=shm.buf, offset=BOARD_HEADER)
+        self._seq = self._rows["seq"]
+        self._slot_of = {}
+
+    @classmethod
+    def create(cls, name=BOARD_NAME, slots=64):
+        """
+        Raises FileExistsError if the board belongs to a hub that is still
+        running; a board left over from one that died is replaced.
+        """
+        size = BOARD_HEADER + slots * BOARD_DTYPE.itemsize
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            cls._unlink_stale(name)
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        shm.buf[:BOARD_HEADER] = BOARD_MAGIC + np.array([slots, os.getpid()], dtype="<u4").tobytes()
+        return cls(shm, owner=True)
+
+    @staticmethod
+    def _unlink_stale(name):
+        if os.name != "posix":
+            # Windows frees the board with its last handle, so it cannot be stale
+            raise FileExistsError(f"Price board {name} is in use by another hub")
+        existing = shared_memory.SharedMemory(name=name)
+        try:
+            header = bytes(existing.buf[:BOARD_HEADER])
+            pid = int(np.frombuffer(header, dtype="<u4", count=1, offset=12)[0])
+            if header[:8] == BOARD_MAGIC and pid and _pid_alive(pid):
+                raise FileExistsError(f"Price board {name} is in use by the hub with pid {pid}")
+            print(f"[Hub] Replacing stale price board {name}")
+            existing.unlink()
+        finally:
+            existing.close()
+
+    @classmethod
+    def attach(cls, name=BOARD_NAME):
+        shm = shared_memory.SharedMemory(name=name)
+        if os.name == "posix":
+            # Readers must not unlink the board when they exit
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, owner=False)
+
+    def _slot(self, symbol):
+        slot = self._slot_of.get(symbol)
+        if slot is None:
+            names = self._rows["symbol"]
+            key = symbol.encode("ascii")
+            for i in range(self.slots):
+                if names[i] == key:
+                    slot = i
+                    break
+                if not names[i] and self.owner:
+                    names[i] = key
+                    slot = i
+                    break
+            if slot is None:
+                return None
+            self._slot_of[symbol] = slot
+        return slot
+
+    def publish(self, tick, recv_ns):
+        slot = self._slot(tick.symbol)
+        if slot is None:
+            return
+        rows = self._rows
+        seq = int(self._seq[slot])
+        self._seq[slot] = seq + 1
+        rows["trade_id"][slot] = tick.trade_id
+        rows["event_time"][slot] = tick.trade_time
+        rows["recv_time"][slot] = recv_ns
+        rows["price"][slot] = tick.price
+        rows["qty"][slot] = tick.qty
+        self._seq[slot] = seq + 2
+
+    def read(self, symbol, retries=1000):
+        """(Tick, hub receive ns) for the latest trade, or None if none yet."""
+        slot = self._slot(symbol)
+        if slot is None:
+            return None
+        for _ in range(retries):
+            seq = int(self._seq[slot])
+            if seq & 1:
+                time.sleep(0)
+                continue
+            rec = self._rows[slot].copy()
+            if int(self._seq[slot]) == seq:
+                if seq == 0:
+                    return None
+                return (Tick(symbol, float(rec["price"]), float(rec["qty"]), int(rec["event_time"]),
+                             int(rec["trade_id"])), int(rec["recv_time"]))
+        return None
+
+    def symbols(self):
+        return [s.decode("ascii") for s in self._rows["symbol"] if s]
+
+    def close(self):
+        self._rows = self._seq = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
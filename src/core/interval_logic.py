@@ -1,5 +1,13 @@
 from PyQt6.QtCore import QObject, pyqtSignal
 import math
+import numpy as np
+
+# One row per boundary crossing from process_prices()
+CROSSING_DTYPE = np.dtype([
+    ("tick", "<i8"),       # Index of the price that crossed it
+    ("boundary", "<f8"),
+    ("direction", "i1"),   # +1 UP, -1 DOWN
+])
 
 class IntervalTracker(QObject):
     """
@@ -10,17 +18,28 @@ class IntervalTracker(QObject):
     
     Only emits signals when the state CHANGES. 
     If price oscillates around a boundary, only the first crossing in each direction triggers.
+    A gap move across several boundaries in one tick reports every one of them, in order.
     """
     
     interval_crossed = pyqtSignal(float, str)  # (boundary_price, "UP" or "DOWN")
+    interval_jumped = pyqtSignal(float, float, str, int)  # (first, last boundary, direction, count) - aggregate mode
+
+    def __init__(self, interval=50.0, aggregate=False, window=256):
+        """
+        aggregate: a single price move that crosses several boundaries (a gap
+        move) emits one interval_jumped instead of an interval_crossed for each.
 
-    def __init__(self, interval=50.0):
+        window: boundary state is kept only for boundaries within this many
+        intervals of the current price (None = keep everything).
+        """
         super().__init__()
         self.interval = interval
+        self.aggregate = aggregate
+        self.window = window
         self.last_price = None
         
         # Track the last notified state for each boundary
-        # Key: boundary (float), Value: last state ("ABOVE" or "BELOW")
+        # Key: boundary index k (boundary = k * interval), Value: last state ("ABOVE" or "BELOW")
         self.boundary_states = {}
 
     def set_interval(self, interval):
@@ -28,6 +47,17 @@ class IntervalTracker(QObject):
         # Clear state when interval changes
         self.boundary_states = {}
 
+    def _prune(self, price):
+        """
+        Forget boundaries far from the price. Each of them is strictly on one
+        side of the price and was last updated when the price was on that same
+        side, so its state is exactly what crossings() assumes for an untracked
+        boundary: alerts are unaffected.
+        """
+        center = self._floor_index(price)
+        lo, hi = center - self.window, center + self.window + 1
+        self.boundary_states = {k: v for k, v in self.boundary_states.items() if lo <= k <= hi}
+
     def _get_state(self, price, boundary):
         """
         Determine if price is above or below the boundary.
@@ -42,40 +72,149 @@ class IntervalTracker(QObject):
         else:
             return "EQUAL"
 
-    def process_price(self, current_price):
-        if self.last_price is None:
-            self.last_price = current_price
-            return
+    def _floor_index(self, price):
+        """
+        Index of the highest boundary <= price, by comparing against
+        k * interval itself (price / interval alone can round across it).
+        """
+        k = math.floor(price / self.interval)
+        if price < k * self.interval:
+            k -= 1
+        elif price >= (k + 1) * self.interval:
+            k += 1
+        return k
 
-        # Find the nearest boundaries around current price
-        floor_boundary = math.floor(current_price / self.interval) * self.interval
-        ceil_boundary = floor_boundary + self.interval
-        
-        # Check both boundaries
-        for boundary in [floor_boundary, ceil_boundary]:
+    def boundary_indices(self, a, b):
+        """
+        Index k of every boundary (k * interval) in [min(a, b), max(a, b)],
+        ordered from a towards b. O(k) in the number of boundaries.
+        """
+        lo, hi = (a, b) if a <= b else (b, a)
+        first = self._floor_index(lo)
+        if first * self.interval != lo:
+            first += 1
+        last = self._floor_index(hi)
+        return range(first, last + 1) if a <= b else range(last, first - 1, -1)
+
+    def boundaries_between(self, a, b):
+        return [k * self.interval for k in self.boundary_indices(a, b)]
+
+    def crossings(self, current_price):
+        """
+        Boundaries crossed by moving from last_price to current_price, in the
+        order they were crossed, as (boundary, "UP"/"DOWN"). Updates state.
+        """
+        crossed = []
+        states = self.boundary_states
+        for k in self.boundary_indices(self.last_price, current_price):
+            boundary = k * self.interval
             current_state = self._get_state(current_price, boundary)
             
-            # If price is exactly on boundary, no state change occurs
+            # Last known valid state for this boundary: if never tracked, the
+            # side the previous price was on (EQUAL there = no known side yet)
+            last_state = states.get(k)
+            if last_state is None:
+                last_state = self._get_state(self.last_price, boundary)
+            
+            # If price is exactly on boundary, no state change occurs, but the
+            # side it came from is remembered
             if current_state == "EQUAL":
+                if last_state != "EQUAL":
+                    states[k] = last_state
                 continue
                 
-            # Get last known valid state for this boundary
-            last_state = self.boundary_states.get(boundary)
-            
-            # If we haven't tracked this boundary yet, initialize it
-            if last_state is None:
-                self.boundary_states[boundary] = current_state
-                continue
-            
-            # If state changed (and strictly different)
-            if current_state != last_state:
-                if current_state == "ABOVE" and last_state == "BELOW":
-                    # Crossed UP
-                    self.interval_crossed.emit(boundary, "UP")
-                    self.boundary_states[boundary] = "ABOVE"
-                elif current_state == "BELOW" and last_state == "ABOVE":
-                    # Crossed DOWN
-                    self.interval_crossed.emit(boundary, "DOWN")
-                    self.boundary_states[boundary] = "BELOW"
-        
+            if current_state != last_state and last_state != "EQUAL":
+                crossed.append((boundary, "UP" if current_state == "ABOVE" else "DOWN"))
+            states[k] = current_state
+        return crossed
+
+    def process_price(self, current_price):
+        if self.last_price is None:
+            self.last_price = current_price
+            return
+
+        crossed = self.crossings(current_price)
         self.last_price = current_price
+        if self.window is not None and len(self.boundary_states) > 4 * self.window + 4:
+            # Amortized O(1): prune only once the table has doubled
+            self._prune(current_price)
+
+        if self.aggregate and len(crossed) > 1:
+            direction = crossed[-1][1]
+            self.interval_jumped.emit(crossed[0][0], crossed[-1][0], direction, len(crossed))
+            return
+        for boundary, direction in crossed:
+            self.interval_crossed.emit(boundary, direction)
+
+    def process_prices(self, prices):
+        """
+        Every crossing in a whole price series at once, as a CROSSING_DTYPE
+        array in the order process_price() would have emitted them.
+        Vectorized; emits no signals, but leaves the tracker in a state that
+        is equivalent for later process_price() calls.
+
+        Each price maps to an odd level 2k+1 (strictly between boundaries k
+        and k+1) or, exactly on boundary k, to 2k-1 or 2k+1 depending on the
+        side it was approached from. Consecutive levels L0 -> L1 then cross
+        exactly the boundaries j with 2j strictly between them.
+        """
+        p = np.asarray(prices, dtype=np.float64).ravel()
+        interval = self.interval
+        prior = self.last_price
+        if prior is not None:
+            p = np.concatenate(([prior], p))
+        n = len(p)
+        if n == 0:
+            return np.zeros(0, dtype=CROSSING_DTYPE)
+
+        k = np.floor(p / interval)
+        k -= p < k * interval
+        k += p >= (k + 1) * interval
+        k = k.astype(np.int64)
+        on = p == k * interval
+        level = 2 * k + 1
+
+        # A price on a boundary takes the side of the last different price
+        # before it (any price below it is also below the boundary)
+        changed = np.empty(n, dtype=bool)
+        changed[0] = False
+        np.not_equal(p[1:], p[:-1], out=changed[1:])
+        run_start = np.maximum.accumulate(np.where(changed, np.arange(n), 0))
+        came_from = p[np.maximum(run_start - 1, 0)]
+        level = np.where(on & (came_from < p), 2 * k - 1, level)
+
+        # The first run has no earlier price: use the tracker's remembered
+        # side, or failing that the side the price leaves towards (no alert)
+        first_run = run_start == 0
+        known_side = None
+        if on[0]:
+            side = known_side = self.boundary_states.get(int(k[0])) if prior is not None else None
+            if side is None:
+                later = np.flatnonzero(~first_run)
+                side = "BELOW" if len(later) and p[later[0]] < p[0] else "ABOVE"
+            first_level = 2 * k[0] + (1 if side == "ABOVE" else -1)
+            level[first_run] = first_level
+
+        steps = np.diff(level)
+        counts = np.abs(steps) // 2
+        moved = np.flatnonzero(counts)
+        counts = counts[moved]
+        total = int(counts.sum())
+        events = np.zeros(total, dtype=CROSSING_DTYPE)
+        if total:
+            direction = np.sign(steps[moved])
+            # First boundary crossed by each step, then walk away from it
+            start = (level[moved] + direction) // 2
+            offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            rep_dir = np.repeat(direction, counts)
+            events["tick"] = np.repeat(moved + 1, counts) - (prior is not None)
+            events["boundary"] = (np.repeat(start, counts) + rep_dir * offsets) * interval
+            events["direction"] = rep_dir
+
+        # Equivalent streaming state: only a boundary the price sits on needs one
+        last = n - 1
+        self.last_price = float(p[last])
+        self.boundary_states = {}
+        if on[last] and (not first_run[last] or known_side):
+            self.boundary_states[int(k[last])] = "ABOVE" if level[last] > 2 * k[last] else "BELOW"
+        return events
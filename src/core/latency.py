@@ -0,0 +1,152 @@
+"""
+Tick-to-speech latency instrumentation.
+
+An AlertTrace collects wall-clock timestamps (time.time_ns) for each stage an
+alert passes through, from the exchange trade time to playback start. When
+the trace finishes, LatencyRecorder folds every stage-to-stage delta, and
+the total from the exchange event, into log-linear histograms.
+
+Exchange event time comes from Binance's clock, so event -> recv includes
+any clock skew with this machine; recv -> play is local only.
+"""
+import math
+import threading
+import time
+
+# Stage order. cache_hit and synth_done are alternatives: one of them per alert.
+STAGES = ("event", "recv", "dispatch", "emit", "speak", "cache_hit", "synth_done", "play")
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of microsecond values.
+
+    Values below 2**sub_bits get one bucket each; above that every power of
+    two is split into 2**(sub_bits - 1) linear buckets, so any recorded value
+    is reported within about 1 / 2**(sub_bits - 1) of its true value
+    (about 3% with the default) using a few hundred counters.
+    """
+
+    def __init__(self, sub_bits=6, max_us=3_600_000_000):
+        self.sub_bits = sub_bits
+        self._half = 1 << (sub_bits - 1)
+        self.max_us = max_us
+        self.counts = [0] * (self._index(max_us) + 1)
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.sum = 0
+        self.clamped = 0  # Negative (clock skew) or above max_us
+
+    def _index(self, v):
+        e = v.bit_length() - self.sub_bits
+        if e <= 0:
+            return v
+        return e * self._half + (v >> e)
+
+    def _upper(self, index):
+        """Highest value that maps to this bucket."""
+        if index < 2 * self._half:
+            return index
+        e = index // self._half - 1
+        top = index - e * self._half
+        return ((top + 1) << e) - 1
+
+    def record(self, micros):
+        v = int(micros)
+        if v < 0 or v > self.max_us:
+            self.clamped += 1
+            v = min(max(v, 0), self.max_us)
+        self.counts[self._index(v)] += 1
+        self.total += 1
+        self.sum += v
+        self.max = max(self.max, v)
+        self.min = v if self.min is None else min(self.min, v)
+
+    def percentile(self, q):
+        """Value at or below which q percent of samples fall (bucket upper bound)."""
+        if not self.total:
+            return None
+        target = max(1, math.ceil(self.total * q / 100.0))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._upper(index), self.max)
+        return self.max
+
+    def mean(self):
+        return self.sum / self.total if self.total else None
+
+
+class AlertTrace:
+    """Timestamps of one alert. mark() stages as they happen, then finish() once."""
+
+    __slots__ = ("recorder", "marks", "_done")
+
+    def __init__(self, recorder, event_ms=None, recv_ns=None):
+        self.recorder = recorder
+        self.marks = {}
+        self._done = False
+        if event_ms:
+            self.marks["event"] = int(event_ms) * 1_000_000
+        if recv_ns:
+            self.marks["recv"] = recv_ns
+
+    def mark(self, stage, t_ns=None):
+        self.marks[stage] = time.time_ns() if t_ns is None else t_ns
+
+    def finish(self):
+        if not self._done:
+            self._done = True
+            self.recorder.record_trace(self)
+
+
+class LatencyRecorder:
+    """Thread-safe set of named histograms. dump() renders them as a table."""
+
+    PERCENTILES = (50, 90, 99, 99.9)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hists = {}
+        self.traces = 0
+
+    def trace(self, event_ms=None, recv_ns=None):
+        return AlertTrace(self, event_ms, recv_ns)
+
+    def record(self, name, micros):
+        with self._lock:
+            hist = self._hists.get(name)
+            if hist is None:
+                hist = self._hists[name] = LatencyHistogram()
+            hist.record(micros)
+
+    def record_span(self, name, start_ns, end_ns):
+        if start_ns and end_ns:
+            self.record(name, (end_ns - start_ns) // 1000)
+
+    def record_trace(self, trace):
+        stages = [(s, trace.marks[s]) for s in STAGES if s in trace.marks]
+        for (a, ta), (b, tb) in zip(stages, stages[1:]):
+            self.record_span(f"{a} -> {b}", ta, tb)
+        if len(stages) > 1 and stages[0][0] == "event":
+            self.record_span(f"event -> {stages[-1][0]} (total)", stages[0][1], stages[-1][1])
+        with self._lock:
+            self.traces += 1
+
+    def histograms(self):
+        with self._lock:
+            return dict(self._hists)
+
+    def dump(self):
+        with self._lock:
+            rows = sorted(self._hists.items())
+            lines = [f"Latency ({self.traces} alerts traced), milliseconds",
+                     f"{'span':<32} {'count':>7} {'mean':>8} "
+                     + " ".join(f"{'p' + format(q, 'g'):>8}" for q in self.PERCENTILES)
+                     + f" {'max':>8}"]
+            for name, h in rows:
+                pcts = " ".join(f"{h.percentile(q) / 1000:>8.1f}" for q in self.PERCENTILES)
+                lines.append(f"{name:<32} {h.total:>7} {h.mean() / 1000:>8.1f} {pcts} {h.max / 1000:>8.1f}")
+        return "\n".join(lines)
@@ -0,0 +1,304 @@
+"""
+Local price hub: one upstream Binance connection shared by every BitTalker
+window and helper script on the machine.
+
+The hub owns a multi-symbol PriceMonitor (one combined-stream connection,
+one upstream subscription per symbol however many local subscribers want
+it), publishes every tick to the shared-memory PriceBoard and fans it out to
+subscribers over a local socket (see core.hub_protocol). Symbols are
+subscribed upstream when the first local subscriber asks for them and
+dropped again when the last one leaves, except those pinned with --symbols
+(PriceHub.pin).
+
+Usage:
+    python src/core/price_hub.py [--address /tmp/bittalker-hub.sock] [--symbols btcusdt]
+    python src/main.py  # with "hub_address" set in settings.json
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+# Allow running as a script (python src/core/price_hub.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt6.QtCore import Qt
+
+from core.backfill import BINANCE_REST_URL
+from core.hub_protocol import (BOARD_NAME, PriceBoard, connect_hub, default_hub_address, pack_record,
+                               parse_hub_address)
+from core.price_monitor import PriceMonitor, BINANCE_WS_URL
+
+
+class _HubHandler(socketserver.BaseRequestHandler):
+    """One local subscriber."""
+
+    def setup(self):
+        self.symbols = set()
+        self.send_lock = threading.Lock()
+        self.closed = False
+        self.request.settimeout(None)
+
+    def handle(self):
+        hub = self.server.hub
+        hub.register(self)
+        buf = b""
+        try:
+            while not self.closed:
+                try:
+                    data = self.request.recv(4096)
+                except socket.timeout:
+                    # The socket timeout is meant for sends; idle subscribers are fine
+                    continue
+                if not data:
+                    break
+                *lines, buf = (buf + data).split(b"\n")
+                for line in lines:
+                    self._handle_request(hub, line)
+        except OSError:
+            pass
+        finally:
+            hub.unregister(self)
+
+    def _handle_request(self, hub, line):
+        try:
+            req = json.loads(line)
+        except ValueError:
+            return
+        method = req.get("method")
+        params = [s.lower() for s in req.get("params") or []]
+        if method == "SUBSCRIBE":
+            hub.subscribe(self, params)
+        elif method == "UNSUBSCRIBE":
+            hub.unsubscribe(self, params)
+
+    def send(self, data):
+        """Called on the upstream thread. A subscriber that cannot keep up is dropped."""
+        if self.closed:
+            return
+        try:
+            with self.send_lock:
+                self.request.sendall(data)
+        except OSError:
+            self.close()
+
+    def close(self):
+        self.closed = True
+        try:
+            self.request.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+if hasattr(socket, "AF_UNIX"):
+    class _UnixHubServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+        request_queue_size = 128  # Many instances may (re)connect at once
+
+
+class _TcpHubServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+
+class PriceHub:
+    """
+    start() runs the hub in the background (stop() to shut down).
+
+    send_timeout: a subscriber whose socket stays full this long is
+    disconnected instead of stalling fan-out to everyone else.
+    """
+
+    def __init__(self, address=None, board_name=BOARD_NAME, board_slots=64, base_url=BINANCE_WS_URL,
+                 rest_url=BINANCE_REST_URL, stream_type="trade", send_timeout=0.5):
+        self.address = address or default_hub_address()
+        self.board_name = board_name
+        self.board_slots = board_slots
+        self.send_timeout = send_timeout
+        self.monitor = PriceMonitor(symbols=[], base_url=base_url, rest_url=rest_url, stream_type=stream_type)
+        self.board = None
+        self.server = None
+        self._lock = threading.Lock()
+        # Held across a refcount change and the upstream (un)subscribe it causes,
+        # so a concurrent subscribe cannot run its add_symbol before a remove_symbol
+        self._sub_lock = threading.Lock()
+        self._clients = set()
+        self._refs = {}  # symbol -> number of subscribers (+1 if pinned)
+        self._pinned = set()
+        self._fanout = {}  # symbol -> tuple of subscribers (replaced, never mutated)
+        self._thread = None
+
+        # Stats
+        self.ticks_in = 0
+        self.records_out = 0
+
+    @property
+    def clients(self):
+        with self._lock:
+            return len(self._clients)
+
+    @property
+    def upstream_symbols(self):
+        return list(self.monitor.symbols)
+
+    def start(self):
+        """Raises RuntimeError if another hub is already serving this address or board."""
+        family, sockaddr = parse_hub_address(self.address)
+        unix = family != socket.AF_INET  # parse_hub_address checked AF_UNIX exists
+        try:
+            connect_hub(self.address, timeout=1.0).close()
+        except (ConnectionRefusedError, FileNotFoundError):
+            # Nobody listening: a socket file left behind is from a hub that died
+            if unix and os.path.exists(sockaddr):
+                os.unlink(sockaddr)
+        except OSError:
+            if unix:
+                raise
+            # TCP: binding below tells whether the port is taken
+        else:
+            raise RuntimeError(f"A price hub is already running at {self.address}")
+        server = (_UnixHubServer if unix else _TcpHubServer)(sockaddr, _HubHandler)
+        try:
+            self.board = PriceBoard.create(self.board_name, self.board_slots)
+        except FileExistsError as e:
+            server.server_close()
+            if unix:
+                os.unlink(sockaddr)
+            raise RuntimeError(str(e)) from e
+        self.server = server
+        self.server.hub = self
+        self.monitor.tick_received.connect(self._on_tick, Qt.ConnectionType.DirectConnection)
+        self.monitor.start()
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.address
+
+    def stop(self):
+        self.monitor.stop()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            with self._lock:
+                clients = list(self._clients)
+            for client in clients:
+                client.close()
+            family, sockaddr = parse_hub_address(self.address)
+            if family != socket.AF_INET and os.path.exists(sockaddr):
+                os.unlink(sockaddr)
+        if self.board:
+            self.board.close()
+            self.board = None
+
+    def register(self, client):
+        client.request.settimeout(self.send_timeout)
+        with self._lock:
+            self._clients.add(client)
+
+    def unregister(self, client):
+        client.close()
+        with self._lock:
+            self._clients.discard(client)
+        self.unsubscribe(client, list(client.symbols))
+
+    def pin(self, symbols):
+        """Keep symbols subscribed upstream even while no client wants them."""
+        with self._sub_lock:
+            added = []
+            with self._lock:
+                for symbol in symbols:
+                    if symbol in self._pinned:
+                        continue
+                    self._pinned.add(symbol)
+                    self._refs[symbol] = self._refs.get(symbol, 0) + 1
+                    if self._refs[symbol] == 1:
+                        added.append(symbol)
+            for symbol in added:
+                self.monitor.add_symbol(symbol)
+
+    def subscribe(self, client, symbols):
+        with self._sub_lock:
+            added = []
+            with self._lock:
+                for symbol in symbols:
+                    if symbol in client.symbols:
+                        continue
+                    client.symbols.add(symbol)
+                    self._refs[symbol] = self._refs.get(symbol, 0) + 1
+                    self._fanout[symbol] = self._fanout.get(symbol, ()) + (client,)
+                    if self._refs[symbol] == 1:
+                        added.append(symbol)
+            for symbol in added:
+                self.monitor.add_symbol(symbol)
+        # Start the subscriber off with the latest known price
+        for symbol in symbols:
+            latest = self.board.read(symbol) if self.board else None
+            if latest:
+                client.send(pack_record(*latest))
+
+    def unsubscribe(self, client, symbols):
+        with self._sub_lock:
+            removed = []
+            with self._lock:
+                for symbol in symbols:
+                    if symbol not in client.symbols:
+                        continue
+                    client.symbols.discard(symbol)
+                    self._fanout[symbol] = tuple(c for c in self._fanout.get(symbol, ()) if c is not client)
+                    self._refs[symbol] -= 1
+                    if self._refs[symbol] == 0 and symbol not in self._pinned:
+                        del self._refs[symbol]
+                        removed.append(symbol)
+            for symbol in removed:
+                self.monitor.remove_symbol(symbol)
+
+    def _on_tick(self, tick):
+        """Upstream WebSocket thread: board first, then every subscriber."""
+        recv_ns = time.time_ns()
+        self.ticks_in += 1
+        self.board.publish(tick, recv_ns)
+        subscribers = self._fanout.get(tick.symbol, ())
+        if subscribers:
+            data = pack_record(tick, recv_ns)
+            for client in subscribers:
+                client.send(data)
+            self.records_out += len(subscribers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local BitTalker price hub")
+    parser.add_argument("--address", default=default_hub_address(), help="Unix socket path or host:port")
+    parser.add_argument("--symbols", default="", help="Comma-separated symbols to keep subscribed upstream")
+    parser.add_argument("--ws", default=BINANCE_WS_URL, help="Upstream WebSocket base URL")
+    parser.add_argument("--rest", default=BINANCE_REST_URL, help="Upstream REST base URL (backfill)")
+    parser.add_argument("--stream-type", default="trade")
+    parser.add_argument("--board", default=BOARD_NAME, help="Shared-memory board name")
+    args = parser.parse_args()
+
+    hub = PriceHub(args.address, board_name=args.board, base_url=args.ws, rest_url=args.rest,
+                   stream_type=args.stream_type)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))  # Clean up the board on terminate()
+    try:
+        hub.start()
+    except RuntimeError as e:
+        print(f"[Hub] {e}")
+        sys.exit(1)
+    hub.pin(filter(None, args.symbols.lower().split(",")))
+    print(f"Price hub listening on {hub.address} (board: {args.board})", flush=True)
+    try:
+        while True:
+            time.sleep(1.0)
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        print(f"[Hub] {hub.ticks_in} ticks in, {hub.records_out} records out")
+        hub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,78 +1,344 @@
 import json
+import random
+import socket
 import threading
 import time
 import websocket
 from PyQt6.QtCore import QObject, pyqtSignal
 
+from core.trade_decoder import BACKFILL_STREAMS, STREAM_DECODERS, make_decoder
+from core.backfill import AggTradesClient, BINANCE_REST_URL
+from core.hub_protocol import HubRecordReader, connect_hub, encode_request
+
+# Use Binance Global as it's often more reliable for international users
+# Was: wss://stream.binance.us:9443/ws/...
+BINANCE_WS_URL = "wss://stream.binance.com:9443"
+
+# Reconnect policy: retry immediately once, then exponential backoff with jitter
+RECONNECT_BASE_DELAY = 0.5
+RECONNECT_MAX_DELAY = 30.0
+STABLE_CONNECTION_SECONDS = 10.0  # Connection lasting this long resets the backoff
+
 class PriceMonitor(QObject):
     price_updated = pyqtSignal(float)
+    symbol_price_updated = pyqtSignal(str, float)  # (symbol, price) - multi-symbol mode
+    tick_received = pyqtSignal(object)  # Tick (symbol, price, qty, trade_time, trade_id)
+    backfilled = pyqtSignal(object)  # list[Tick] missed during an outage, oldest first
+    reconnected = pyqtSignal(float, int)  # (outage seconds, backfilled ticks)
     connection_status = pyqtSignal(bool)
 
-    def __init__(self, symbol="btcusdt"):
+    def __init__(self, symbol="btcusdt", symbols=None, base_url=BINANCE_WS_URL, decoder=None,
+                 rest_url=BINANCE_REST_URL, backfill=True, stream_type="trade", hub=None):
+        """
+        Single-symbol mode (default): one raw `{symbol}@{stream_type}` stream.
+        Multi-symbol mode (symbols=[...]): every symbol shares one combined-stream
+        connection. The first symbol stays the primary one driving price_updated.
+
+        stream_type: trade (every trade), aggTrade (one per taker order),
+        bookTicker (mid of best bid/ask) or miniTicker (last price, 1/sec).
+
+        decoder: frame -> Tick parser (see core.trade_decoder). Defaults to the
+        parser for stream_type.
+
+        backfill: after a reconnect, fetch trades missed since the last seen
+        trade id from rest_url (aggTrades) and publish them via `backfilled`
+        (and tick_received) before any new live trade. Backfilled trades are
+        not re-sent on price_updated. Only trade and aggTrade streams backfill.
+
+        hub: address of a local price hub (see core.price_hub). Ticks then come
+        from the hub instead of Binance, so any number of instances share one
+        upstream connection; the hub decides the stream type and does the
+        backfilling, so decoder and backfill are ignored.
+        """
         super().__init__()
-        self.symbol = symbol.lower()
-        # Use Binance Global as it's often more reliable for international users
-        # Was: wss://stream.binance.us:9443/ws/...
-        self.ws_url = f"wss://stream.binance.com:9443/ws/{self.symbol}@trade"
+        if stream_type not in STREAM_DECODERS:
+            raise ValueError(f"Unknown stream type: {stream_type}")
+        self.stream_type = stream_type
+        self.hub = hub
+        self.multi = symbols is not None
+        if self.multi:
+            self.symbols = [s.lower() for s in symbols]
+            self.symbol = self.symbols[0] if self.symbols else None  # Set by the first add_symbol()
+        else:
+            self.symbol = symbol.lower()
+            self.symbols = [self.symbol]
+        self.base_url = base_url.rstrip("/")
+        self.decoder = decoder or make_decoder(stream_type)
+        self.ws_url = self._build_url()
         self.ws = None
+        self.hub_sock = None
         self.keep_running = True
         self.thread = None
+        self._stop_event = threading.Event()
+
+        # Reconnect / backfill state
+        if hub or not backfill or stream_type not in BACKFILL_STREAMS:
+            self.backfill_client = None
+        else:
+            self.backfill_client = AggTradesClient(rest_url)
+        self._last_trade = {}  # symbol -> last Tick seen (live or backfilled)
+        self._reconnect_attempts = 0
+        self._opened_at = None
+        self._disconnected_at = None
+
+        # Primary symbol's latest live tick: exchange time (ms) and receive time (ns)
+        self.last_event_ms = None
+        self.last_recv_ns = None
+
+        # Outage metrics
+        self.outage_count = 0
+        self.last_outage_seconds = 0.0
+        self.last_backfill_size = 0
+        self.total_backfilled = 0
+
+        # Runtime subscription state (multi-symbol mode)
+        self._sub_lock = threading.Lock()
+        self._subscribed = set()  # Streams the server currently sends us
+        self._request_id = 0
+        self._connected = False
+
+    def _stream_name(self, symbol):
+        if self.hub:
+            return symbol
+        return f"{symbol}@{self.stream_type}"
+
+    def _build_url(self):
+        if not self.multi:
+            return f"{self.base_url}/ws/{self._stream_name(self.symbol)}"
+        streams = "/".join(self._stream_name(s) for s in self.symbols)
+        if not streams:
+            return f"{self.base_url}/stream"
+        return f"{self.base_url}/stream?streams={streams}"
 
     def start(self):
         self.keep_running = True
-        self.thread = threading.Thread(target=self._run_ws, daemon=True)
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._run_hub if self.hub else self._run_ws, daemon=True)
         self.thread.start()
 
     def stop(self):
         self.keep_running = False
+        self._stop_event.set()
         if self.ws:
             self.ws.close()
+        if self.hub_sock:
+            try:
+                self.hub_sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
         if self.thread:
             self.thread.join(timeout=1.0)
 
+    def add_symbol(self, symbol):
+        """Subscribe to another symbol without reconnecting (multi-symbol mode)."""
+        if not self.multi:
+            raise RuntimeError("add_symbol requires multi-symbol mode")
+        symbol = symbol.lower()
+        with self._sub_lock:
+            if symbol in self.symbols:
+                return
+            self.symbols.append(symbol)
+            if not self.symbol:
+                self.symbol = symbol
+        self._sync_subscriptions()
+
+    def remove_symbol(self, symbol):
+        """Unsubscribe from a symbol without reconnecting (multi-symbol mode)."""
+        if not self.multi:
+            raise RuntimeError("remove_symbol requires multi-symbol mode")
+        symbol = symbol.lower()
+        with self._sub_lock:
+            if symbol not in self.symbols:
+                return
+            self.symbols.remove(symbol)
+            if symbol == self.symbol:
+                # price_updated follows the next symbol instead of going quiet
+                self.symbol = self.symbols[0] if self.symbols else None
+        self._sync_subscriptions()
+
+    def _sync_subscriptions(self):
+        """Send SUBSCRIBE/UNSUBSCRIBE so the live connection matches self.symbols."""
+        with self._sub_lock:
+            if not self._connected:
+                # Next connect builds its URL from self.symbols
+                return
+            wanted = {self._stream_name(s) for s in self.symbols}
+            to_add = sorted(wanted - self._subscribed)
+            to_remove = sorted(self._subscribed - wanted)
+            self._subscribed = wanted
+            requests = []
+            for method, params in (("SUBSCRIBE", to_add), ("UNSUBSCRIBE", to_remove)):
+                if params:
+                    self._request_id += 1
+                    requests.append({"method": method, "params": params, "id": self._request_id})
+        for req in requests:
+            try:
+                self._send_control(req)
+            except Exception as e:
+                print(f"WS Subscribe Error: {e}")
+
+    def _send_control(self, req):
+        if self.hub:
+            self.hub_sock.sendall(encode_request(req["method"], req["params"], req["id"]))
+        else:
+            self.ws.send(json.dumps(req))
+
+    def _next_reconnect_delay(self):
+        """0 for the first retry, then exponential backoff with jitter."""
+        attempt = self._reconnect_attempts
+        self._reconnect_attempts += 1
+        if attempt == 0:
+            return 0.0
+        delay = min(RECONNECT_MAX_DELAY, RECONNECT_BASE_DELAY * (2 ** (attempt - 1)))
+        return random.uniform(delay / 2, delay)
+
     def _run_ws(self):
         while self.keep_running:
             try:
                 self.connection_status.emit(False)
+                with self._sub_lock:
+                    self.ws_url = self._build_url()
+                    url_streams = {self._stream_name(s) for s in self.symbols}
                 print(f"Connecting to {self.ws_url}...")
+                self._opened_at = None
                 self.ws = websocket.WebSocketApp(
                     self.ws_url,
-                    on_open=self._on_open,
+                    on_open=lambda ws: self._on_open(ws, url_streams),
                     on_message=self._on_message,
                     on_error=self._on_error,
                     on_close=self._on_close
                 )
-                
+
                 # Standard run without bypassing SSL
                 self.ws.run_forever(ping_interval=60, ping_timeout=10)
-                
-                if self.keep_running:
-                    print("WS Reconnecting in 5s...")
-                    time.sleep(5) # Reconnect delay
             except Exception as e:
                 print(f"WS Critical Error: {e}")
-                time.sleep(5)
 
-    def _on_open(self, ws):
+            if self._opened_at is not None:
+                if self._disconnected_at is None:
+                    self._disconnected_at = time.time()
+                if time.monotonic() - self._opened_at >= STABLE_CONNECTION_SECONDS:
+                    self._reconnect_attempts = 0
+            if self.keep_running:
+                delay = self._next_reconnect_delay()
+                print(f"WS Reconnecting in {delay:.2f}s...")
+                self._stop_event.wait(delay)
+
+    def _run_hub(self):
+        """Hub client loop: same reconnect policy as _run_ws, records instead of frames."""
+        while self.keep_running:
+            self.connection_status.emit(False)
+            self._opened_at = None
+            sock = None
+            try:
+                print(f"Connecting to hub {self.hub}...")
+                sock = self.hub_sock = connect_hub(self.hub)
+                self._on_open(None)
+                reader = HubRecordReader()
+                while self.keep_running:
+                    data = sock.recv(65536)
+                    if not data:
+                        break
+                    recv_ns = time.time_ns()
+                    for tick in reader.feed(data):
+                        self._dispatch(tick, recv_ns)
+            except Exception as e:
+                if self.keep_running:
+                    print(f"Hub Error: {e}")
+            finally:
+                if sock:
+                    sock.close()
+                    self._on_close(None, None, "hub connection closed")
+
+            if self._opened_at is not None and time.monotonic() - self._opened_at >= STABLE_CONNECTION_SECONDS:
+                self._reconnect_attempts = 0
+            if self.keep_running:
+                delay = self._next_reconnect_delay()
+                print(f"Hub Reconnecting in {delay:.2f}s...")
+                self._stop_event.wait(delay)
+
+    def _on_open(self, ws, url_streams=None):
         print("WebSocket Connected")
+        self._opened_at = time.monotonic()
+        if self.multi or self.hub:
+            with self._sub_lock:
+                self._connected = True
+                self._subscribed = set(url_streams or ())
+            # Catch symbols added/removed while we were connecting
+            self._sync_subscriptions()
+        if self._disconnected_at is not None:
+            self._recover_outage()
         self.connection_status.emit(True)
 
+    def _recover_outage(self):
+        """
+        Runs inside on_open, before the first live frame is dispatched, so
+        backfilled trades are published strictly before new live ones.
+        """
+        outage = time.time() - self._disconnected_at
+        self._disconnected_at = None
+        backfilled = []
+        if self.backfill_client:
+            for symbol, last in list(self._last_trade.items()):
+                if symbol not in self.symbols:
+                    continue
+                try:
+                    ticks = self.backfill_client.fetch_since(symbol, last.trade_id, last.trade_time)
+                except Exception as e:
+                    print(f"Backfill Error ({symbol}): {e}")
+                    continue
+                if ticks:
+                    self._last_trade[symbol] = ticks[-1]
+                    backfilled.extend(ticks)
+        for tick in backfilled:
+            self.tick_received.emit(tick)
+        if backfilled:
+            self.backfilled.emit(backfilled)
+
+        self.outage_count += 1
+        self.last_outage_seconds = outage
+        self.last_backfill_size = len(backfilled)
+        self.total_backfilled += len(backfilled)
+        print(f"[Reconnect] Outage {outage:.2f}s, backfilled {len(backfilled)} trades")
+        self.reconnected.emit(outage, len(backfilled))
+
     def _on_message(self, ws, message):
+        recv_ns = time.time_ns()
         try:
-            data = json.loads(message)
-            # Check if this is a trade message
-            if 'p' in data:
-                price = float(data['p'])
-                self.price_updated.emit(price)
-            else:
-                # Ping/Pong or other messages
-                pass
+            tick = self.decoder.decode(message)
+            if tick is None:
+                # Subscription replies or other non-trade messages
+                return
+            self._dispatch(tick, recv_ns)
         except Exception as e:
             print(f"Parse Error: {e}")
 
+    def _dispatch(self, tick, recv_ns):
+        last = self._last_trade.get(tick.symbol)
+        # Frames without a trade id (decoded as 0) cannot be de-duplicated
+        if last is not None and tick.trade_id and last.trade_id and tick.trade_id <= last.trade_id:
+            # Already delivered by backfill (or the hub's snapshot)
+            return
+        self._last_trade[tick.symbol] = tick
+        if tick.symbol == self.symbol:
+            # Read by price_updated slots on this thread (latency tracing)
+            self.last_event_ms = tick.trade_time
+            self.last_recv_ns = recv_ns
+        self.tick_received.emit(tick)
+        if self.multi:
+            self.symbol_price_updated.emit(tick.symbol, tick.price)
+            if tick.symbol != self.symbol:
+                return
+        self.price_updated.emit(tick.price)
+
     def _on_error(self, ws, error):
         print(f"WebSocket Error: {error}")
 
     def _on_close(self, ws, close_status_code, close_msg):
         print(f"WebSocket Closed: {close_status_code} - {close_msg}")
+        with self._sub_lock:
+            self._connected = False
+            self._subscribed = set()
+        if self._opened_at is not None and self._disconnected_at is None:
+            self._disconnected_at = time.time()
         self.connection_status.emit(False)
@@ -0,0 +1,74 @@
+import threading
+import time
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.tick_recorder import load_tick_log
+from core.trade_decoder import Tick
+
+class ReplayPriceMonitor(QObject):
+    """
+    Drop-in replacement for PriceMonitor that replays a binary tick log
+    (see core.tick_recorder) instead of connecting to the exchange.
+
+    speed: 1.0 replays in real time, N replays N times faster, and
+    0 / None replays as fast as the consumers can take it.
+    Ticks are paced by their recorded event time, so bursts stay bursts.
+    """
+
+    price_updated = pyqtSignal(float)
+    symbol_price_updated = pyqtSignal(str, float)
+    tick_received = pyqtSignal(object)
+    connection_status = pyqtSignal(bool)
+    replay_finished = pyqtSignal(int)  # Number of ticks replayed
+
+    def __init__(self, path, speed=1.0, symbol="btcusdt"):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self.symbol = symbol.lower()
+        self.keep_running = True
+        self.thread = None
+        self.ticks_replayed = 0
+
+    def start(self):
+        self.keep_running = True
+        self.thread = threading.Thread(target=self._run_replay, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.keep_running = False
+        if self.thread:
+            self.thread.join(timeout=1.0)
+
+    def _run_replay(self):
+        records = load_tick_log(self.path)
+        print(f"Replaying {len(records)} ticks from {self.path} (speed={self.speed or 'max'})")
+        self.connection_status.emit(True)
+
+        realtime = bool(self.speed)
+        first_event = int(records[0]["event_time"]) if len(records) else 0
+        wall_start = time.perf_counter()
+
+        self.ticks_replayed = 0
+        # Walk the (possibly memory-mapped) log in chunks to keep memory flat
+        for start in range(0, len(records), 65536):
+            chunk = records[start:start + 65536].tolist()
+            for i, (event_time, _recv_time, price, qty) in enumerate(chunk, start):
+                if realtime:
+                    due = wall_start + (event_time - first_event) / 1000.0 / self.speed
+                    while self.keep_running:
+                        delay = due - time.perf_counter()
+                        if delay <= 0:
+                            break
+                        time.sleep(min(delay, 0.1))
+                if not self.keep_running:
+                    break
+                self.tick_received.emit(Tick(self.symbol, price, qty, event_time, i))
+                self.symbol_price_updated.emit(self.symbol, price)
+                self.price_updated.emit(price)
+                self.ticks_replayed += 1
+            if not self.keep_running:
+                break
+
+        self.connection_status.emit(False)
+        self.replay_finished.emit(self.ticks_replayed)
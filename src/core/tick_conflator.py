@@ -0,0 +1,251 @@
+import threading
+import time
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+from core.tick_queue import TickQueue
+
+
+class ConflatedWindow:
+    """
+    Summary of all ticks received during one frame interval.
+
+    Only the extremes and the last price survive conflation. path() returns
+    them in the order they happened, which is enough for IntervalTracker to see
+    every boundary the price touched inside the window.
+
+    Windows built by push_path() keep their full price sequence instead.
+
+    Each point can carry an opaque stamp passed to push() (e.g. receive
+    timestamps for latency tracing); stamped_path() returns them with prices.
+    """
+
+    __slots__ = ("low", "high", "last", "count", "_low_seq", "_high_seq", "_path", "_stamps")
+
+    def __init__(self, low, high, last, count, low_seq=0, high_seq=0, path=None, stamps=None):
+        self.low = low
+        self.high = high
+        self.last = last
+        self.count = count
+        self._low_seq = low_seq
+        self._high_seq = high_seq
+        self._path = path
+        self._stamps = stamps  # (low, high, last) stamps
+
+    def merged(self, newer):
+        """
+        One window covering self, then newer: the low and high of both (in
+        the order they happened) and newer's last price.
+        """
+        points = self.stamped_path() + newer.stamped_path()
+        low_i = high_i = 0
+        for i, (price, _) in enumerate(points):
+            if price < points[low_i][0]:
+                low_i = i
+            elif price > points[high_i][0]:
+                high_i = i
+        last = points[-1]
+        return ConflatedWindow(points[low_i][0], points[high_i][0], last[0], self.count + newer.count,
+                               low_i, high_i, stamps=(points[low_i][1], points[high_i][1], last[1]))
+
+    @property
+    def last_stamp(self):
+        return self._stamps[2] if self._stamps else None
+
+    @property
+    def coalesced(self):
+        """Ticks in this window that did not get their own UI update."""
+        return self.count - 1
+
+    def path(self):
+        return [p for p, _ in self.stamped_path()]
+
+    def stamped_path(self):
+        """path() as (price, stamp) pairs."""
+        if self._path is not None:
+            return [(p, None) for p in self._path]
+        low_stamp, high_stamp, last_stamp = self._stamps or (None, None, None)
+        if self._low_seq <= self._high_seq:
+            points = [(self.low, low_stamp), (self.high, high_stamp), (self.last, last_stamp)]
+        else:
+            points = [(self.high, high_stamp), (self.low, low_stamp), (self.last, last_stamp)]
+        # Drop consecutive duplicates (e.g. last tick was also the high)
+        path = [points[0]]
+        for point in points[1:]:
+            if point[0] != path[-1][0]:
+                path.append(point)
+        return path
+
+    def __repr__(self):
+        return (f"ConflatedWindow(low={self.low}, high={self.high}, "
+                f"last={self.last}, count={self.count})")
+
+
+class TickConflator(QObject):
+    """
+    Coalesces raw trades into at most one update per frame interval.
+
+    push() is called directly on the WebSocket thread (connect it with
+    Qt.ConnectionType.DirectConnection) and only updates a few scalars under a
+    lock. Once a window is interval_ms old, the next tick closes it into a
+    bounded TickQueue; a QTimer on the GUI thread drains the queue plus the
+    open window, so the UI sees at most one queued event per frame instead of
+    one per trade. If the GUI thread stalls, the queue keeps the backlog
+    bounded according to its policy (see core.tick_queue).
+
+    interval_ms <= 0 disables conflation: every tick is emitted as its own
+    window (still through the bounded queue when pushed from another thread).
+    """
+
+    window_ready = pyqtSignal(object)  # ConflatedWindow
+    _wake = pyqtSignal()  # Cross-thread: drain the queue on the GUI thread
+
+    def __init__(self, interval_ms=50, parent=None, queue_size=256, policy="drop_oldest"):
+        super().__init__(parent)
+        self.interval_ms = int(interval_ms)
+        self.queue = TickQueue(queue_size, policy)
+        self._lock = threading.Lock()
+        self._wake_pending = False
+        self._reset()
+
+        # Stats
+        self.ticks_total = 0
+        self.windows_total = 0
+        self.coalesced_total = 0
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.flush)
+        self._wake.connect(self.flush)
+
+    def _reset(self):
+        self._count = 0
+        self._opened = 0.0
+        self._low = None
+        self._high = None
+        self._last = None
+        self._low_seq = 0
+        self._high_seq = 0
+        self._low_stamp = self._high_stamp = self._last_stamp = None
+
+    def start(self):
+        if self.interval_ms > 0:
+            self._timer.start(self.interval_ms)
+
+    def stop(self):
+        self._timer.stop()
+        self.flush()
+
+    def set_interval(self, interval_ms):
+        self.interval_ms = int(interval_ms)
+        if self.interval_ms > 0:
+            self._timer.start(self.interval_ms)
+        else:
+            self._timer.stop()
+            self.flush()
+
+    def _on_own_thread(self):
+        return QThread.currentThread() == self.thread()
+
+    def _enqueue_locked(self, window):
+        """Queue a finished window. Returns True if the GUI thread needs a wake-up."""
+        self.queue.put(window)
+        if self._wake_pending:
+            return False
+        self._wake_pending = True
+        return True
+
+    def _hand_off(self, window):
+        """interval_ms <= 0: one window per tick, drained as soon as possible."""
+        if self.queue.policy == "block" and not self._on_own_thread():
+            self.queue.wait_for_space()
+        with self._lock:
+            wake = self._enqueue_locked(window)
+        if self._on_own_thread():
+            self.flush()
+        elif wake:
+            self._wake.emit()
+
+    def push(self, price, stamp=None):
+        if self.interval_ms <= 0:
+            self._hand_off(ConflatedWindow(price, price, price, 1, stamps=(stamp, stamp, stamp)))
+            return
+
+        now = time.monotonic()
+        due = self._count and (now - self._opened) * 1000.0 >= self.interval_ms
+        if due and self.queue.policy == "block" and not self._on_own_thread():
+            self.queue.wait_for_space()
+
+        with self._lock:
+            seq = self._count
+            if seq and (now - self._opened) * 1000.0 >= self.interval_ms:
+                self.queue.put(self._current_window())
+                self._reset()
+                seq = 0
+            if seq == 0:
+                self._opened = now
+                self._low = self._high = price
+                self._low_stamp = self._high_stamp = stamp
+            elif price < self._low:
+                self._low = price
+                self._low_seq = seq
+                self._low_stamp = stamp
+            elif price > self._high:
+                self._high = price
+                self._high_seq = seq
+                self._high_stamp = stamp
+            self._last = price
+            self._last_stamp = stamp
+            self._count = seq + 1
+
+    def push_path(self, prices):
+        """
+        Push a burst whose prices must all reach IntervalTracker, in order
+        (e.g. trades backfilled after a reconnect). The current window is
+        closed first so ordering with live ticks is preserved.
+        """
+        prices = list(prices)
+        if not prices:
+            return
+        window = ConflatedWindow(min(prices), max(prices), prices[-1], len(prices), path=prices)
+        if self.interval_ms <= 0:
+            self._hand_off(window)
+            return
+        with self._lock:
+            if self._count:
+                self.queue.put(self._current_window())
+                self._reset()
+            self.queue.put(window)
+
+    def _current_window(self):
+        return ConflatedWindow(self._low, self._high, self._last, self._count,
+                               self._low_seq, self._high_seq,
+                               stamps=(self._low_stamp, self._high_stamp, self._last_stamp))
+
+    def flush(self):
+        with self._lock:
+            self._wake_pending = False
+            windows = self.queue.drain()
+            if self._count:
+                windows.append(self._current_window())
+                self._reset()
+            if not windows:
+                return
+            for window in windows:
+                self.ticks_total += window.count
+                self.windows_total += 1
+                self.coalesced_total += window.coalesced
+        for window in windows:
+            self.window_ready.emit(window)
+
+    def stats(self):
+        queue = self.queue.stats()
+        with self._lock:
+            return {
+                "ticks": self.ticks_total,
+                "windows": self.windows_total,
+                "coalesced": self.coalesced_total,
+                "queue_depth": queue["depth"],
+                "queue_max_depth": queue["max_depth"],
+                "dropped_windows": queue["dropped"],
+                "dropped_ticks": queue["dropped_ticks"],
+                "blocked": queue["blocked"],
+            }
@@ -0,0 +1,89 @@
+"""
+Bounded handoff queue between the WebSocket thread and the GUI thread.
+"""
+import threading
+from collections import deque
+
+POLICIES = ("drop_oldest", "keep_latest", "block")
+
+
+class TickQueue:
+    """
+    Bounded FIFO of conflated windows (any object with merged(newer)).
+
+    A full queue never discards a window outright. Instead, windows are merged.
+    That loses their individual positions but keeps the low, the high (in
+    order) and the newest last price, so no alert-relevant extreme is dropped:
+    - drop_oldest: the two oldest windows are merged into one.
+    - keep_latest: the queue holds a single window and every put() merges
+      into it. The GUI then only ever catches up on the newest price.
+    - block: the producer calls wait_for_space() before put(), which stalls
+      the WebSocket thread (and the socket) for up to block_timeout; after
+      that it falls back to drop_oldest.
+
+    `dropped` counts windows merged away, `dropped_ticks` the ticks in them.
+    """
+
+    def __init__(self, maxsize=256, policy="drop_oldest", block_timeout=1.0):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy} (choose from {', '.join(POLICIES)})")
+        self.policy = policy
+        self.maxsize = 1 if policy == "keep_latest" else max(2, int(maxsize))
+        self.block_timeout = block_timeout
+        self._items = deque()
+        self._cond = threading.Condition()
+
+        # Stats
+        self.puts = 0
+        self.max_depth = 0
+        self.dropped = 0
+        self.dropped_ticks = 0
+        self.blocked = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, item):
+        """Never blocks; merges when full (see class docstring)."""
+        with self._cond:
+            items = self._items
+            if len(items) >= self.maxsize:
+                if self.maxsize == 1:
+                    older = items.pop()
+                    item = older.merged(item)
+                else:
+                    older = items.popleft()
+                    items[0] = older.merged(items[0])
+                self.dropped += 1
+                self.dropped_ticks += older.count
+            items.append(item)
+            self.puts += 1
+            if len(items) > self.max_depth:
+                self.max_depth = len(items)
+
+    def wait_for_space(self, timeout=None):
+        """Block-policy backpressure: wait until put() will not merge. False on timeout."""
+        with self._cond:
+            if len(self._items) < self.maxsize:
+                return True
+            self.blocked += 1
+            return self._cond.wait_for(lambda: len(self._items) < self.maxsize,
+                                       self.block_timeout if timeout is None else timeout)
+
+    def drain(self):
+        """Take every queued window, oldest first."""
+        with self._cond:
+            items = list(self._items)
+            self._items.clear()
+            self._cond.notify_all()
+        return items
+
+    def stats(self):
+        with self._cond:
+            return {
+                "depth": len(self._items),
+                "max_depth": self.max_depth,
+                "dropped": self.dropped,
+                "dropped_ticks": self.dropped_ticks,
+                "blocked": self.blocked,
+            }
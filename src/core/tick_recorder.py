@@ -0,0 +1,124 @@
+"""
+Compact binary tick log.
+
+File layout: a 16-byte header followed by fixed-width little-endian records
+(TICK_DTYPE, 32 bytes each). The record area can be memory-mapped straight
+into a NumPy structured array with load_tick_log().
+"""
+import os
+import threading
+import time
+import numpy as np
+
+TICK_LOG_MAGIC = b"BTTICK01"
+HEADER_SIZE = 16
+
+TICK_DTYPE = np.dtype([
+    ("event_time", "<i8"),  # Exchange trade time (ms since epoch)
+    ("recv_time", "<i8"),   # Local receive time (ns since epoch)
+    ("price", "<f8"),
+    ("qty", "<f8"),
+])
+
+
+def _header():
+    return TICK_LOG_MAGIC + np.array([TICK_DTYPE.itemsize, 0], dtype="<u4").tobytes()
+
+
+class TickRecorder:
+    """
+    Appends ticks to a binary log.
+
+    record() is meant to be connected to PriceMonitor.tick_received with
+    Qt.ConnectionType.DirectConnection: it runs on the WebSocket thread, stamps
+    the receive time and writes into a preallocated record buffer. The buffer
+    is flushed to disk when full, at most flush_interval seconds after the
+    oldest unflushed tick, and on close(). A background thread handles the
+    time limit, so buffered ticks reach the disk even when no more ticks
+    arrive (a quiet market, an outage).
+    """
+
+    def __init__(self, path, buffer_size=4096, flush_interval=1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._buffer = np.zeros(buffer_size, dtype=TICK_DTYPE)
+        self._count = 0
+        self._lock = threading.Condition()
+        self._oldest = None  # monotonic time of the oldest unflushed tick
+        self.records_written = 0
+
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not new_file:
+            with open(path, "rb") as f:
+                if f.read(len(TICK_LOG_MAGIC)) != TICK_LOG_MAGIC:
+                    raise ValueError(f"Not a tick log: {path}")
+        self._file = open(path, "ab")
+        if new_file:
+            self._file.write(_header())
+            self._file.flush()
+        self._flusher = threading.Thread(target=self._flush_loop, name="TickRecorderFlush", daemon=True)
+        self._flusher.start()
+
+    def record(self, tick, recv_time=None):
+        if recv_time is None:
+            recv_time = time.time_ns()
+        with self._lock:
+            if self._file is None:
+                return
+            self._buffer[self._count] = (tick.trade_time, recv_time, tick.price, tick.qty)
+            self._count += 1
+            if self._count == 1:
+                self._oldest = time.monotonic()
+                self._lock.notify()
+            if (self._count == len(self._buffer)
+                    or time.monotonic() - self._oldest >= self.flush_interval):
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._count:
+            self._file.write(self._buffer[:self._count].tobytes())
+            self._file.flush()
+            self.records_written += self._count
+            self._count = 0
+        self._oldest = None
+
+    def _flush_loop(self):
+        """Flush ticks that have waited flush_interval, whether or not more arrive."""
+        with self._lock:
+            while self._file is not None:
+                if self._oldest is None:
+                    self._lock.wait()
+                    continue
+                delay = self._oldest + self.flush_interval - time.monotonic()
+                if delay > 0:
+                    self._lock.wait(delay)
+                    continue
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            if self._file is None:
+                return
+            self._flush_locked()
+            self._file.close()
+            self._file = None
+            self._lock.notify_all()
+        self._flusher.join()
+
+
+def load_tick_log(path, mmap=True):
+    """Return the log's records as a TICK_DTYPE array (memory-mapped by default)."""
+    with open(path, "rb") as f:
+        if f.read(len(TICK_LOG_MAGIC)) != TICK_LOG_MAGIC:
+            raise ValueError(f"Not a tick log: {path}")
+    n = (os.path.getsize(path) - HEADER_SIZE) // TICK_DTYPE.itemsize
+    if n <= 0:
+        return np.zeros(0, dtype=TICK_DTYPE)
+    if mmap:
+        return np.memmap(path, dtype=TICK_DTYPE, mode="r", offset=HEADER_SIZE, shape=(n,))
+    return np.fromfile(path, dtype=TICK_DTYPE, count=n, offset=HEADER_SIZE)
@@ -0,0 +1,159 @@
+"""
+Fixed-capacity in-memory tick history with rolling window statistics.
+"""
+import threading
+from collections import deque, namedtuple
+import numpy as np
+
+STORE_DTYPE = np.dtype([
+    ("time", "<i8"),     # Exchange trade time (ms since epoch)
+    ("price", "<f8"),
+    ("qty", "<f8"),
+    ("cum_qty", "<f8"),  # Prefix sums since the store was created
+    ("cum_pv", "<f8"),
+])
+
+DEFAULT_WINDOWS = {
+    "1m": 60_000,
+    "5m": 300_000,
+    "1h": 3_600_000,
+}
+
+WindowStats = namedtuple("WindowStats", ["high", "low", "vwap", "volume", "ret", "count", "span_ms"])
+
+
+class _Window:
+    __slots__ = ("span_ms", "start", "highs", "lows")
+
+    def __init__(self, span_ms):
+        self.span_ms = span_ms
+        self.start = 0       # Sequence number of the oldest tick in the window
+        self.highs = deque()  # (seq, price), prices strictly decreasing
+        self.lows = deque()   # (seq, price), prices strictly increasing
+
+
+class TickStore:
+    """
+    Ring buffer of the most recent `capacity` ticks.
+
+    Every record is written twice (at i and i + capacity) so the last n ticks
+    are always one contiguous slice: view() hands out read-only NumPy views
+    without copying. Views are live and a record is overwritten `capacity`
+    appends later, so copy anything that has to outlive that.
+
+    Rolling high/low use monotonic deques and volume/VWAP use prefix sums, so
+    append() is O(1) amortized per window. Windows are measured back from the
+    newest tick's exchange time; a window longer than what the ring holds
+    covers the retained ticks only (see WindowStats.span_ms).
+
+    append() is meant to be connected to PriceMonitor.tick_received with
+    Qt.ConnectionType.DirectConnection.
+    """
+
+    def __init__(self, capacity=131072, windows=None):
+        self.capacity = int(capacity)
+        self._buf = np.zeros(2 * self.capacity, dtype=STORE_DTYPE)
+        self._time = self._buf["time"]
+        self._seq = 0  # Ticks appended so far
+        self._cum_qty = 0.0
+        self._cum_pv = 0.0
+        self._windows = {name: _Window(int(ms)) for name, ms in (windows or DEFAULT_WINDOWS).items()}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self._seq, self.capacity)
+
+    @property
+    def total(self):
+        """Ticks appended since creation, including ones already overwritten."""
+        return self._seq
+
+    @property
+    def windows(self):
+        return list(self._windows)
+
+    def append(self, tick):
+        self.add(tick.trade_time, tick.price, tick.qty)
+
+    def add(self, time_ms, price, qty):
+        cap = self.capacity
+        with self._lock:
+            seq = self._seq
+            self._cum_qty += qty
+            self._cum_pv += price * qty
+            rec = (time_ms, price, qty, self._cum_qty, self._cum_pv)
+            i = seq % cap
+            self._buf[i] = rec
+            self._buf[i + cap] = rec
+            self._seq = seq + 1
+
+            oldest = max(0, seq + 1 - cap)
+            times = self._time
+            for w in self._windows.values():
+                start = max(w.start, oldest)
+                cutoff = time_ms - w.span_ms
+                while start < seq and times[start % cap] <= cutoff:
+                    start += 1
+                w.start = start
+
+                highs = w.highs
+                while highs and highs[-1][1] <= price:
+                    highs.pop()
+                highs.append((seq, price))
+                while highs[0][0] < start:
+                    highs.popleft()
+
+                lows = w.lows
+                while lows and lows[-1][1] >= price:
+                    lows.pop()
+                lows.append((seq, price))
+                while lows[0][0] < start:
+                    lows.popleft()
+
+    def stats(self, window):
+        """WindowStats for a named window, or None before the first tick."""
+        cap = self.capacity
+        with self._lock:
+            if self._seq == 0:
+                return None
+            w = self._windows[window]
+            first = self._buf[w.start % cap]
+            last = self._buf[(self._seq - 1) % cap]
+            volume = last["cum_qty"] - first["cum_qty"] + first["qty"]
+            pv = last["cum_pv"] - first["cum_pv"] + first["price"] * first["qty"]
+            return WindowStats(
+                high=w.highs[0][1],
+                low=w.lows[0][1],
+                vwap=float(pv / volume) if volume > 0 else float(last["price"]),
+                volume=float(volume),
+                ret=float(last["price"] / first["price"] - 1.0),
+                count=self._seq - w.start,
+                span_ms=int(last["time"] - first["time"]),
+            )
+
+    def view(self, window=None):
+        """
+        Read-only structured view of the retained ticks (or one window's
+        ticks), oldest first. Use view()["price"] etc. for single columns.
+        """
+        cap = self.capacity
+        with self._lock:
+            end = self._seq
+            start = self._windows[window].start if window else max(0, end - cap)
+        n = end - start
+        if n == 0:
+            v = self._buf[:0]
+        else:
+            hi = (end - 1) % cap + 1
+            if hi < n:
+                hi += cap
+            v = self._buf[hi - n:hi]
+        v.flags.writeable = False
+        return v
+
+    def last(self):
+        """Newest record, or None if empty."""
+        with self._lock:
+            if self._seq == 0:
+                return None
+            return self._buf[(self._seq - 1) % self.capacity].copy()
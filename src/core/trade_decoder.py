@@ -0,0 +1,165 @@
+"""
+Market-data message decoders for PriceMonitor.
+
+A decoder turns one raw WebSocket frame (str or bytes) into a Tick, or None
+for frames that carry no price (subscription replies, other events).
+Works for both raw-stream frames and combined-stream frames
+({"stream": ..., "data": {...}}).
+
+There is one decoder per Binance stream type (see STREAM_DECODERS); trade is
+the default and the only one with a find()-based fast path.
+"""
+import json
+import time
+from collections import namedtuple
+
+Tick = namedtuple("Tick", ["symbol", "price", "qty", "trade_time", "trade_id"])
+
+
+def _unwrap(data):
+    if 'data' in data and 'stream' in data:
+        return data['data']
+    return data
+
+
+class JsonTradeDecoder:
+    """Reference decoder: full json.loads of every frame."""
+
+    def decode(self, message):
+        data = _unwrap(json.loads(message))
+        # Anything carrying a price counts as a trade, as before
+        if 'p' not in data:
+            return None
+        return Tick(
+            data.get('s', '').lower(),
+            float(data['p']),
+            float(data.get('q', 0.0)),
+            int(data.get('T', 0)),
+            int(data.get('t', 0)),
+        )
+
+
+def _keys(conv):
+    """Search keys for either str or bytes frames."""
+    return tuple(conv(k) for k in ('"e":"trade"', '"s":"', '"t":', '"p":"', '"q":"', '"T":', '"', ','))
+
+
+_STR_KEYS = _keys(lambda s: s)
+_BYTES_KEYS = _keys(lambda s: s.encode('ascii'))
+
+
+class FastTradeDecoder:
+    """
+    Fast path: pulls symbol, price, quantity, trade time and trade id straight
+    out of the frame with str.find, without building a dict.
+
+    Binance trade payloads have a fixed, compact layout
+    ({"e":"trade","E":..,"s":"BTCUSDT","t":..,"p":"..","q":"..","T":..,...}),
+    so each field is one find() from the previous field. Anything that does not
+    look like a trade frame goes through the full JSON fallback.
+    """
+
+    def __init__(self, fallback=None):
+        self.fallback = fallback or JsonTradeDecoder()
+        self.fast_hits = 0
+        self.fallbacks = 0
+
+    def decode(self, message):
+        is_bytes = isinstance(message, (bytes, bytearray))
+        trade, k_sym, k_id, k_price, k_qty, k_time, quote, comma = _BYTES_KEYS if is_bytes else _STR_KEYS
+        start = message.find(trade)
+        if start >= 0:
+            index = message.index
+            try:
+                i = index(k_sym, start) + 5
+                j = index(quote, i)
+                symbol = message[i:j]
+
+                i = index(k_id, j) + 4
+                j = index(comma, i)
+                trade_id = int(message[i:j])
+
+                i = index(k_price, j) + 5
+                j = index(quote, i)
+                price = float(message[i:j])
+
+                i = index(k_qty, j) + 5
+                j = index(quote, i)
+                qty = float(message[i:j])
+
+                i = index(k_time, j) + 4
+                j = index(comma, i)
+                trade_time = int(message[i:j])
+            except ValueError:
+                pass
+            else:
+                if is_bytes:
+                    symbol = symbol.decode('ascii')
+                self.fast_hits += 1
+                return Tick(symbol.lower(), price, qty, trade_time, trade_id)
+
+        self.fallbacks += 1
+        return self.fallback.decode(message)
+
+
+class AggTradeDecoder:
+    """
+    <symbol>@aggTrade: one message per taker order, however many trades it
+    filled. trade_id is the order's last trade id (l), the same id REST
+    backfill assigns, so de-duplication works across a reconnect.
+    """
+
+    def decode(self, message):
+        data = _unwrap(json.loads(message))
+        if data.get('e') != 'aggTrade':
+            return None
+        return Tick(data['s'].lower(), float(data['p']), float(data['q']), int(data['T']), int(data['l']))
+
+
+class BookTickerDecoder:
+    """
+    <symbol>@bookTicker: best bid/ask on every top-of-book change. The price
+    is the mid. The spot payload has no timestamp, so trade_time is the local
+    receive time; trade_id is the order book update id (u); qty is 0.
+    """
+
+    def decode(self, message):
+        data = _unwrap(json.loads(message))
+        if 'u' not in data or 'b' not in data or 'a' not in data:
+            return None
+        mid = (float(data['b']) + float(data['a'])) / 2.0
+        return Tick(data['s'].lower(), mid, 0.0, int(time.time() * 1000), int(data['u']))
+
+
+class MiniTickerDecoder:
+    """
+    <symbol>@miniTicker: rolling 24h summary once per second. The price is
+    the last close (c); trade_time and trade_id are the event time (E); qty
+    is 0 because v is 24h volume, not a trade size.
+    """
+
+    def decode(self, message):
+        data = _unwrap(json.loads(message))
+        if data.get('e') != '24hrMiniTicker':
+            return None
+        event_time = int(data['E'])
+        return Tick(data['s'].lower(), float(data['c']), 0.0, event_time, event_time)
+
+
+STREAM_DECODERS = {
+    "trade": FastTradeDecoder,
+    "aggTrade": AggTradeDecoder,
+    "bookTicker": BookTickerDecoder,
+    "miniTicker": MiniTickerDecoder,
+}
+
+# Streams whose ids line up with REST aggTrades backfill
+BACKFILL_STREAMS = ("trade", "aggTrade")
+
+
+def make_decoder(stream_type):
+    try:
+        cls = STREAM_DECODERS[stream_type]
+    except KeyError:
+        raise ValueError(f"Unknown stream type: {stream_type} (choose from {', '.join(STREAM_DECODERS)})")
+    return cls()
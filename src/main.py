@@ -1,6 +1,11 @@
+import time
+
+STARTED = time.perf_counter()  # Before the heavy imports, for the startup timings
+
 import sys
 import os
 import ctypes
+import argparse
 
 # === Windows DPI Handling ===
 # Set process as DPI unaware to prevent OS-level scaling
@@ -22,11 +27,22 @@ sys.path.append(current_dir)
 
 from PyQt6.QtWidgets import QApplication
 from ui.main_window import MainWindow
+from core.replay_monitor import ReplayPriceMonitor
 
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="BitTalker - Bitcoin price ticker with voice alerts")
+    parser.add_argument("--record", metavar="PATH", help="Append every received tick to a binary tick log")
+    parser.add_argument("--replay", metavar="PATH", help="Replay a tick log instead of connecting to Binance")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed (1 = real time, N = N times faster, 0 = max)")
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    
+    price_monitor = None
+    if args.replay:
+        price_monitor = ReplayPriceMonitor(args.replay, speed=args.speed)
     
-    window = MainWindow()
+    window = MainWindow(price_monitor=price_monitor, record_path=args.record, started=STARTED)
     window.show()
     sys.exit(app.exec())
 
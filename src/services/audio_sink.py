@@ -0,0 +1,80 @@
+"""
+Incremental audio playback for streamed synthesis.
+"""
+import io
+import threading
+import time
+
+import soundfile as sf
+
+
+def wav_bytes(samples, sample_rate):
+    """In-memory 16-bit WAV file of float samples."""
+    buf = io.BytesIO()
+    sf.write(buf, samples, sample_rate, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+
+class StreamingSink:
+    """
+    Audio sink fed buffer by buffer while synthesis is still running.
+
+    The producer calls write(samples) for each chunk as it is synthesized,
+    then close(). The playback thread calls play(), which hands each buffer
+    to player(samples, sample_rate) (blocking while it plays) as soon as it
+    arrives, and returns once the closed stream has been played out or the
+    sink was cancelled. Buffers written after cancel() are dropped.
+
+    first_audio_ns is the time.time_ns() when the first buffer started to
+    play.
+    """
+
+    def __init__(self, sample_rate, player):
+        self.sample_rate = sample_rate
+        self.player = player
+        self._buffers = []
+        self._closed = False
+        self._cancelled = False
+        self._cond = threading.Condition()
+        self.first_audio_ns = None
+
+    def write(self, samples):
+        with self._cond:
+            if self._cancelled:
+                return
+            self._buffers.append(samples)
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def cancel(self):
+        with self._cond:
+            self._cancelled = True
+            self._buffers.clear()
+            self._cond.notify_all()
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def play(self, on_start=None, timeout=30.0):
+        """
+        Play buffers in order until the stream is closed and drained.
+        on_start() is called right before the first buffer plays. A producer
+        that goes silent for timeout seconds ends playback.
+        """
+        while True:
+            with self._cond:
+                if not self._cond.wait_for(lambda: self._buffers or self._closed or self._cancelled, timeout):
+                    return
+                if self._cancelled or not self._buffers:
+                    return
+                samples = self._buffers.pop(0)
+            if self.first_audio_ns is None:
+                self.first_audio_ns = time.time_ns()
+                if on_start:
+                    on_start()
+            self.player(samples, self.sample_rate)
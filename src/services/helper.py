@@ -1,6 +1,9 @@
+import hashlib
 import json
 import os
+import platform
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from typing import Optional
 from unicodedata import normalize
@@ -157,6 +160,11 @@ class TextToSpeech:
         self.base_chunk_size = cfgs["ae"]["base_chunk_size"]
         self.chunk_compress_factor = cfgs["ttl"]["chunk_compress_factor"]
         self.ldim = cfgs["ttl"]["latent_dim"]
+        # Run the denoising loop through IOBinding (see _denoise_iobinding)
+        self.use_iobinding = True
+        # When a dict, _infer adds the seconds spent in each session to it
+        # (dp, text_enc, vector_est, vocoder)
+        self.stage_times = None
 
     def sample_noisy_latent(
         self, duration: np.ndarray
@@ -181,21 +189,76 @@ class TextToSpeech:
         style: Style,
         total_step: int,
         speed: float = 1.05,
+        run_options: Optional[ort.RunOptions] = None,
     ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        run_options is passed to every session run; setting its terminate
+        flag from another thread aborts the synthesis (the run raises).
+        """
         assert (
             len(text_list) == style.ttl.shape[0]
         ), "Number of texts must match number of style vectors"
         bsz = len(text_list)
         text_ids, text_mask = self.text_processor(text_list, lang_list)
+        t = time.perf_counter()
         dur_onnx, *_ = self.dp_ort.run(
-            None, {"text_ids": text_ids, "style_dp": style.dp, "text_mask": text_mask}
+            None,
+            {"text_ids": text_ids, "style_dp": style.dp, "text_mask": text_mask},
+            run_options,
         )
+        t = self._lap("dp", t)
         dur_onnx = dur_onnx / speed
         text_emb_onnx, *_ = self.text_enc_ort.run(
             None,
             {"text_ids": text_ids, "style_ttl": style.ttl, "text_mask": text_mask},
+            run_options,
         )  # dur_onnx: [bsz]
+        t = self._lap("text_enc", t)
         xt, latent_mask = self.sample_noisy_latent(dur_onnx)
+        denoise = self._denoise_iobinding if self.use_iobinding else self._denoise
+        xt = denoise(xt, text_emb_onnx, style.ttl, text_mask, latent_mask, total_step, run_options)
+        t = self._lap("vector_est", t)
+        wav, *_ = self.vocoder_ort.run(None, {"latent": xt}, run_options)
+        self._lap("vocoder", t)
+        return wav, dur_onnx
+
+    def _lap(self, stage: str, start: float) -> float:
+        now = time.perf_counter()
+        if self.stage_times is not None:
+            self.stage_times[stage] = self.stage_times.get(stage, 0.0) + now - start
+        return now
+
+    def warm_up(
+        self,
+        text_list: list[str],
+        lang_list: list[str],
+        style: Style,
+        total_step: int,
+        speed: float = 1.05,
+    ) -> float:
+        """
+        Synthesize each text once and throw the audio away, so the first
+        real call does not pay for ORT growing its memory arenas, picking
+        kernels for these shapes and paging in the weights. Use texts like
+        the ones that will be spoken: the shapes follow their lengths.
+        Returns the seconds it took.
+        """
+        start = time.perf_counter()
+        for text, lang in zip(text_list, lang_list):
+            self(text, lang, style, total_step, speed)
+        return time.perf_counter() - start
+
+    def _denoise(
+        self,
+        xt: np.ndarray,
+        text_emb: np.ndarray,
+        style_ttl: np.ndarray,
+        text_mask: np.ndarray,
+        latent_mask: np.ndarray,
+        total_step: int,
+        run_options: Optional[ort.RunOptions] = None,
+    ) -> np.ndarray:
+        bsz = xt.shape[0]
         total_step_np = np.array([total_step] * bsz, dtype=np.float32)
         for step in range(total_step):
             current_step = np.array([step] * bsz, dtype=np.float32)
@@ -203,16 +266,64 @@ class TextToSpeech:
                 None,
                 {
                     "noisy_latent": xt,
-                    "text_emb": text_emb_onnx,
-                    "style_ttl": style.ttl,
+                    "text_emb": text_emb,
+                    "style_ttl": style_ttl,
                     "text_mask": text_mask,
                     "latent_mask": latent_mask,
                     "current_step": current_step,
                     "total_step": total_step_np,
                 },
+                run_options,
             )
-        wav, *_ = self.vocoder_ort.run(None, {"latent": xt})
-        return wav, dur_onnx
+        return xt
+
+    def _denoise_iobinding(
+        self,
+        xt: np.ndarray,
+        text_emb: np.ndarray,
+        style_ttl: np.ndarray,
+        text_mask: np.ndarray,
+        latent_mask: np.ndarray,
+        total_step: int,
+        run_options: Optional[ort.RunOptions] = None,
+    ) -> np.ndarray:
+        """
+        Same as _denoise without per-step allocations.
+
+        The static inputs are wrapped in OrtValues once (no copy on CPU), the
+        latent ping-pongs between two preallocated buffers through two
+        bindings (A -> B, B -> A), and current_step is a single buffer
+        updated in place. A float32 contiguous xt is used as the first buffer
+        and overwritten. Returns the buffer holding the last step's output.
+        """
+        sess = self.vector_est_ort
+        bsz = xt.shape[0]
+        to_ort = ort.OrtValue.ortvalue_from_numpy
+        latents = (np.ascontiguousarray(xt, dtype=np.float32), np.empty(xt.shape, dtype=np.float32))
+        latent_values = [to_ort(buf) for buf in latents]
+        current_step = np.zeros(bsz, dtype=np.float32)
+        static = {
+            "text_emb": to_ort(np.ascontiguousarray(text_emb)),
+            "style_ttl": to_ort(np.ascontiguousarray(style_ttl)),
+            "text_mask": to_ort(np.ascontiguousarray(text_mask)),
+            "latent_mask": to_ort(np.ascontiguousarray(latent_mask, dtype=np.float32)),
+            "current_step": to_ort(current_step),
+            "total_step": to_ort(np.full(bsz, total_step, dtype=np.float32)),
+        }
+        output_name = sess.get_outputs()[0].name
+        bindings = []
+        for src, dst in ((0, 1), (1, 0)):
+            binding = sess.io_binding()
+            for name, value in static.items():
+                binding.bind_ortvalue_input(name, value)
+            binding.bind_ortvalue_input("noisy_latent", latent_values[src])
+            binding.bind_ortvalue_output(output_name, latent_values[dst])
+            bindings.append(binding)
+
+        for step in range(total_step):
+            current_step.fill(step)
+            sess.run_with_iobinding(bindings[step % 2], run_options)
+        return latents[total_step % 2]
 
     def __call__(
         self,
@@ -222,26 +333,55 @@ class TextToSpeech:
         total_step: int,
         speed: float = 1.05,
         silence_duration: float = 0.3,
+        run_options: Optional[ort.RunOptions] = None,
     ) -> tuple[np.ndarray, np.ndarray]:
-        assert (
-            style.ttl.shape[0] == 1
-        ), "Single speaker text to speech only supports single style"
-        max_len = 120 if lang == "ko" else 300
-        text_list = chunk_text(text, max_len=max_len)
         wav_cat = None
         dur_cat = None
-        for text in text_list:
-            wav, dur_onnx = self._infer([text], [lang], style, total_step, speed)
+        for wav, dur_onnx in self.stream(
+            text, lang, style, total_step, speed, silence_duration, run_options=run_options
+        ):
             if wav_cat is None:
                 wav_cat = wav
                 dur_cat = dur_onnx
             else:
+                wav_cat = np.concatenate([wav_cat, wav], axis=1)
+                dur_cat += dur_onnx
+        return wav_cat, dur_cat
+
+    def stream(
+        self,
+        text: str,
+        lang: str,
+        style: Style,
+        total_step: int,
+        speed: float = 1.05,
+        silence_duration: float = 0.3,
+        max_len: Optional[int] = None,
+        run_options: Optional[ort.RunOptions] = None,
+    ):
+        """
+        The audio of __call__, one chunk at a time.
+
+        Yields (wav [1, T], duration) for each chunk of chunk_text() as soon as
+        it is synthesized, so playback can start before the next chunk is
+        done. Every chunk after the first starts with the silence that
+        separates chunks. max_len overrides the chunk size (smaller chunks,
+        e.g. one per sentence, mean earlier first audio).
+        """
+        assert (
+            style.ttl.shape[0] == 1
+        ), "Single speaker text to speech only supports single style"
+        if max_len is None:
+            max_len = max_chunk_len(lang)
+        for i, chunk in enumerate(chunk_text(text, max_len=max_len)):
+            wav, dur_onnx = self._infer([chunk], [lang], style, total_step, speed, run_options)
+            if i:
                 silence = np.zeros(
                     (1, int(silence_duration * self.sample_rate)), dtype=np.float32
                 )
-                wav_cat = np.concatenate([wav_cat, silence, wav], axis=1)
-                dur_cat += dur_onnx + silence_duration
-        return wav_cat, dur_cat
+                wav = np.concatenate([silence, wav], axis=1)
+                dur_onnx = dur_onnx + silence_duration
+            yield wav, dur_onnx
 
     def batch(
         self,
@@ -280,29 +420,223 @@ def get_latent_mask(
     return latent_mask
 
 
+def repeat_style(style: Style, n: int) -> Style:
+    """One style vector per batch item (TextToSpeech.batch needs bsz of them)."""
+    return Style(np.repeat(style.ttl, n, axis=0), np.repeat(style.dp, n, axis=0))
+
+
+def length_buckets(
+    lengths: list[int], batch_size: int, max_pad_ratio: float = 1.3
+) -> list[list[int]]:
+    """
+    Group items into batches of similar length for TextToSpeech.batch.
+
+    Every item in a batch is padded to the longest one (text ids and latent
+    frames alike), so items are sorted by length and a batch is closed once
+    it is full or the next item would be more than max_pad_ratio times
+    longer than its shortest.
+
+    Args:
+        lengths: Length of each item (e.g. characters of text)
+        batch_size: Maximum items per batch
+        max_pad_ratio: Maximum longest / shortest length within a batch
+
+    Returns:
+        Lists of item indices, shortest items first
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    buckets = []
+    current = []
+    for i in order:
+        if current and (
+            len(current) >= batch_size
+            or lengths[i] > max(lengths[current[0]], 1) * max_pad_ratio
+        ):
+            buckets.append(current)
+            current = []
+        current.append(i)
+    if current:
+        buckets.append(current)
+    return buckets
+
+
+def trim_batch(wav: np.ndarray, duration: np.ndarray, sample_rate: int) -> list[np.ndarray]:
+    """Cut each row of a batched wav [bsz, T] to its predicted duration."""
+    return [
+        wav[i, : min(wav.shape[1], int(sample_rate * float(d)))]
+        for i, d in enumerate(np.ravel(duration))
+    ]
+
+
+# ONNX Runtime session tuning (load_text_to_speech). 0 threads = let ORT decide.
+DEFAULT_SESSION_OPTIONS = {
+    "intra_op_threads": 0,  # Threads inside one operator
+    "inter_op_threads": 0,  # Threads across operators (parallel execution mode only)
+    "execution_mode": "sequential",  # sequential / parallel
+    "graph_optimization": "all",  # disable / basic / extended / all
+    "cpu_mem_arena": True,
+    "mem_pattern": True,
+    # Idle ORT threads busy-wait for work: lower latency, but burns a core per
+    # thread between runs. None keeps ORT's default (on)
+    "allow_spinning": None,
+    "cpu_affinity": [],  # 0-based CPUs for the intra-op pool, e.g. [2, 3]; empty = any
+}
+
+_EXECUTION_MODES = {
+    "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": ort.ExecutionMode.ORT_PARALLEL,
+}
+
+_GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+
+def session_options(options: Optional[dict] = None) -> ort.SessionOptions:
+    """
+    ort.SessionOptions from a dict of DEFAULT_SESSION_OPTIONS keys (missing
+    keys keep their default). Raises ValueError on unknown keys or values.
+
+    cpu_affinity pins the intra-op pool: ORT runs one intra-op thread on the
+    calling (synthesis) thread, which it cannot pin, and the other
+    len(cpu_affinity) - 1 threads each on one listed CPU. Unless
+    intra_op_threads is set, it defaults to len(cpu_affinity).
+    """
+    unknown = set(options or {}) - set(DEFAULT_SESSION_OPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown session options: {sorted(unknown)}")
+    cfg = {**DEFAULT_SESSION_OPTIONS, **(options or {})}
+    if cfg["execution_mode"] not in _EXECUTION_MODES:
+        raise ValueError(f"execution_mode must be one of {list(_EXECUTION_MODES)}")
+    if cfg["graph_optimization"] not in _GRAPH_OPTIMIZATION_LEVELS:
+        raise ValueError(f"graph_optimization must be one of {list(_GRAPH_OPTIMIZATION_LEVELS)}")
+
+    opts = ort.SessionOptions()
+    affinity = [int(cpu) for cpu in cfg["cpu_affinity"]]
+    intra = int(cfg["intra_op_threads"]) or len(affinity)
+    opts.intra_op_num_threads = intra
+    opts.inter_op_num_threads = int(cfg["inter_op_threads"])
+    opts.execution_mode = _EXECUTION_MODES[cfg["execution_mode"]]
+    opts.graph_optimization_level = _GRAPH_OPTIMIZATION_LEVELS[cfg["graph_optimization"]]
+    opts.enable_cpu_mem_arena = bool(cfg["cpu_mem_arena"])
+    opts.enable_mem_pattern = bool(cfg["mem_pattern"])
+    if cfg["allow_spinning"] is not None:
+        spin = "1" if cfg["allow_spinning"] else "0"
+        opts.add_session_config_entry("session.intra_op.allow_spinning", spin)
+        opts.add_session_config_entry("session.inter_op.allow_spinning", spin)
+    if affinity:
+        if intra != len(affinity):
+            raise ValueError("cpu_affinity needs one CPU per intra-op thread")
+        if intra > 1:
+            # ORT numbers processors from 1
+            opts.add_session_config_entry(
+                "session.intra_op_thread_affinities",
+                ";".join(str(cpu + 1) for cpu in affinity[1:]),
+            )
+    return opts
+
+
+def optimized_model_path(onnx_path: str, cache_dir: str, options: Optional[dict] = None) -> str:
+    """
+    Where the optimized graph of onnx_path is cached. The name changes with
+    the model file, the ORT version, the optimization level and the machine,
+    so a stale graph is never loaded.
+    """
+    cfg = {**DEFAULT_SESSION_OPTIONS, **(options or {})}
+    st = os.stat(onnx_path)
+    key = "|".join(
+        str(part)
+        for part in (
+            os.path.abspath(onnx_path),
+            st.st_size,
+            st.st_mtime_ns,
+            ort.__version__,
+            cfg["graph_optimization"],
+            platform.machine(),
+            platform.processor(),
+        )
+    )
+    digest = hashlib.md5(key.encode("utf-8")).hexdigest()[:12]
+    name = os.path.splitext(os.path.basename(onnx_path))[0]
+    return os.path.join(cache_dir, f"{name}.{digest}.onnx")
+
+
 def load_onnx(
-    onnx_path: str, opts: ort.SessionOptions, providers: list[str]
+    onnx_path: str,
+    opts: ort.SessionOptions,
+    providers: list[str],
+    optimized_path: Optional[str] = None,
 ) -> ort.InferenceSession:
-    return ort.InferenceSession(onnx_path, sess_options=opts, providers=providers)
+    """
+    With optimized_path, the graph is optimized once and saved there, and
+    later loads read the saved graph with optimization turned off. A saved
+    graph that fails to load is deleted and rebuilt from onnx_path.
+    """
+    if optimized_path is None:
+        return ort.InferenceSession(onnx_path, sess_options=opts, providers=providers)
+    if os.path.exists(optimized_path):
+        level = opts.graph_optimization_level
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        try:
+            return ort.InferenceSession(optimized_path, sess_options=opts, providers=providers)
+        except Exception as e:
+            print(f"Discarding cached optimized model {optimized_path}: {e}")
+            os.remove(optimized_path)
+        finally:
+            opts.graph_optimization_level = level
+    os.makedirs(os.path.dirname(optimized_path), exist_ok=True)
+    # ORT writes the file while building the session; write it under a temp
+    # name so a crash mid-write never leaves a truncated graph behind
+    tmp_path = f"{optimized_path}.{os.getpid()}.tmp.onnx"
+    opts.optimized_model_filepath = tmp_path
+    try:
+        sess = ort.InferenceSession(onnx_path, sess_options=opts, providers=providers)
+    finally:
+        opts.optimized_model_filepath = ""
+    if os.path.exists(tmp_path):
+        os.replace(tmp_path, optimized_path)
+    return sess
 
 
 def load_onnx_all(
-    onnx_dir: str, opts: ort.SessionOptions, providers: list[str]
+    onnx_dir: str,
+    options: Optional[dict],
+    providers: list[str],
+    optimized_dir: Optional[str] = None,
+    parallel: bool = True,
 ) -> tuple[
     ort.InferenceSession,
     ort.InferenceSession,
     ort.InferenceSession,
     ort.InferenceSession,
 ]:
-    dp_onnx_path = os.path.join(onnx_dir, "duration_predictor.onnx")
-    text_enc_onnx_path = os.path.join(onnx_dir, "text_encoder.onnx")
-    vector_est_onnx_path = os.path.join(onnx_dir, "vector_estimator.onnx")
-    vocoder_onnx_path = os.path.join(onnx_dir, "vocoder.onnx")
-
-    dp_ort = load_onnx(dp_onnx_path, opts, providers)
-    text_enc_ort = load_onnx(text_enc_onnx_path, opts, providers)
-    vector_est_ort = load_onnx(vector_est_onnx_path, opts, providers)
-    vocoder_ort = load_onnx(vocoder_onnx_path, opts, providers)
+    """
+    Create the four sessions, each with its own session_options(options)
+    (load_onnx changes them). With parallel, they are created on one thread
+    each: ORT releases the GIL while it reads and optimizes a graph, so the
+    total is about the slowest model instead of the sum.
+    """
+
+    def load(name):
+        onnx_path = os.path.join(onnx_dir, f"{name}.onnx")
+        optimized_path = None
+        if optimized_dir:
+            optimized_path = optimized_model_path(onnx_path, optimized_dir, options)
+        start = time.perf_counter()
+        sess = load_onnx(onnx_path, session_options(options), providers, optimized_path)
+        print(f"Loaded {name} in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return sess
+
+    names = ("duration_predictor", "text_encoder", "vector_estimator", "vocoder")
+    if parallel:
+        with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="OnnxLoad") as pool:
+            sessions = list(pool.map(load, names))
+    else:
+        sessions = [load(name) for name in names]
+    dp_ort, text_enc_ort, vector_est_ort, vocoder_ort = sessions
     return dp_ort, text_enc_ort, vector_est_ort, vocoder_ort
 
 
@@ -319,8 +653,19 @@ def load_text_processor(onnx_dir: str) -> UnicodeProcessor:
     return text_processor
 
 
-def load_text_to_speech(onnx_dir: str, use_gpu: bool = False) -> TextToSpeech:
-    opts = ort.SessionOptions()
+def load_text_to_speech(
+    onnx_dir: str,
+    use_gpu: bool = False,
+    options: Optional[dict] = None,
+    optimized_dir: Optional[str] = None,
+    parallel: bool = True,
+) -> TextToSpeech:
+    """
+    options: session tuning, see DEFAULT_SESSION_OPTIONS
+    optimized_dir: cache the optimized graphs here (see load_onnx)
+    parallel: create the sessions concurrently (see load_onnx_all)
+    """
+    session_options(options)  # Bad options fail before any model is read
     if use_gpu:
         raise NotImplementedError("GPU mode is not fully tested")
     else:
@@ -328,7 +673,7 @@ def load_text_to_speech(onnx_dir: str, use_gpu: bool = False) -> TextToSpeech:
         print("Using CPU for inference")
     cfgs = load_cfgs(onnx_dir)
     dp_ort, text_enc_ort, vector_est_ort, vocoder_ort = load_onnx_all(
-        onnx_dir, opts, providers
+        onnx_dir, options, providers, optimized_dir, parallel
     )
     text_processor = load_text_processor(onnx_dir)
     return TextToSpeech(
@@ -385,6 +730,11 @@ def sanitize_filename(text: str, max_len: int) -> str:
     return re.sub(r"[^\w]", "_", prefix, flags=re.UNICODE)
 
 
+def max_chunk_len(lang: str) -> int:
+    """Longest chunk TextToSpeech synthesizes in one pass for lang."""
+    return 120 if lang == "ko" else 300
+
+
 def chunk_text(text: str, max_len: int = 300) -> list[str]:
     """
     Split text into chunks by paragraphs and sentences.
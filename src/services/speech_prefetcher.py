@@ -0,0 +1,178 @@
+"""
+Background synthesis of phrases that are likely to be spoken next.
+"""
+import os
+import sys
+import threading
+import time
+
+
+def _lower_thread_priority():
+    """
+    Best effort, and only for the calling thread: Windows (idle priority)
+    and Linux (nice 19; elsewhere setpriority would renice the whole
+    process).
+    """
+    if sys.platform == "win32":
+        try:
+            import ctypes
+            THREAD_PRIORITY_IDLE = -15
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_IDLE)
+        except Exception:
+            pass
+    elif sys.platform.startswith("linux"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except OSError:
+            pass
+
+
+class SpeechPrefetcher:
+    """
+    Low-priority worker that synthesizes wanted phrases into the speech cache
+    before anyone asks to speak them.
+
+    want(keys) replaces the wanted list (most urgent first); keys are
+    (text, voice, lang). The worker takes the first key that is not cached
+    yet and calls synthesize(key), which must write the cache entry. It
+    stays idle while any live synthesis is running (live_started() /
+    live_finished()), so it only uses otherwise idle time. A live request
+    for a key that is being prefetched right now calls wait_for(key) and
+    gets the result instead of synthesizing it a second time.
+
+    The worker thread runs at low priority, but ONNX Runtime computes on its
+    own intra-op pool, whose threads keep normal priority, so priority alone
+    does not keep a prefetch from slowing a live synthesis down. Instead,
+    live_started() calls interrupt() if a prefetch is in flight; it must make
+    synthesize() stop early (TTSService sets the ORT RunOptions terminate
+    flag) and return False or raise. The key goes back to the front of the
+    wanted list and is retried once the live synthesis is done. A live
+    synthesis can start after the key is taken but before synthesize() has
+    something to abort; synthesize() checks interrupt_pending once it is
+    ready to be interrupted.
+
+    Stats: prefetched (phrases synthesized), cpu_s (process CPU time while
+    synthesizing; ONNX Runtime computes on its own threads, so per-thread
+    time would undercount) and busy_s (wall time).
+    """
+
+    def __init__(self, synthesize, is_cached, interrupt=None):
+        self.synthesize = synthesize
+        self.is_cached = is_cached
+        self.interrupt = interrupt
+        self._wanted = []
+        self._inflight = None
+        self._interrupted = False
+        self._inflight_done = threading.Event()
+        self._live = 0
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+        # Stats
+        self.prefetched = 0
+        self.failed = 0
+        self.interrupted = 0
+        self.cpu_s = 0.0
+        self.busy_s = 0.0
+
+    def start(self):
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="SpeechPrefetcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=2.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def want(self, keys):
+        """Replace the wanted list, most urgent first (any thread)."""
+        with self._cond:
+            self._wanted = list(keys)
+            self._cond.notify_all()
+
+    def live_started(self):
+        with self._cond:
+            self._live += 1
+            if self._inflight is not None and self.interrupt and not self._interrupted:
+                self._interrupted = True
+                self.interrupt()
+
+    def live_finished(self):
+        with self._cond:
+            self._live -= 1
+            self._cond.notify_all()
+
+    @property
+    def interrupt_pending(self):
+        """The prefetch in flight has been asked to stop."""
+        return self._interrupted
+
+    def wait_for(self, key, timeout=10.0):
+        """If key is being prefetched right now, wait for it. True if it was."""
+        with self._cond:
+            if self._inflight != key:
+                return False
+            done = self._inflight_done
+        done.wait(timeout)
+        return True
+
+    def _next_key(self):
+        """First wanted key that is not cached; called with the lock held."""
+        while self._wanted:
+            key = self._wanted.pop(0)
+            if not self.is_cached(key):
+                return key
+        return None
+
+    def _run(self):
+        _lower_thread_priority()
+        while True:
+            with self._cond:
+                while self._running and (self._live or not self._wanted):
+                    self._cond.wait()
+                if not self._running:
+                    return
+                key = self._next_key()
+                if key is None:
+                    continue
+                self._inflight = key
+                self._inflight_done = threading.Event()
+                self._interrupted = False
+
+            cpu, wall = time.process_time(), time.perf_counter()
+            try:
+                ok = self.synthesize(key)
+            except Exception as e:
+                print(f"[Prefetch] Error: {e}")
+                ok = False
+            with self._cond:
+                self.cpu_s += time.process_time() - cpu
+                self.busy_s += time.perf_counter() - wall
+                if ok:
+                    self.prefetched += 1
+                elif self._interrupted:
+                    self.interrupted += 1
+                    if key not in self._wanted:
+                        self._wanted.insert(0, key)
+                else:
+                    self.failed += 1
+                self._inflight = None
+                self._inflight_done.set()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "prefetched": self.prefetched,
+                "failed": self.failed,
+                "interrupted": self.interrupted,
+                "cpu_s": self.cpu_s,
+                "busy_s": self.busy_s,
+                "wanted": len(self._wanted),
+            }
@@ -4,55 +4,157 @@ import threading
 import time
 import winsound
 import numpy as np
+import onnxruntime as ort
 import soundfile as sf # Required for helper.py style saving
 from PyQt6.QtCore import QObject, pyqtSignal, QUrl
 
 # Import from the user-provided helper.py
 # Assuming src/services/helper.py exists and path includes src/
-from services.helper import load_text_to_speech, load_voice_style, sanitize_filename
+from services.helper import (load_text_to_speech, load_voice_style, sanitize_filename, length_buckets,
+                            repeat_style, trim_batch, session_options, max_chunk_len)
+from services.speech_prefetcher import SpeechPrefetcher
+from services.audio_sink import StreamingSink, wav_bytes
+
+# Synthesis parameters shared by every call
+TOTAL_STEP = 5
+SPEED = 1.05
+STREAM_CHUNK_LEN = 60  # Characters per streamed chunk: about one sentence
+
 
 class TTSService(QObject):
     # Signal emitted when TTS generation fails
     tts_error = pyqtSignal(str)  # error message
+    # Emitted once the background engine load is over: True = ready, False = unavailable
+    engine_ready = pyqtSignal(bool)
     
-    def __init__(self, cache_dir="cache"):
+    def __init__(self, cache_dir="cache", streaming=True, ort_options=None, optimized_cache=True):
+        """
+        streaming: play a new phrase sentence by sentence while the rest is
+        still being synthesized (see _stream_speech)
+        ort_options: ONNX Runtime session tuning (helper.DEFAULT_SESSION_OPTIONS)
+        optimized_cache: save the optimized graphs under cache_dir/ort and
+        load them on later startups
+
+        The engine loads on a background thread (see _load_engine); state is
+        "loading", then "ready" or "failed", and engine_ready is emitted when
+        it changes.
+        """
         super().__init__()
         self.cache_dir = cache_dir
+        self.streaming = streaming
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir)
             
         self.engine = None
         self.voice_styles_map = {} # Cache loaded voice styles
         self.available_voice_names = []
-        
+
+        # Assets path
+        self.assets_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'assets'))
+        self.onnx_dir = os.path.join(self.assets_path, "onnx")
+        self.voice_styles_dir = os.path.join(self.assets_path, "voice_styles")
+        if os.path.exists(self.voice_styles_dir):
+            # Scan available voices
+            self.available_voice_names = self._scan_voice_styles(self.voice_styles_dir)
+
+        # Queue system: size 1 with override structure
+        self._is_playing = False
+        self._play_lock = threading.Lock()
+        self._pending_audio = None  # Tuple: (filepath,) or None
+
+        # Background synthesis of phrases likely to be spoken next (see prefetch())
+        self.prefetcher = SpeechPrefetcher(self._prefetch_one, self._is_cached, self._interrupt_prefetch)
+        self._prefetch_run = None  # RunOptions of the prefetch in flight
+
+        # Stats (cached speak() calls only)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        # speak() calls that need the engine wait here until it is loaded
+        self.state = "loading"
+        self.load_s = None
+        self._state_lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._waiting = []
+        self._loader = threading.Thread(target=self._load_engine, args=(ort_options, optimized_cache),
+                                        name="TTSLoader", daemon=True)
+        self._loader.start()
+
+    def _load_engine(self, ort_options, optimized_cache):
+        """Loader thread: create the sessions, then replay the speak() calls that waited."""
+        start = time.perf_counter()
+        engine = None
         try:
-            # Assets path
-            self.assets_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'assets'))
-            self.onnx_dir = os.path.join(self.assets_path, "onnx")
-            self.voice_styles_dir = os.path.join(self.assets_path, "voice_styles")
-            
             print(f"Loading Supertonic TTS from: {self.assets_path}")
             
             if os.path.exists(self.onnx_dir) and os.path.exists(self.voice_styles_dir):
+                try:
+                    session_options(ort_options)
+                except ValueError as e:
+                    print(f"Ignoring ort_session_options: {e}")
+                    ort_options = None
+                optimized_dir = os.path.join(self.cache_dir, "ort") if optimized_cache else None
                 # Load Engine
                 # Using load_text_to_speech from helper.py
-                self.engine = load_text_to_speech(self.onnx_dir, use_gpu=False)
-                
-                # Scan available voices
-                self.available_voice_names = self._scan_voice_styles(self.voice_styles_dir)
+                engine = load_text_to_speech(self.onnx_dir, use_gpu=False, options=ort_options,
+                                             optimized_dir=optimized_dir)
                 print(f"Supertonic TTS initialized via helper. Voices: {self.available_voice_names}")
             else:
                 print(f"Assets not found at {self.assets_path}. Please download assets first.")
-                self.engine = None
                  
         except Exception as e:
             print(f"Failed to init Supertonic via helper: {e}")
-            self.engine = None
+            engine = None
 
-        # Queue system: size 1 with override structure
-        self._is_playing = False
-        self._play_lock = threading.Lock()
-        self._pending_audio = None  # Tuple: (filepath,) or None
+        self.load_s = time.perf_counter() - start
+        self.engine = engine
+        print(f"[TTS] Engine {'loaded' if engine else 'failed'} after {self.load_s * 1000:.0f} ms")
+        # Replay in arrival order; without an engine they get the fallback beep
+        # as before. State stays "loading" until the queue is empty, so calls
+        # arriving meanwhile queue up behind it instead of overtaking it.
+        replayed = 0
+        while True:
+            with self._state_lock:
+                waiting, self._waiting = self._waiting, []
+                if not waiting:
+                    self.state = "ready" if engine else "failed"
+                    break
+            for args in waiting:
+                self._process_speech(*args)
+            replayed += len(waiting)
+        self._loaded.set()
+        print(f"[TTS] Engine {self.state}, replayed {replayed} queued speak() calls")
+        if engine:
+            self.prefetcher.start()
+        self.engine_ready.emit(engine is not None)
+
+    @property
+    def ready(self):
+        return self.state == "ready"
+
+    def warm_up(self, phrases):
+        """
+        Run (text, voice, lang) phrases through the engine in the background,
+        without caching them, once it is loaded (TextToSpeech.warm_up), so
+        the first alert is not slowed by cold sessions. Use the phrases the
+        alerts will produce, for every voice in use.
+        """
+        threading.Thread(target=self._warm_up, args=(list(phrases),), name="TTSWarmUp", daemon=True).start()
+
+    def _warm_up(self, phrases):
+        self._loaded.wait()
+        if not self.engine:
+            return
+        by_voice = {}
+        for text, voice, lang in dict.fromkeys(phrases):
+            by_voice.setdefault(voice, []).append((text, lang))
+        try:
+            for voice, items in by_voice.items():
+                took = self.engine.warm_up([text for text, _ in items], [lang for _, lang in items],
+                                           self._voice_style(voice), TOTAL_STEP, SPEED)
+                print(f"[TTS] Warm-up: {len(items)} phrases ({voice}) in {took * 1000:.0f} ms")
+        except Exception as e:
+            print(f"[TTS] Warm-up failed: {e}")
 
     def _scan_voice_styles(self, voice_dir):
         # Scan json files in voice_styles dir
@@ -61,51 +163,221 @@ class TTSService(QObject):
         names = [os.path.splitext(os.path.basename(f))[0] for f in files]
         return sorted(names)
 
-    def speak(self, text, voice="F1", lang="ko", cache=True):
+    def speak(self, text, voice="F1", lang="ko", cache=True, trace=None):
         """
         Generates audio.
         If cache=True: checks/saves to cache.
         If cache=False: generates to temp file, plays, doesn't persist.
+        Calls that need synthesis while the engine is still loading are
+        queued and run in order once it is loaded.
+        trace: optional core.latency.AlertTrace, marked at each stage and
+        finished when playback starts (or the audio is dropped).
+        """
+        if trace:
+            trace.mark("speak")
+        args = (text, voice, lang, cache, trace)
+        with self._state_lock:
+            # Cached phrases play right away unless older calls are still queued;
+            # the rest wait for the engine
+            if self.state == "loading" and (self._waiting or not (cache and self._is_cached((text, voice, lang)))):
+                print(f"[TTS] Engine loading, queued: {text}")
+                self._waiting.append(args)
+                return
+        threading.Thread(target=self._process_speech, args=args, daemon=True).start()
+
+    def prefetch(self, phrases):
         """
-        threading.Thread(target=self._process_speech, args=(text, voice, lang, cache), daemon=True).start()
+        Synthesize (text, voice, lang) phrases into the cache in the background,
+        most urgent first, so speaking them later is a cache hit. Replaces any
+        phrases still waiting from the previous call.
+        """
+        self.prefetcher.want(phrases)
+
+    def cache_stats(self):
+        stats = self.prefetcher.stats()
+        stats.update(hits=self.cache_hits, misses=self.cache_misses)
+        return stats
 
-    def _process_speech(self, text, voice, lang, cache):
+    def _cache_path(self, text, voice, lang):
+        return os.path.join(self.cache_dir, self._get_cache_filename(text, voice, lang))
+
+    def _is_cached(self, key):
+        return os.path.exists(self._cache_path(*key))
+
+    def _prefetch_one(self, key):
+        text, voice, lang = key
+        self._prefetch_run = ort.RunOptions()
+        if self.prefetcher.interrupt_pending:  # Live synthesis started before _prefetch_run was set
+            self._prefetch_run.terminate = True
+        try:
+            return self._synthesize_to_cache(text, voice, lang, self._cache_path(text, voice, lang), fallback=False,
+                                             run_options=self._prefetch_run)
+        finally:
+            self._prefetch_run = None
+
+    def _interrupt_prefetch(self):
+        """A live synthesis started: abort the prefetch's ORT runs (SpeechPrefetcher retries it later)."""
+        run_options = self._prefetch_run
+        if run_options is not None:
+            run_options.terminate = True
+
+    def _synthesize_to_cache(self, text, voice, lang, filepath, fallback=True, run_options=None):
+        return self._atomic_write(
+            filepath, lambda tmp_path: self._generate_audio(text, voice, lang, tmp_path, fallback, run_options))
+
+    def _atomic_write(self, filepath, write):
+        """
+        write(tmp_path), then rename the result over filepath, so a reader
+        never sees a partial wav. Returns what write returned.
+        """
+        tmp_path = f"{filepath}.{threading.get_ident()}.tmp"
+        result = write(tmp_path)
+        if os.path.exists(tmp_path):
+            os.replace(tmp_path, filepath)
+        return result
+
+    def _atomic_write_wav(self, filepath, samples, sample_rate):
+        self._atomic_write(filepath, lambda tmp_path: sf.write(tmp_path, samples, sample_rate, format="WAV"))
+
+    def _process_speech(self, text, voice, lang, cache, trace=None):
         if cache:
-            filename = self._get_cache_filename(text, voice, lang)
-            filepath = os.path.join(self.cache_dir, filename)
+            filepath = self._cache_path(text, voice, lang)
+            # Being prefetched right now: waiting beats starting over
+            if not os.path.exists(filepath):
+                self.prefetcher.wait_for((text, voice, lang))
         else:
             filepath = os.path.join(self.cache_dir, "temp_test_voice.wav")
 
         if not cache or not os.path.exists(filepath):
             print(f"Generating TTS (Cache={cache}, Lang={lang}) for: {text}")
-            self._generate_audio(text, voice, lang, filepath)
+            self.prefetcher.live_started()
+            try:
+                if cache:
+                    self.cache_misses += 1
+                if self.engine and self.streaming and self._stream_speech(text, voice, lang, filepath, trace):
+                    return
+                if cache:
+                    self._synthesize_to_cache(text, voice, lang, filepath)
+                else:
+                    self._generate_audio(text, voice, lang, filepath)
+            finally:
+                self.prefetcher.live_finished()
+            if trace:
+                trace.mark("synth_done")
+        else:
+            self.cache_hits += 1
+            if trace:
+                trace.mark("cache_hit")
         
         if os.path.exists(filepath):
-            self._play_audio(filepath)
+            self._play_audio(filepath, trace)
+        elif trace:
+            trace.finish()
 
     def _get_cache_filename(self, text, voice, lang):
         key = f"{text}_{voice}_{lang}".encode('utf-8')
         hash_digest = hashlib.md5(key).hexdigest()
         return f"{hash_digest}.wav"
 
-    def _generate_audio(self, text, voice, lang, output_path):
+    def _stream_speech(self, text, voice, lang, filepath, trace=None):
+        """
+        Synthesize chunk by chunk (TextToSpeech.stream) into a StreamingSink
+        that is queued for playback as soon as the first chunk is ready, so
+        the first sentence plays while the next ones are synthesized. The
+        whole clip is written to filepath afterwards. With a trace,
+        synth_done marks the first chunk.
+
+        Returns False if nothing was synthesized (the caller falls back to the
+        regular path).
+        """
+        sr = self.engine.sample_rate
+        sink = StreamingSink(sr, self._play_samples)
+        clips = []
+        try:
+            style = self._voice_style(voice)
+            for wav, _ in self.engine.stream(text, lang, style, TOTAL_STEP, SPEED, max_len=STREAM_CHUNK_LEN):
+                clip = wav.reshape(-1)
+                clips.append(clip)
+                sink.write(clip)
+                if len(clips) == 1:
+                    if trace:
+                        trace.mark("synth_done")
+                    self._play_audio(sink, trace)
+        except Exception as e:
+            error_msg = f"TTS Generation Error: {e}"
+            print(error_msg)
+            self.tts_error.emit(error_msg)
+            # Whatever was synthesized still plays, but a partial clip is not cached
+            return bool(clips)
+        finally:
+            sink.close()
+
+        self._atomic_write_wav(filepath, np.concatenate(clips), sr)
+        return True
+
+    def _voice_style(self, voice):
+        # Resolve voice
+        voice_name = voice
+        if self.available_voice_names and voice_name not in self.available_voice_names:
+            voice_name = self.available_voice_names[0]
+            print(f"Requested voice '{voice}' not found. Using '{voice_name}'.")
+
+        # Load Voice Style using helper.py
+        # Check cache first
+        if voice_name not in self.voice_styles_map:
+            voice_path = os.path.join(self.voice_styles_dir, f"{voice_name}.json")
+            self.voice_styles_map[voice_name] = load_voice_style([voice_path], verbose=False)
+        return self.voice_styles_map[voice_name]
+
+    def render_batch(self, phrases, batch_size=8):
+        """
+        Synthesize many (text, voice, lang) phrases into the cache at once,
+        e.g. every boundary message in a price range, through
+        TextToSpeech.batch instead of one call per phrase.
+
+        Phrases already cached are skipped. The rest are grouped by voice and
+        then into batches of similar length (helper.length_buckets), since
+        each item is padded to its batch's longest; every clip is trimmed to
+        its own predicted duration before it is written. Texts long enough
+        to need chunking are left to speak(). Returns the number of phrases
+        written.
+        """
+        if not self.engine:
+            return 0
+        by_voice = {}
+        for text, voice, lang in dict.fromkeys(phrases):
+            if len(text) <= max_chunk_len(lang) and not self._is_cached((text, voice, lang)):
+                by_voice.setdefault(voice, []).append((text, voice, lang))
+
+        sr = self.engine.sample_rate
+        rendered = 0
+        for voice, items in by_voice.items():
+            style = self._voice_style(voice)
+            for bucket in length_buckets([len(text) for text, _, _ in items], batch_size):
+                batch = [items[i] for i in bucket]
+                try:
+                    wav, duration = self.engine.batch(
+                        [text for text, _, _ in batch], [lang for _, _, lang in batch],
+                        repeat_style(style, len(batch)), total_step=TOTAL_STEP, speed=SPEED)
+                except Exception as e:
+                    print(f"[TTS Batch] Error: {e}")
+                    continue
+                for (text, _, lang), clip in zip(batch, trim_batch(wav, duration, sr)):
+                    self._atomic_write_wav(self._cache_path(text, voice, lang), clip, sr)
+                    rendered += 1
+        return rendered
+
+    def _generate_audio(self, text, voice, lang, output_path, fallback=True, run_options=None):
+        """
+        fallback: on failure write a beep instead and report it via tts_error.
+        Prefetching passes False, so a failure is not cached or shown.
+        run_options: ort.RunOptions for every session run (prefetch sets its
+        terminate flag to abort)
+        """
         success = False
         if self.engine:
             try:
-                # Resolve voice
-                voice_name = voice
-                if self.available_voice_names and voice_name not in self.available_voice_names:
-                    voice_name = self.available_voice_names[0]
-                    print(f"Requested voice '{voice}' not found. Using '{voice_name}'.")
-                
-                # Load Voice Style using helper.py
-                # Check cache first
-                if voice_name not in self.voice_styles_map:
-                    voice_path = os.path.join(self.voice_styles_dir, f"{voice_name}.json")
-                    style = load_voice_style([voice_path], verbose=False)
-                    self.voice_styles_map[voice_name] = style
-                
-                style = self.voice_styles_map[voice_name]
+                style = self._voice_style(voice)
 
                 # Synthesize
                 # engine(text, lang, style, total_step, speed) -> returns (wav, duration)
@@ -114,8 +386,9 @@ class TTSService(QObject):
                     text=text,
                     lang=lang, 
                     style=style,
-                    total_step=5,
-                    speed=1.05
+                    total_step=TOTAL_STEP,
+                    speed=SPEED,
+                    run_options=run_options
                 )
                 
                 # Save Audio
@@ -129,20 +402,25 @@ class TTSService(QObject):
                 # wav_cat is [1, T]
                 
                 w = wav.squeeze() # Remove batch dim -> [T]
-                sf.write(output_path, w, sr)
+                sf.write(output_path, w, sr, format="WAV")
                 
                 success = True
             except Exception as e:
+                if run_options is not None and run_options.terminate:
+                    print(f"[Prefetch] Interrupted by live synthesis: {text}")
+                    return False
                 error_msg = f"TTS Generation Error: {e}"
                 print(error_msg)
                 import traceback
                 traceback.print_exc()
-                self.tts_error.emit(error_msg)
+                if fallback:
+                    self.tts_error.emit(error_msg)
 
-        if not success:
+        if not success and fallback:
             print(f"[Simulated or Failed Supertonic] Generating dummy for: {text}")
             self._create_dummy_wav(output_path)
             self.tts_error.emit("TTS failed, using fallback audio")
+        return success
 
     def _create_dummy_wav(self, path):
         import wave
@@ -159,7 +437,7 @@ class TTSService(QObject):
                 data.append(struct.pack('<h', value))
             wav_file.writeframes(b''.join(data))
 
-    def _play_audio(self, filepath):
+    def _play_audio(self, filepath, trace=None):
         """
         Queue-aware audio playback.
         If already playing, add to pending queue (size 1, override).
@@ -167,25 +445,46 @@ class TTSService(QObject):
         with self._play_lock:
             if self._is_playing:
                 # Override existing pending audio
-                self._pending_audio = (filepath,)
+                dropped = self._pending_audio
+                self._pending_audio = (filepath, trace)
                 print(f"[TTS Queue] Audio queued (override): {filepath}")
+                if dropped and isinstance(dropped[0], StreamingSink):
+                    dropped[0].cancel()
+                if dropped and dropped[1]:
+                    dropped[1].finish()  # Never played: trace ends at its last stage
                 return
             else:
                 self._is_playing = True
         
         # Start playback in separate thread to allow sync wait
-        threading.Thread(target=self._play_and_process_queue, args=(filepath,), daemon=True).start()
+        threading.Thread(target=self._play_and_process_queue, args=(filepath, trace), daemon=True).start()
     
-    def _play_and_process_queue(self, filepath):
+    def _play_samples(self, samples, sample_rate):
+        winsound.PlaySound(wav_bytes(samples, sample_rate), winsound.SND_MEMORY)
+
+    def _play_and_process_queue(self, filepath, trace=None):
         """
         Play audio synchronously, then process pending queue.
+        filepath may also be a StreamingSink, played as its buffers arrive.
         """
+        def started():
+            if trace:
+                trace.mark("play")
+                trace.finish()
+
         try:
-            print(f"[TTS] Playing: {filepath}")
-            # Use sync playback to know when it finishes
-            winsound.PlaySound(filepath, winsound.SND_FILENAME)
+            if isinstance(filepath, StreamingSink):
+                print("[TTS] Playing stream")
+                filepath.play(on_start=started)
+            else:
+                started()
+                print(f"[TTS] Playing: {filepath}")
+                # Use sync playback to know when it finishes
+                winsound.PlaySound(filepath, winsound.SND_FILENAME)
         except Exception as e:
             print(f"Playback Error: {e}")
+        if trace:
+            trace.finish()  # A stream that never produced audio
         
         # Check for pending audio
         with self._play_lock:
@@ -198,7 +497,7 @@ class TTSService(QObject):
         
         # Play next audio if exists
         if next_audio:
-            next_filepath = next_audio[0]
+            next_filepath, next_trace = next_audio
             print(f"[TTS Queue] Playing pending: {next_filepath}")
-            self._play_and_process_queue(next_filepath)
+            self._play_and_process_queue(next_filepath, next_trace)
 
@@ -0,0 +1,600 @@
+"""
+Local Binance-compatible WebSocket stand-in.
+
+Speaks just enough of RFC 6455 and the Binance market-stream protocol to
+drive PriceMonitor without touching the real exchange:
+- Raw streams:      ws://127.0.0.1:<port>/ws/btcusdt@trade
+- Combined streams: ws://127.0.0.1:<port>/stream?streams=btcusdt@trade/ethusdt@aggTrade
+- Stream types:     trade, aggTrade, bookTicker, miniTicker
+- Live SUBSCRIBE / UNSUBSCRIBE / LIST_SUBSCRIPTIONS requests
+- REST backfill:    http://127.0.0.1:<port>/api/v3/aggTrades?symbol=BTCUSDT&startTime=...
+
+Trades come from a single market clock at a configurable rate (1 to
+10,000+ msgs/sec per symbol) following a synthetic price path, and are
+broadcast to every subscribed client, so trade ids are consecutive per symbol
+and keep advancing while a client is disconnected. Scripted disconnects drop
+every client and optionally refuse new connections for a while.
+
+Standard library only, so it runs anywhere the app runs.
+
+Usage:
+    python src/simulator/binance_server.py --port 9555 --rate 10
+    python src/simulator/binance_server.py --path gap_jump --rate 5000 --disconnect-every 10 --downtime 2
+    python src/simulator/binance_server.py --rate 200 --fills 3
+"""
+import argparse
+import base64
+import hashlib
+import json
+import math
+import os
+import random
+import socket
+import socketserver
+import struct
+import threading
+import time
+import sys
+from collections import deque
+from urllib.parse import urlsplit, parse_qs
+
+# Allow running as a script (python src/simulator/binance_server.py)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator.price_paths import make_path, PATHS
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_TEXT = 0x1
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+def encode_frame(payload, opcode=OP_TEXT):
+    """Encode a single unmasked (server -> client) frame."""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    header = bytes([0x80 | opcode])
+    length = len(payload)
+    if length < 126:
+        header += bytes([length])
+    elif length < 65536:
+        header += bytes([126]) + struct.pack("!H", length)
+    else:
+        header += bytes([127]) + struct.pack("!Q", length)
+    return header + payload
+
+
+def _recv_exact(sock, n):
+    buf = b""
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("Client closed connection")
+        buf += chunk
+    return buf
+
+
+def read_frame(sock):
+    """Read a single (masked) client frame. Returns (opcode, payload bytes)."""
+    b0, b1 = _recv_exact(sock, 2)
+    opcode = b0 & 0x0F
+    masked = b1 & 0x80
+    length = b1 & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", _recv_exact(sock, 2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", _recv_exact(sock, 8))[0]
+    mask = _recv_exact(sock, 4) if masked else None
+    payload = _recv_exact(sock, length)
+    if mask:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload
+
+
+class Market:
+    """
+    Shared synthetic market: one price path and trade id counter per symbol.
+    Symbols are created on first subscription and keep trading from then on.
+
+    Trades come from taker orders that each fill a random number of trades
+    (mean `fills`) at one price, so the stream types differ like on Binance:
+    - trade:      one message per trade
+    - aggTrade:   one message per taker order
+    - bookTicker: one message per trade (the best level's size changes)
+    - miniTicker: one message per second, from the server clock
+
+    The last `history` aggregates per symbol are kept for the aggTrades endpoint.
+    """
+
+    def __init__(self, path="random_walk", path_options=None, seed=None, history=100000, fills=1.0):
+        self.path = path
+        self.path_options = path_options or {}
+        self.seed = seed
+        self.history = history
+        self.fills = max(1.0, float(fills))
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._paths = {}
+        self._state = {}
+        self._aggs = {}
+
+    def ensure_symbol(self, symbol):
+        with self._lock:
+            if symbol not in self._paths:
+                seed = None if self.seed is None else self.seed + len(self._paths)
+                self._paths[symbol] = make_path(self.path, seed=seed, **self.path_options)
+                self._state[symbol] = _SymbolState()
+                self._aggs[symbol] = deque(maxlen=self.history)
+
+    def symbols(self):
+        with self._lock:
+            return list(self._paths)
+
+    def _order_size(self):
+        if self.fills <= 1.0:
+            return 1
+        # Geometric number of fills with the configured mean
+        p = 1.0 / self.fills
+        return 1 + int(math.log(1.0 - self._rng.random()) / math.log(1.0 - p))
+
+    def _next(self, symbol, now_ms):
+        """Advance one trade. Returns (trade, finished aggTrade or None, bookTicker)."""
+        st = self._state[symbol]
+        if st.order_left == 0:
+            st.order_left = self._order_size()
+            st.order_price = self._paths[symbol].next_price()
+            st.order_first = st.trade_id + 1
+            st.order_qty = 0.0
+        price = st.order_price
+        st.trade_id += 1
+        trade_id = st.trade_id
+        qty = 0.001 + (trade_id * 7919 % 5000) / 10000.0
+        st.order_qty += qty
+        st.order_left -= 1
+        st.update_id += 1
+        st.volume += qty
+        st.quote_volume += price * qty
+        if st.open is None:
+            st.open = st.high = st.low = price
+        st.high = max(st.high, price)
+        st.low = min(st.low, price)
+        st.close = price
+
+        price_s, qty_s = f"{price:.8f}", f"{qty:.8f}"
+        sym = symbol.upper()
+        trade = {"e": "trade", "E": now_ms, "s": sym, "t": trade_id, "p": price_s, "q": qty_s,
+                 "T": now_ms, "m": False, "M": True}
+        agg = None
+        if st.order_left == 0:
+            st.agg_id += 1
+            agg_qty_s = f"{st.order_qty:.8f}"
+            self._aggs[symbol].append((st.agg_id, price_s, agg_qty_s, st.order_first, trade_id, now_ms))
+            agg = {"e": "aggTrade", "E": now_ms, "s": sym, "a": st.agg_id, "p": price_s, "q": agg_qty_s,
+                   "f": st.order_first, "l": trade_id, "T": now_ms, "m": False, "M": True}
+        book = {"u": st.update_id, "s": sym, "b": f"{price - 0.01:.8f}", "B": qty_s,
+                "a": f"{price + 0.01:.8f}", "A": f"{0.5 + qty:.8f}"}
+        return trade, agg, book
+
+    def next_trade(self, symbol, now_ms=None):
+        if now_ms is None:
+            now_ms = int(time.time() * 1000)
+        with self._lock:
+            return self._next(symbol, now_ms)[0]
+
+    def next_events(self, symbol, n, now_ms, kinds):
+        """
+        Advance n trades and return {stream kind: [JSON messages]} for the
+        kinds in `kinds`, so unused payloads are never serialized.
+        """
+        out = {kind: [] for kind in kinds if kind in ("trade", "aggTrade", "bookTicker")}
+        trades, aggs, books = out.get("trade"), out.get("aggTrade"), out.get("bookTicker")
+        with self._lock:
+            for _ in range(n):
+                trade, agg, book = self._next(symbol, now_ms)
+                if trades is not None:
+                    trades.append(json.dumps(trade, separators=(",", ":")))
+                if aggs is not None and agg is not None:
+                    aggs.append(json.dumps(agg, separators=(",", ":")))
+                if books is not None:
+                    books.append(json.dumps(book, separators=(",", ":")))
+        return out
+
+    def mini_ticker(self, symbol, now_ms):
+        """24hrMiniTicker payload (totals since the symbol started trading), or None before any trade."""
+        with self._lock:
+            st = self._state[symbol]
+            if st.open is None:
+                return None
+            return json.dumps({
+                "e": "24hrMiniTicker", "E": now_ms, "s": symbol.upper(),
+                "c": f"{st.close:.8f}", "o": f"{st.open:.8f}", "h": f"{st.high:.8f}", "l": f"{st.low:.8f}",
+                "v": f"{st.volume:.8f}", "q": f"{st.quote_volume:.8f}",
+            }, separators=(",", ":"))
+
+    def agg_trades(self, symbol, from_id=None, start_time=None, end_time=None, limit=500):
+        """aggTrades view of the history (completed taker orders only)."""
+        with self._lock:
+            aggs = list(self._aggs.get(symbol, ()))
+        out = []
+        for agg_id, price, qty, first, last, t in aggs:
+            if from_id is not None and agg_id < from_id:
+                continue
+            if start_time is not None and t < start_time:
+                continue
+            if end_time is not None and t > end_time:
+                break
+            out.append({"a": agg_id, "p": price, "q": qty, "f": first, "l": last,
+                        "T": t, "m": False, "M": True})
+            if len(out) >= limit:
+                break
+        return out
+
+
+class _SymbolState:
+    __slots__ = ("trade_id", "agg_id", "update_id", "order_left", "order_price", "order_first", "order_qty",
+                 "open", "high", "low", "close", "volume", "quote_volume")
+
+    def __init__(self):
+        self.trade_id = 0
+        self.agg_id = 0
+        self.update_id = 0
+        self.order_left = 0
+        self.order_price = 0.0
+        self.order_first = 0
+        self.order_qty = 0.0
+        self.open = self.high = self.low = self.close = None
+        self.volume = 0.0
+        self.quote_volume = 0.0
+
+
+class _StreamHandler(socketserver.BaseRequestHandler):
+    """One WebSocket client connection. Trades are pushed by the server's market clock."""
+
+    def setup(self):
+        self.send_lock = threading.Lock()
+        self.streams = []
+        self.streams_lock = threading.Lock()
+        self.combined = False
+        self.closed = threading.Event()
+
+    def handle(self):
+        sock = self.request
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        try:
+            if not self._handshake(sock):
+                return
+        except (ConnectionError, OSError, ValueError):
+            return
+
+        for stream in self.streams:
+            self.server.market.ensure_symbol(stream.partition("@")[0])
+        self.server.register(self)
+        try:
+            self._read_loop()
+        finally:
+            self.close()
+            self.server.unregister(self)
+
+    def close(self):
+        self.closed.set()
+        try:
+            self.request.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _handshake(self, sock):
+        data = b""
+        while b"\r\n\r\n" not in data:
+            chunk = sock.recv(4096)
+            if not chunk:
+                return False
+            data += chunk
+        head = data.split(b"\r\n\r\n", 1)[0].decode("latin-1")
+        lines = head.split("\r\n")
+        method, target, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                k, v = line.split(":", 1)
+                headers[k.strip().lower()] = v.strip()
+
+        parts = urlsplit(target)
+        if headers.get("upgrade", "").lower() != "websocket":
+            self._handle_rest(sock, method, parts)
+            return False
+
+        if self.server.is_down():
+            sock.sendall(b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n")
+            return False
+
+        if parts.path.startswith("/ws/"):
+            self.streams = [s for s in parts.path[len("/ws/"):].split("/") if s]
+        elif parts.path in ("/ws", "/stream"):
+            self.combined = parts.path == "/stream"
+            query = parse_qs(parts.query)
+            if "streams" in query:
+                self.streams = [s for s in query["streams"][0].split("/") if s]
+        else:
+            sock.sendall(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            return False
+
+        key = headers.get("sec-websocket-key")
+        if method != "GET" or not key:
+            sock.sendall(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            return False
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        sock.sendall(
+            (
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\n"
+                "Connection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode()
+        )
+        return True
+
+    def _handle_rest(self, sock, method, parts):
+        """Plain HTTP on the same port: GET /api/v3/aggTrades."""
+        if method != "GET" or parts.path != "/api/v3/aggTrades":
+            status, body = "404 Not Found", {"code": -1, "msg": "Not found"}
+        else:
+            q = {k: v[0] for k, v in parse_qs(parts.query).items()}
+            symbol = q.get("symbol", "").lower()
+            try:
+                body = self.server.market.agg_trades(
+                    symbol,
+                    from_id=int(q["fromId"]) if "fromId" in q else None,
+                    start_time=int(q["startTime"]) if "startTime" in q else None,
+                    end_time=int(q["endTime"]) if "endTime" in q else None,
+                    limit=min(int(q.get("limit", 500)), 1000),
+                )
+                status = "200 OK"
+            except ValueError:
+                status, body = "400 Bad Request", {"code": -1100, "msg": "Illegal parameter"}
+        data = json.dumps(body).encode()
+        sock.sendall(
+            (f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+             f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n").encode() + data
+        )
+
+    def send(self, payload, opcode=OP_TEXT):
+        self.send_raw(encode_frame(payload, opcode))
+
+    def send_raw(self, data):
+        with self.send_lock:
+            self.request.sendall(data)
+
+    def _read_loop(self):
+        sock = self.request
+        try:
+            while not self.closed.is_set():
+                opcode, payload = read_frame(sock)
+                if opcode == OP_CLOSE:
+                    try:
+                        self.send(payload[:2], OP_CLOSE)
+                    except OSError:
+                        pass
+                    break
+                elif opcode == OP_PING:
+                    self.send(payload, OP_PONG)
+                elif opcode == OP_TEXT:
+                    self._handle_request(payload)
+        except (ConnectionError, OSError, ValueError):
+            pass
+
+    def _handle_request(self, payload):
+        try:
+            req = json.loads(payload)
+        except ValueError:
+            return
+        method = req.get("method")
+        params = req.get("params") or []
+        result = None
+        with self.streams_lock:
+            if method == "SUBSCRIBE":
+                for stream in params:
+                    self.server.market.ensure_symbol(stream.partition("@")[0])
+                    if stream not in self.streams:
+                        self.streams.append(stream)
+            elif method == "UNSUBSCRIBE":
+                self.streams = [s for s in self.streams if s not in params]
+            elif method == "LIST_SUBSCRIPTIONS":
+                result = list(self.streams)
+        self.send(json.dumps({"result": result, "id": req.get("id")}))
+
+
+class FakeBinanceServer(socketserver.ThreadingTCPServer):
+    """
+    Threaded stand-in server. start() runs it in the background and returns
+    the ws base url (e.g. "ws://127.0.0.1:54321") to hand to PriceMonitor.
+
+    rate: trades/sec per symbol
+    fills: mean trades per taker order (aggTrade messages = trades / fills)
+    path: price path name (see simulator.price_paths)
+    disconnect_every: drop every client each N seconds (None = never)
+    downtime: after a scripted drop, refuse connections for this many seconds
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0, rate=10.0, market=None,
+                 path="random_walk", path_options=None, seed=None,
+                 disconnect_every=None, downtime=0.0, fills=1.0):
+        super().__init__((host, port), _StreamHandler)
+        self.rate = float(rate)
+        self.market = market or Market(path, path_options, seed, fills=fills)
+        self.disconnect_every = disconnect_every
+        self.downtime = downtime
+        self.stopping = threading.Event()
+        self.clients = set()
+        self._clients_lock = threading.Lock()
+        self._down_until = 0.0
+        self._bg_threads = []
+
+        # Stats
+        self.trades_generated = 0
+        self.disconnects = 0
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    @property
+    def url(self):
+        return f"ws://{self.server_address[0]}:{self.port}"
+
+    @property
+    def http_url(self):
+        return f"http://{self.server_address[0]}:{self.port}"
+
+    def register(self, handler):
+        with self._clients_lock:
+            self.clients.add(handler)
+
+    def unregister(self, handler):
+        with self._clients_lock:
+            self.clients.discard(handler)
+
+    def is_down(self):
+        return time.monotonic() < self._down_until
+
+    def drop_clients(self, downtime=0.0):
+        """Scripted disconnect: abruptly close every client connection."""
+        self._down_until = time.monotonic() + downtime
+        with self._clients_lock:
+            clients = list(self.clients)
+        for client in clients:
+            client.close()
+        self.disconnects += 1
+
+    def start(self):
+        self._start_threads(serve=True)
+        return self.url
+
+    def _start_threads(self, serve):
+        targets = [self._run_market]
+        if serve:
+            targets.append(self.serve_forever)
+        if self.disconnect_every:
+            targets.append(self._run_disconnects)
+        for target in targets:
+            t = threading.Thread(target=target, daemon=True)
+            t.start()
+            self._bg_threads.append(t)
+
+    def stop(self):
+        self.stopping.set()
+        self.shutdown()
+        self.server_close()
+        for t in self._bg_threads:
+            t.join(timeout=1.0)
+
+    def _run_disconnects(self):
+        while not self.stopping.wait(self.disconnect_every):
+            print(f"[Server] Scripted disconnect (downtime {self.downtime}s)", flush=True)
+            self.drop_clients(self.downtime)
+
+    def _run_market(self):
+        """
+        Market clock: generate `rate` trades/sec per symbol and broadcast them,
+        plus one miniTicker per symbol each second.
+        """
+        start = time.perf_counter()
+        generated = 0
+        next_mini = start + 1.0
+        while not self.stopping.is_set():
+            now = time.perf_counter()
+            due = int((now - start) * self.rate)
+            mini = now >= next_mini
+            if due <= generated and not mini:
+                time.sleep(min(0.001, 1.0 / self.rate))
+                continue
+            n = due - generated
+            generated = due
+
+            now_ms = int(time.time() * 1000)
+            kinds = self._subscribed_kinds()
+            raw = {}
+            for symbol in self.market.symbols():
+                if n > 0:
+                    for kind, messages in self.market.next_events(symbol, n, now_ms, kinds).items():
+                        raw[(symbol, kind)] = messages
+                    self.trades_generated += n
+                if mini:
+                    msg = self.market.mini_ticker(symbol, now_ms)
+                    if msg is not None:
+                        raw[(symbol, "miniTicker")] = [msg]
+            if mini:
+                next_mini += 1.0
+            self._broadcast(raw)
+
+    def _subscribed_kinds(self):
+        with self._clients_lock:
+            clients = list(self.clients)
+        kinds = set()
+        for client in clients:
+            with client.streams_lock:
+                kinds.update(stream.partition("@")[2] for stream in client.streams)
+        return kinds
+
+    def _broadcast(self, raw):
+        with self._clients_lock:
+            clients = list(self.clients)
+        for client in clients:
+            if client.closed.is_set():
+                continue
+            with client.streams_lock:
+                streams = list(client.streams)
+            frames = []
+            for stream in streams:
+                symbol, _, kind = stream.partition("@")
+                messages = raw.get((symbol, kind))
+                if not messages:
+                    continue
+                if client.combined:
+                    prefix = '{"stream":"%s","data":' % stream
+                    frames.extend(encode_frame(prefix + m + "}") for m in messages)
+                else:
+                    frames.extend(encode_frame(m) for m in messages)
+            if not frames:
+                continue
+            try:
+                client.send_raw(b"".join(frames))
+            except OSError:
+                client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Binance market-stream stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9555)
+    parser.add_argument("--rate", type=float, default=10.0, help="Trades/sec per symbol (1 - 10000)")
+    parser.add_argument("--path", default="random_walk", choices=sorted(PATHS), help="Synthetic price path")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--fills", type=float, default=1.0,
+                        help="Mean trades per taker order (trade vs aggTrade message ratio)")
+    parser.add_argument("--disconnect-every", type=float, default=None, metavar="SECONDS",
+                        help="Drop all clients every N seconds")
+    parser.add_argument("--downtime", type=float, default=0.0, metavar="SECONDS",
+                        help="Refuse new connections for this long after each drop")
+    args = parser.parse_args()
+
+    server = FakeBinanceServer(args.host, args.port, rate=args.rate, path=args.path, seed=args.seed,
+                               disconnect_every=args.disconnect_every, downtime=args.downtime,
+                               fills=args.fills)
+    server._start_threads(serve=False)
+    print(f"Fake Binance server listening on {server.url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stopping.set()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Synthetic price paths for the local Binance stand-in.
+
+Each path is a small object with next_price(); the server calls it once per
+generated trade.
+"""
+import math
+import random
+
+
+class RandomWalkPath:
+    """Uniform random walk: each trade moves at most `step`."""
+
+    def __init__(self, start=95000.0, step=5.0, seed=None):
+        self.price = start
+        self.step = step
+        self._rng = random.Random(seed)
+
+    def next_price(self):
+        self.price = max(0.01, self.price + self._rng.uniform(-self.step, self.step))
+        return self.price
+
+
+class GapJumpPath(RandomWalkPath):
+    """
+    Random walk with occasional gap jumps of `gap` (either direction), like a
+    liquidation cascade crossing several alert intervals in one trade.
+    """
+
+    def __init__(self, start=95000.0, step=5.0, gap=250.0, gap_prob=0.01, seed=None):
+        super().__init__(start, step, seed)
+        self.gap = gap
+        self.gap_prob = gap_prob
+
+    def next_price(self):
+        if self._rng.random() < self.gap_prob:
+            self.price = max(0.01, self.price + self._rng.choice((-1, 1)) * self.gap)
+            return self.price
+        return super().next_price()
+
+
+class OscillationPath:
+    """
+    Sine wave around a boundary (plus a little noise), so the price keeps
+    crossing the same alert level back and forth.
+    """
+
+    def __init__(self, boundary=95000.0, amplitude=20.0, period=50, noise=1.0, seed=None):
+        self.boundary = boundary
+        self.amplitude = amplitude
+        self.period = period
+        self.noise = noise
+        self._n = 0
+        self._rng = random.Random(seed)
+
+    def next_price(self):
+        phase = 2.0 * math.pi * self._n / self.period
+        self._n += 1
+        return self.boundary + self.amplitude * math.sin(phase) + self._rng.uniform(-self.noise, self.noise)
+
+
+PATHS = {
+    "random_walk": RandomWalkPath,
+    "gap_jump": GapJumpPath,
+    "oscillation": OscillationPath,
+}
+
+
+def make_path(name, **kwargs):
+    try:
+        cls = PATHS[name]
+    except KeyError:
+        raise ValueError(f"Unknown price path: {name} (choose from {', '.join(PATHS)})")
+    return cls(**kwargs)
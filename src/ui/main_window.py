@@ -1,21 +1,44 @@
 import sys
+import time
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QApplication, QMessageBox, QFrame)
 from PyQt6.QtCore import Qt, pyqtSlot
-from PyQt6.QtGui import QFont
+from PyQt6.QtGui import QFont, QKeySequence, QShortcut
 
-from core.price_monitor import PriceMonitor
+from core.price_monitor import PriceMonitor, BINANCE_WS_URL
+from core.backfill import BINANCE_REST_URL
 from core.interval_logic import IntervalTracker
+from core.alert_rules import RuleEngine, make_rules
+from core.alert_worker import AlertWorker
+from core.adaptive_interval import AdaptiveInterval
+from core.alert_warmer import AlertWarmer
+from core.tick_conflator import TickConflator
+from core.tick_recorder import TickRecorder
+from core.tick_store import TickStore
+from core.candle_builder import CandleBuilder
+from core.latency import LatencyRecorder
 from services.tts_service import TTSService
 from ui.settings_dialog import SettingsDialog
 from utils.settings_manager import SettingsManager, LANG_CODE_MAP
 from utils.korean_numbers import number_to_korean
+from utils.alert_text import crossing_text
 
 from ui.clock_widget import ClockWidget
 
+# Price used to build the warm-up phrases: six digits, like real alerts
+WARM_UP_PRICE = 105550.0
+
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, price_monitor=None, record_path=None, started=None):
+        """
+        price_monitor: price source to use instead of the live Binance feed
+                       (e.g. ReplayPriceMonitor)
+        record_path: append every received tick to this binary tick log
+        started: time.perf_counter() at process start, for the startup timings
+        """
         super().__init__()
+        self.started = started if started is not None else time.perf_counter()
+        self.first_paint_s = None
         self.setWindowTitle("Bitcoin Ticker")
 
         # Settings Manager (Persistent)
@@ -27,18 +50,54 @@ class MainWindow(QMainWindow):
         self.always_on_top = self.settings_manager.get("always_on_top", True)
         self.ticker_mode = self.settings_manager.get("ticker_mode", False)
         saved_interval = self.settings_manager.get("interval", 50)
+        conflation_ms = self.settings_manager.get("conflation_ms", 50)
         
         # Price tracking for percentage calculation
         self.baseline_price = None  # First price received
         self.current_price = 0
+        self.displayed_price = None  # Last price shown, for the direction indicator
 
         # Core Components
-        self.price_monitor = PriceMonitor()
-        self.interval_tracker = IntervalTracker(interval=float(saved_interval))
-        self.tts_service = TTSService()
+        self.price_monitor = price_monitor or PriceMonitor(
+            base_url=self.settings_manager.get("ws_endpoint", BINANCE_WS_URL),
+            rest_url=self.settings_manager.get("rest_endpoint", BINANCE_REST_URL),
+            stream_type=self.settings_manager.get("stream_type", "trade"),
+            hub=self.settings_manager.get("hub_address") or None)
+        self.conflator = TickConflator(
+            interval_ms=conflation_ms, parent=self,
+            queue_size=self.settings_manager.get("ingest_queue_size", 256),
+            policy=self.settings_manager.get("ingest_policy", "drop_oldest"))
+        self.interval_tracker = IntervalTracker(
+            interval=float(saved_interval),
+            aggregate=self.settings_manager.get("aggregate_crossings", False))
+        self.alert_rules = RuleEngine(make_rules(self.settings_manager.get("alert_rules", [])))
+        self.tts_service = TTSService(
+            ort_options=self.settings_manager.get("ort_session_options", {}),
+            optimized_cache=self.settings_manager.get("ort_optimized_cache", True))
+        self.adaptive_interval = None
+        if self.settings_manager.get("adaptive_interval", False):
+            self.adaptive_interval = AdaptiveInterval(
+                self.interval_tracker, alerts_per_minute=self.settings_manager.get("alerts_per_minute", 4))
+        # Alerts are evaluated on their own thread from raw ticks; the GUI only displays prices
+        evaluators = [self.interval_tracker]
+        if self.adaptive_interval:
+            evaluators.insert(0, self.adaptive_interval)
+        if self.alert_rules.rules:
+            evaluators.append(self.alert_rules)
+        self.alert_warmer = None
+        if self.settings_manager.get("prefetch_alerts", True):
+            # Synthesize the next boundaries' phrases before they are crossed
+            self.alert_warmer = AlertWarmer(self.interval_tracker, self.alert_phrase, self.tts_service.prefetch)
+            evaluators.append(self.alert_warmer)
+        self.alert_worker = AlertWorker(evaluators, parent=self)
+
+        # Tick-to-speech latency histograms (Ctrl+L prints them)
+        self.latency = LatencyRecorder()
         
         # Connect TTS error signal
         self.tts_service.tts_error.connect(self.on_tts_error)
+        self.tts_service.engine_ready.connect(self.on_engine_ready)
+        self.warm_up_tts()
         
         # Window Flags & Attributes
         if self.always_on_top:
@@ -219,11 +278,36 @@ class MainWindow(QMainWindow):
         self.setup_layout()
 
         # Signal Connections
-        self.price_monitor.price_updated.connect(self.on_price_update)
+        # Raw trades go straight from the WebSocket thread into the alert worker
+        # and the conflator; the UI only sees one conflated window per frame interval.
+        self.price_monitor.price_updated.connect(self.on_live_price, Qt.ConnectionType.DirectConnection)
+        self.conflator.window_ready.connect(self.on_price_window)
+        if hasattr(self.price_monitor, "backfilled"):
+            # Trades missed during an outage reach the alert worker one by one, in order
+            self.price_monitor.backfilled.connect(self.on_backfilled, Qt.ConnectionType.DirectConnection)
+            self.price_monitor.reconnected.connect(self.on_reconnected)
+        # Bounded price history (rolling 1m/5m/1h stats) for other components to query
+        self.tick_store = TickStore()
+        self.price_monitor.tick_received.connect(self.tick_store.append, Qt.ConnectionType.DirectConnection)
+        self.candle_builder = CandleBuilder(parent=self)
+        self.price_monitor.tick_received.connect(self.candle_builder.append, Qt.ConnectionType.DirectConnection)
+        self.tick_recorder = None
+        if record_path:
+            self.tick_recorder = TickRecorder(record_path)
+            self.price_monitor.tick_received.connect(self.tick_recorder.record, Qt.ConnectionType.DirectConnection)
         self.price_monitor.connection_status.connect(self.on_connection_status)
-        self.interval_tracker.interval_crossed.connect(self.on_interval_crossed)
+        # Alert handlers run on the alert worker thread and must not touch widgets
+        direct = Qt.ConnectionType.DirectConnection
+        self.interval_tracker.interval_crossed.connect(self.on_interval_crossed, direct)
+        self.interval_tracker.interval_jumped.connect(self.on_interval_jumped, direct)
+        self.alert_rules.rule_triggered.connect(self.on_rule_triggered, direct)
+        if self.adaptive_interval:
+            self.adaptive_interval.interval_changed.connect(self.on_interval_adapted)
+        QShortcut(QKeySequence("Ctrl+L"), self, activated=lambda: print(self.latency.dump()))
         
         # Start Monitor
+        self.alert_worker.start()
+        self.conflator.start()
         self.price_monitor.start()
 
     def setup_layout(self):
@@ -422,10 +506,39 @@ class MainWindow(QMainWindow):
         if event.button() == Qt.MouseButton.LeftButton:
             self.old_pos = None
 
+    def on_live_price(self, price):
+        """Runs on the WebSocket thread: tag the price with its tick's timestamps"""
+        monitor = self.price_monitor
+        stamp = (getattr(monitor, "last_event_ms", None), getattr(monitor, "last_recv_ns", None))
+        self.alert_worker.push(price, stamp)
+        self.conflator.push(price, stamp)
+
+    @pyqtSlot(object)
+    def on_price_window(self, window):
+        """One conflated frame (see TickConflator); display only"""
+        display_ns = time.time_ns()
+        self.on_price_update(window.last)
+        stamp = window.last_stamp
+        if stamp and stamp[0]:
+            self.latency.record_span("tick event -> recv", stamp[0] * 1_000_000, stamp[1])
+            self.latency.record_span("tick recv -> display", stamp[1], display_ns)
+
+    def on_backfilled(self, ticks):
+        """Runs on the WebSocket thread, before any new live trade"""
+        symbol = self.price_monitor.symbol
+        prices = [t.price for t in ticks if t.symbol == symbol]
+        self.alert_worker.push_path(prices)
+        self.conflator.push_path(prices)
+
+    @pyqtSlot(float, int)
+    def on_reconnected(self, outage_seconds, backfilled):
+        self.status_label.setToolTip(f"Last outage: {outage_seconds:.1f}s, {backfilled} trades backfilled")
+
     @pyqtSlot(float)
     def on_price_update(self, price):
         # Get previous price for direction indicator
-        prev_price = self.interval_tracker.last_price
+        prev_price = self.displayed_price
+        self.displayed_price = price
         
         # Set baseline price (first price received)
         if self.baseline_price is None:
@@ -461,8 +574,6 @@ class MainWindow(QMainWindow):
             
             self.percent_label.setText(f"{sign}{percent_change:.2f}%")
             self.percent_label.setStyleSheet(f"color: {color}; border: none; font-size: 14px;")
-        
-        self.interval_tracker.process_price(price)
 
     @pyqtSlot(bool)
     def on_connection_status(self, connected):
@@ -477,35 +588,55 @@ class MainWindow(QMainWindow):
             border: 1px solid {color};
         """)
 
-    @pyqtSlot(float, str)
-    def on_interval_crossed(self, price, direction):
+    def warm_up_tts(self):
+        """Warm the TTS engine up with alerts like the ones it will speak"""
+        if self.settings_manager.get("warm_up_tts", True):
+            self.tts_service.warm_up(self.alert_phrase(WARM_UP_PRICE, d) for d in ("UP", "DOWN"))
+
+    def alert_phrase(self, price, direction):
+        """(text, voice, lang) spoken for a crossing; any thread"""
         # Use shared constant from settings_manager
         lang_code = LANG_CODE_MAP.get(self.current_language, "ko")
+        return crossing_text(self.current_language, price, direction), self.current_voice, lang_code
 
-        price_int = int(price)
-        text = ""
-        
-        if self.current_language == "Korean":
-            # Convert number to Korean text for proper pronunciation
-            price_korean = number_to_korean(price_int)
-            text = f"{price_korean}달러를 돌파했습니다." if direction == "UP" else f"{price_korean}달러가 깨어졌습니다."
-        elif self.current_language == "English":
-            text = f"Bitcoin passed {price_int} dollars." if direction == "UP" else f"Bitcoin dropped below {price_int} dollars."
-        elif self.current_language == "Spanish":
-            text = f"Bitcoin superó los {price_int} dólares." if direction == "UP" else f"Bitcoin cayó por debajo de los {price_int} dólares."
-        elif self.current_language == "Portuguese":
-            text = f"O Bitcoin ultrapassou {price_int} dólares." if direction == "UP" else f"O Bitcoin caiu abaixo de {price_int} dólares."
-        elif self.current_language == "French":
-            text = f"Le Bitcoin a dépassé {price_int} dollars." if direction == "UP" else f"Le Bitcoin est tombé sous {price_int} dollars."
-            
-        print(f"Triggering TTS: {text} ({self.current_voice}, {lang_code})")
+    @pyqtSlot(float, str)
+    def on_interval_crossed(self, price, direction):
+        """Runs on the alert worker thread"""
+        text, voice, lang_code = self.alert_phrase(price, direction)
+        print(f"Triggering TTS: {text} ({voice}, {lang_code})")
+
+        trace = None
+        if self.alert_worker.origin:
+            stamp, dispatch_ns = self.alert_worker.origin
+            event_ms, recv_ns = stamp or (None, None)
+            trace = self.latency.trace(event_ms, recv_ns)
+            trace.mark("dispatch", dispatch_ns)
+            trace.mark("emit")
         
         # Skip TTS if muted
         if not self.is_muted:
-            self.tts_service.speak(text, voice=self.current_voice, lang=lang_code)
+            self.tts_service.speak(text, voice=voice, lang=lang_code, trace=trace)
+        elif trace:
+            trace.finish()
+
+    @pyqtSlot(float, float, str, int)
+    def on_interval_jumped(self, first, last, direction, count):
+        """Aggregate mode: one alert for a gap move, announcing the furthest boundary"""
+        print(f"Gap move {direction}: {count} boundaries crossed ({first:.0f} -> {last:.0f})")
+        self.on_interval_crossed(last, direction)
+
+    @pyqtSlot(object, float, str)
+    def on_rule_triggered(self, rule, price, direction):
+        print(f"Rule {rule} fired {direction} at {price:.2f}")
+        self.on_interval_crossed(price, direction)
+
+    @pyqtSlot(float)
+    def on_interval_adapted(self, interval):
+        print(f"[Adaptive Interval] {interval:g} USD (volatility {self.adaptive_interval.volatility or 0:.2f} USD/sqrt(s))")
 
     def open_settings(self):
-        current_interval = int(self.interval_tracker.interval)
+        current_interval = int(self.adaptive_interval.base_interval if self.adaptive_interval
+                               else self.interval_tracker.interval)
         
         dialog = SettingsDialog(self, current_interval, self.current_voice, self.always_on_top, self.current_language, self.ticker_mode)
         
@@ -514,6 +645,7 @@ class MainWindow(QMainWindow):
         
         if dialog.exec():
             settings = dialog.get_settings()
+            previous_voice = (self.current_voice, self.current_language)
             new_interval = settings["interval"]
             self.current_voice = settings["voice"]
             new_always_top = settings["always_on_top"]
@@ -521,7 +653,14 @@ class MainWindow(QMainWindow):
             new_ticker_mode = settings["ticker_mode"]
             
             # Update Interval
-            self.interval_tracker.set_interval(float(new_interval))
+            if self.adaptive_interval:
+                self.alert_worker.call(self.adaptive_interval.set_base, float(new_interval))
+            else:
+                self.alert_worker.call(self.interval_tracker.set_interval, float(new_interval))
+            if self.alert_warmer:
+                self.alert_worker.call(self.alert_warmer.refresh)  # Language or voice may have changed
+            if (self.current_voice, self.current_language) != previous_voice:
+                self.warm_up_tts()
             
             # Save settings persistently
             self.settings_manager.update({
@@ -551,7 +690,7 @@ class MainWindow(QMainWindow):
         # Use shared constant
         lang_code = LANG_CODE_MAP.get(self.current_language, "ko")
 
-        price = self.interval_tracker.last_price
+        price = self.displayed_price
         price_val = int(price) if price else 0
         text = ""
         
@@ -588,6 +727,18 @@ class MainWindow(QMainWindow):
         self.status_label.setText("TTS Error")
         print(f"[UI] TTS Error: {error_message}")
 
+    def on_engine_ready(self, ok):
+        """The TTS engine finished loading in the background."""
+        state = "ready" if ok else "unavailable"
+        print(f"[Startup] TTS engine {state} after {(time.perf_counter() - self.started) * 1000:.0f} ms "
+              f"(load {self.tts_service.load_s * 1000:.0f} ms)")
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.first_paint_s is None:
+            self.first_paint_s = time.perf_counter() - self.started
+            print(f"[Startup] First paint after {self.first_paint_s * 1000:.0f} ms")
+
     def toggle_mute(self):
         """Toggle mute state for TTS"""
         self.is_muted = not self.is_muted
@@ -602,4 +753,22 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         self.price_monitor.stop()
+        self.alert_worker.stop()
+        self.conflator.stop()
+        if self.tick_recorder:
+            self.tick_recorder.close()
+            print(f"[Recorder] {self.tick_recorder.records_written} ticks written to {self.tick_recorder.path}")
+        stats = self.conflator.stats()
+        print(f"[Conflation] {stats['ticks']} ticks -> {stats['windows']} UI updates ({stats['coalesced']} coalesced)")
+        print(f"[Ingest Queue] max depth {stats['queue_max_depth']}, {stats['dropped_windows']} windows "
+              f"({stats['dropped_ticks']} ticks) merged, producer blocked {stats['blocked']} times")
+        self.tts_service.prefetcher.stop()
+        cache = self.tts_service.cache_stats()
+        spoken = cache["hits"] + cache["misses"]
+        if spoken:
+            print(f"[TTS Cache] {cache['hits']}/{spoken} alerts played from cache "
+                  f"({100.0 * cache['hits'] / spoken:.0f}%), {cache['prefetched']} phrases prefetched "
+                  f"using {cache['cpu_s']:.1f}s CPU ({cache['busy_s']:.1f}s wall)")
+        if self.latency.histograms():
+            print(self.latency.dump())
         super().closeEvent(event)
@@ -0,0 +1,25 @@
+"""
+Spoken text for price alerts.
+Kept free of Qt so it can be built off the GUI thread.
+"""
+from utils.korean_numbers import number_to_korean
+
+
+def crossing_text(language, price, direction):
+    """Announcement for the price crossing a level ("UP" or "DOWN")."""
+    price_int = int(price)
+    up = direction == "UP"
+
+    if language == "Korean":
+        # Convert number to Korean text for proper pronunciation
+        price_korean = number_to_korean(price_int)
+        return f"{price_korean}달러를 돌파했습니다." if up else f"{price_korean}달러가 깨어졌습니다."
+    elif language == "English":
+        return f"Bitcoin passed {price_int} dollars." if up else f"Bitcoin dropped below {price_int} dollars."
+    elif language == "Spanish":
+        return f"Bitcoin superó los {price_int} dólares." if up else f"Bitcoin cayó por debajo de los {price_int} dólares."
+    elif language == "Portuguese":
+        return f"O Bitcoin ultrapassou {price_int} dólares." if up else f"O Bitcoin caiu abaixo de {price_int} dólares."
+    elif language == "French":
+        return f"Le Bitcoin a dépassé {price_int} dollars." if up else f"Le Bitcoin est tombé sous {price_int} dollars."
+    return ""
@@ -11,7 +11,22 @@ DEFAULT_SETTINGS = {
     "language": "Korean",
     "always_on_top": True,
     "muted": False,
-    "ticker_mode": False
+    "ticker_mode": False,
+    "conflation_ms": 50,  # Max one UI price update per this many ms (0 = off)
+    "ingest_queue_size": 256,  # Max conflated windows waiting for the GUI thread
+    "ingest_policy": "drop_oldest",  # drop_oldest / keep_latest / block
+    "ws_endpoint": "wss://stream.binance.com:9443",  # Point at the local stand-in for load tests
+    "rest_endpoint": "https://api.binance.com",  # aggTrades backfill after reconnects
+    "stream_type": "trade",  # trade / aggTrade / bookTicker / miniTicker
+    "hub_address": "",  # Local price hub socket (core.price_hub); empty = connect to Binance directly
+    "aggregate_crossings": False,  # One alert per gap move instead of one per crossed boundary
+    "alert_rules": [],  # Extra alerts (core.alert_rules), e.g. {"type": "level", "price": 100000}
+    "adaptive_interval": False,  # Scale the interval with realized volatility
+    "alerts_per_minute": 4,  # Target alert rate for adaptive_interval
+    "prefetch_alerts": True,  # Synthesize the nearest boundaries' alerts before they are crossed
+    "ort_session_options": {},  # ONNX Runtime tuning, see services.helper.DEFAULT_SESSION_OPTIONS
+    "ort_optimized_cache": True,  # Reuse the optimized TTS graphs saved in cache/ort
+    "warm_up_tts": True  # Run sample alerts through the TTS engine once it is loaded
 }
 
 # Language Code Mapping (shared constant)
@@ -0,0 +1,83 @@
+import sys
+import os
+import random
+import unittest
+
+# Add src to python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.append(src_dir)
+
+from core.adaptive_interval import AdaptiveInterval, nice_interval
+from core.interval_logic import IntervalTracker
+
+
+def random_walk(sigma, seconds, rng, start=50000.0, ticks_per_s=4):
+    """(time, price) of a random walk with volatility sigma USD/sqrt(s)."""
+    price, step = start, sigma / ticks_per_s ** 0.5
+    for i in range(int(seconds * ticks_per_s)):
+        price += rng.gauss(0, step)
+        yield i / ticks_per_s, price
+
+
+class TestAdaptiveInterval(unittest.TestCase):
+    def _run(self, tracker, adaptive, path):
+        alerts = []
+        tracker.interval_crossed.connect(lambda p, d: alerts.append(t))
+        for t, price in path:
+            if adaptive:
+                adaptive.process_price(price, t)
+            tracker.process_price(price)
+        return alerts
+
+    def test_nice_interval(self):
+        self.assertEqual([nice_interval(x) for x in (0.7, 1, 1.5, 2.2, 3, 19.4, 26, 60, 700, 5000)],
+                         [1, 1, 2, 2.5, 5, 20, 50, 100, 1000, 5000])
+
+    def test_warmup_keeps_base_interval(self):
+        tracker = IntervalTracker(50.0)
+        adaptive = AdaptiveInterval(tracker, alerts_per_minute=4, warmup_s=60)
+        self._run(tracker, adaptive, random_walk(20.0, 59, random.Random(1)))
+        self.assertIsNone(adaptive.volatility)
+        self.assertEqual(tracker.interval, 50.0)
+
+    def test_holds_target_rate_across_regimes(self):
+        """Calm, then a fast market 10x as volatile, then calm again."""
+        rng = random.Random(3)
+        calm = list(random_walk(2.0, 3600, rng))
+        fast = [(t + 3600, p) for t, p in random_walk(20.0, 3600, rng, start=calm[-1][1])]
+        calm2 = [(t + 7200, p) for t, p in random_walk(2.0, 3600, rng, start=fast[-1][1])]
+
+        fixed = IntervalTracker(50.0)
+        fixed_alerts = self._run(fixed, None, calm + fast + calm2)
+
+        tracker = IntervalTracker(50.0)
+        adaptive = AdaptiveInterval(tracker, alerts_per_minute=4)
+        changes = []
+        adaptive.interval_changed.connect(lambda i: changes.append(i))
+        alerts = self._run(tracker, adaptive, calm + fast + calm2)
+
+        def per_min(times, start, end):
+            return sum(start <= t < end for t in times) / ((end - start) / 60)
+
+        # A fixed interval floods the fast market...
+        self.assertGreater(per_min(fixed_alerts, 4200, 7200), 20)
+        # ...the adaptive one stays around the target in every regime
+        for start, end in ((1200, 3600), (4200, 7200), (9000, 10800)):
+            self.assertLess(per_min(alerts, start, end), 4 * 2)
+            self.assertGreater(per_min(alerts, start, end), 4 / 8)
+        self.assertGreaterEqual(max(changes), 500.0)
+        self.assertLessEqual(tracker.interval, 100.0)
+        # No flapping between neighbouring steps
+        self.assertLess(len(changes), 20)
+
+    def test_set_base(self):
+        tracker = IntervalTracker(50.0)
+        adaptive = AdaptiveInterval(tracker)
+        adaptive.set_base(200)
+        self.assertEqual(tracker.interval, 200.0)
+        self.assertEqual((adaptive.min_interval, adaptive.max_interval), (20.0, 10000.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
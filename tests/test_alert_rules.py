@@ -0,0 +1,145 @@
+import sys
+import os
+import bisect
+import random
+import unittest
+
+# Add src to python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.append(src_dir)
+
+from core.alert_rules import (GridRule, LevelRule, PercentRule, RangeBreakoutRule, RuleEngine,
+                              _SortedLevels, make_rule, make_rules)
+from core.interval_logic import IntervalTracker
+from simulator.price_paths import make_path
+
+
+def naive_levels(rules, prices):
+    """O(n) per tick reference: check every level rule against every move."""
+    events = []
+    alive = list(rules)
+    side = {id(r): (prices[0] > r.price) - (prices[0] < r.price) or None for r in rules}
+    for prev, price in zip(prices, prices[1:]):
+        hits = []
+        for rule in alive:
+            now = (price > rule.price) - (price < rule.price)
+            if now == 0:
+                continue
+            if side[id(rule)] is not None and side[id(rule)] != now:
+                direction = "UP" if now > 0 else "DOWN"
+                if rule.fires(direction):
+                    hits.append((rule.price, direction, rule))
+            side[id(rule)] = now
+        hits.sort(key=lambda h: h[0], reverse=price < prev)
+        for level, direction, rule in hits:
+            events.append((rule.name, level, direction))
+            if rule.once:
+                alive.remove(rule)
+    return events
+
+
+class TestRuleEngine(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+
+    def _engine(self, rules, **kwargs):
+        engine = RuleEngine(rules, **kwargs)
+        engine.rule_triggered.connect(lambda rule, level, d: self.events.append((rule.name, level, d)))
+        return engine
+
+    def test_levels_match_naive_scan(self):
+        rng = random.Random(4)
+        path = make_path("gap_jump", step=5.0, gap=120.0, gap_prob=0.02, seed=4)
+        prices = [round(path.next_price()) if i % 4 else round(path.next_price(), 1) for i in range(3000)]
+        rules = [LevelRule(round(rng.uniform(min(prices), max(prices))), rng.choice((None, "UP", "DOWN")),
+                           once=rng.random() < 0.2, name=f"r{i}") for i in range(300)]
+        engine = self._engine(rules)
+        for price in prices:
+            engine.process_price(price)
+        self.assertEqual(self.events, naive_levels(rules, prices))
+        self.assertGreater(len(self.events), 100)
+
+    def test_grids_match_interval_tracker(self):
+        path = make_path("gap_jump", step=10.0, gap=400.0, gap_prob=0.02, seed=2)
+        prices = [round(path.next_price() / 25) * 25 if i % 3 else path.next_price() for i in range(3000)]
+        engine = self._engine([GridRule(50.0, name="50"), GridRule(100.0, name="100")], grid_band=3)
+        for interval in (50.0, 100.0):
+            tracker = IntervalTracker(interval)
+            expected = []
+            tracker.interval_crossed.connect(lambda p, d: expected.append((p, d)))
+            for price in prices:
+                tracker.process_price(price)
+            setattr(self, f"expected_{int(interval)}", expected)
+        for price in prices:
+            engine.process_price(price)
+        self.assertEqual([(p, d) for n, p, d in self.events if n == "50"], self.expected_50)
+        self.assertEqual([(p, d) for n, p, d in self.events if n == "100"], self.expected_100)
+
+    def test_gap_move_fires_in_price_order(self):
+        engine = self._engine([LevelRule(100, name="a"), GridRule(30.0, name="g"), LevelRule(160, name="b")])
+        engine.process_price(95)
+        engine.process_price(170)
+        self.assertEqual(self.events, [("a", 100.0, "UP"), ("g", 120.0, "UP"), ("g", 150.0, "UP"),
+                                       ("b", 160.0, "UP")])
+
+    def test_percent_steps(self):
+        engine = self._engine([PercentRule(1.0, name="p")])
+        for price in (100.0, 100.5, 101.5, 104.5, 103.0):
+            engine.process_price(price)
+        levels = [(round(level, 4), d) for _, level, d in self.events]
+        # 104.5 covers three steps at once; 103.0 is 1% below the last one
+        self.assertEqual(levels, [(101.0, "UP"), (102.01, "UP"), (103.0301, "UP"), (104.0604, "UP"),
+                                  (103.0198, "DOWN")])
+
+    def test_percent_without_rebase_fires_once(self):
+        engine = self._engine([PercentRule(2.0, reference=100.0, rebase=False, name="p")])
+        for price in (100.0, 103.0, 101.0, 103.0, 97.0, 99.0, 97.0):
+            engine.process_price(price)
+        self.assertEqual([(level, d) for _, level, d in self.events], [(102.0, "UP"), (98.0, "DOWN")])
+
+    def test_range_breakout(self):
+        engine = self._engine([RangeBreakoutRule(3.0, name="3s")])
+        for t, price in enumerate((100, 102, 99, 101, 103, 104, 101, 104.5)):
+            engine.process_price(price, now=float(t))
+        # 103 breaks the 102 high; 104 is still out of that range; 101 re-arms; 104.5 breaks 104
+        self.assertEqual(self.events, [("3s", 102.0, "UP"), ("3s", 104.0, "UP")])
+
+        # After a gap the range needs a full window of prices again
+        for t, price in ((30, 98.0), (31, 98.5), (32, 90.0), (33, 99.0), (34, 98.2), (35, 89.0)):
+            engine.process_price(price, now=float(t))
+        self.assertEqual(self.events[2:], [("3s", 90.0, "DOWN")])
+
+    def test_level_index_under_churn(self):
+        """Removals and inserts (once rules, percent rebases) go through the dead marks and side list."""
+        rng = random.Random(7)
+        side = _SortedLevels(sorted(((float(rng.randrange(100)), object()) for _ in range(200)),
+                                    key=lambda e: e[0]))
+        model = list(zip(side.levels, side.owners))  # Sorted list kept the slow way
+        for _ in range(3000):
+            if model and rng.random() < 0.5:
+                level, rule = model.pop(rng.randrange(len(model)))
+                side.remove(level, rule)
+            else:
+                entry = (float(rng.randrange(100)), object())
+                model.insert(bisect.bisect_right([e[0] for e in model], entry[0]), entry)
+                side.insert(*entry)
+            lo, hi = sorted(rng.randrange(100) for _ in range(2))
+            self.assertEqual(side.between(lo, True, hi, False), [e for e in model if lo <= e[0] < hi])
+        self.assertLess(len(side.levels) + len(side.new_levels), 2 * len(model) + 100)
+
+    def test_make_rule(self):
+        rule = make_rule({"type": "level", "price": 100000, "direction": "UP"})
+        self.assertIsInstance(rule, LevelRule)
+        self.assertEqual(rule.direction, "UP")
+        with self.assertRaises(ValueError):
+            make_rule({"type": "fibonacci"})
+
+    def test_make_rules_skips_bad_specs(self):
+        rules = make_rules([{"type": "fibonacci"}, {"type": "level", "price": "high"}, {"type": "grid"},
+                            {"type": "percent", "percent": -1}, "level", {"type": "grid", "interval": 1000}])
+        self.assertEqual([type(r) for r in rules], [GridRule])
+
+
+if __name__ == '__main__':
+    unittest.main()
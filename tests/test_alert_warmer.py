@@ -0,0 +1,139 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+# Add src to python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.append(src_dir)
+
+from core.alert_warmer import AlertWarmer
+from core.interval_logic import IntervalTracker
+from services.speech_prefetcher import SpeechPrefetcher
+
+
+class TestAlertWarmer(unittest.TestCase):
+    def setUp(self):
+        self.tracker = IntervalTracker(50.0)
+        self.requests = []
+        self.warmer = AlertWarmer(self.tracker, lambda b, d: (b, d), self.requests.append)
+
+    def test_nearest_boundaries_first(self):
+        self.warmer.process_price(1010.0)
+        self.assertEqual(self.requests, [[(1000.0, "DOWN"), (1050.0, "UP"), (950.0, "DOWN"), (1100.0, "UP")]])
+
+    def test_on_a_boundary_both_directions(self):
+        self.assertEqual(self.warmer.boundaries(1000.0)[:2], [(1000.0, "UP"), (1000.0, "DOWN")])
+
+    def test_only_when_the_interval_cell_changes(self):
+        for price in (1010.0, 1020.0, 1049.0, 1051.0, 1060.0):
+            self.warmer.process_price(price)
+        self.assertEqual(len(self.requests), 2)
+        self.tracker.set_interval(100.0)
+        self.warmer.process_price(1060.0)
+        self.assertEqual(self.requests[-1][:2], [(1100.0, "UP"), (1000.0, "DOWN")])
+        self.warmer.refresh()
+        self.warmer.process_price(1060.0)
+        self.assertEqual(len(self.requests), 4)
+
+    def test_every_crossing_was_warmed(self):
+        """Whatever the tracker announces was requested before the crossing."""
+        warmed = set()
+        warmer = AlertWarmer(self.tracker, lambda b, d: (b, d), warmed.update)
+        missed = []
+        self.tracker.interval_crossed.connect(lambda p, d: missed.append((p, d)) if (p, d) not in warmed else None)
+        for price in (1010, 1040, 1060, 1049, 1000, 990, 1000, 1010, 1101, 1099):
+            self.tracker.process_price(float(price))
+            warmer.process_price(float(price))
+        self.assertEqual(missed, [])
+
+
+class TestSpeechPrefetcher(unittest.TestCase):
+    def setUp(self):
+        self.cache = set()
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+        def synthesize(key):
+            self.calls.append(key)
+            self.release.wait(2)
+            time.sleep(0.01)
+            self.cache.add(key)
+            return True
+
+        self.prefetcher = SpeechPrefetcher(synthesize, self.cache.__contains__)
+        self.prefetcher.start()
+
+    def tearDown(self):
+        self.release.set()
+        self.prefetcher.stop()
+
+    def _settle(self):
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            stats = self.prefetcher.stats()
+            if not stats["wanted"] and self.prefetcher._inflight is None:
+                return
+            time.sleep(0.005)
+
+    def test_skips_cached_and_keeps_order(self):
+        self.cache.add("b")
+        self.prefetcher.want(["a", "b", "c"])
+        self._settle()
+        self.assertEqual(self.calls, ["a", "c"])
+        self.assertEqual(self.prefetcher.prefetched, 2)
+
+    def test_idle_while_live_synthesis_runs(self):
+        self.prefetcher.live_started()
+        self.prefetcher.want(["a"])
+        time.sleep(0.05)
+        self.assertEqual(self.calls, [])
+        self.prefetcher.live_finished()
+        self._settle()
+        self.assertEqual(self.calls, ["a"])
+
+    def test_live_synthesis_interrupts_inflight_prefetch(self):
+        stop = threading.Event()
+
+        def synthesize(key):
+            self.calls.append(key)
+            if stop.wait(2 if len(self.calls) == 1 else 0.01):  # Only the first one runs long
+                stop.clear()
+                return False  # Aborted, like an ORT run with terminate set
+            self.cache.add(key)
+            return True
+
+        prefetcher = SpeechPrefetcher(synthesize, self.cache.__contains__, interrupt=stop.set)
+        prefetcher.start()
+        try:
+            prefetcher.want(["a", "b"])
+            while not self.calls:
+                time.sleep(0.001)
+            prefetcher.live_started()
+            time.sleep(0.05)
+            self.assertEqual(self.calls, ["a"])  # Stopped, and nothing new while live
+            prefetcher.live_finished()
+            deadline = time.monotonic() + 2
+            while len(self.cache) < 2 and time.monotonic() < deadline:
+                time.sleep(0.005)
+            self.assertEqual(self.calls, ["a", "a", "b"])  # Retried first
+            self.assertEqual((prefetcher.interrupted, prefetcher.failed), (1, 0))
+        finally:
+            prefetcher.stop()
+
+    def test_wait_for_inflight(self):
+        self.release.clear()
+        self.prefetcher.want(["a"])
+        while not self.calls:
+            time.sleep(0.001)
+        self.assertFalse(self.prefetcher.wait_for("b"))
+        threading.Timer(0.05, self.release.set).start()
+        self.assertTrue(self.prefetcher.wait_for("a"))
+        self.assertIn("a", self.cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
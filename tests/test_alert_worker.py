@@ -0,0 +1,89 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+# Add src to python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.append(src_dir)
+
+from PyQt6.QtCore import QCoreApplication, Qt, QTimer
+
+from core.alert_worker import AlertWorker
+from core.interval_logic import IntervalTracker
+from core.tick_conflator import TickConflator
+
+
+class TestAlertWorker(unittest.TestCase):
+    def _worker(self, interval=10.0):
+        tracker = IntervalTracker(interval)
+        worker = AlertWorker([tracker])
+        events = []
+        tracker.interval_crossed.connect(lambda p, d: events.append((p, d)), Qt.ConnectionType.DirectConnection)
+        return tracker, worker, events
+
+    def test_order_and_calls(self):
+        tracker, worker, events = self._worker()
+        worker.start()
+        worker.push_path([95.0, 105.0, 95.0])
+        worker.call(tracker.set_interval, 50.0)  # Takes effect after the prices above
+        for price in (115.0, 125.0, 145.0):  # 120 and 140 are no longer boundaries
+            worker.push(price)
+        worker.stop()
+        self.assertEqual(events, [(100.0, "UP"), (100.0, "DOWN"), (100.0, "UP")])
+        self.assertEqual(worker.prices_total, 6)
+
+    def test_error_does_not_stop_worker(self):
+        _, worker, events = self._worker()
+        worker.start()
+        worker.call(lambda: 1 / 0)
+        worker.push_path([95.0, 105.0])
+        worker.stop()
+        self.assertEqual(events, [(100.0, "UP")])
+
+    def test_blocked_gui_does_not_delay_alerts(self):
+        app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+        def run(block_s):
+            """Push a crossing every 10ms from a feed thread while the event loop sleeps block_s."""
+            tracker, worker, _ = self._worker()
+            alert_lag, display_lag = [], []
+            tracker.interval_crossed.connect(
+                lambda p, d: alert_lag.append(time.perf_counter() - worker.origin[0]),
+                Qt.ConnectionType.DirectConnection)
+            conflator = TickConflator(interval_ms=0)
+            conflator.window_ready.connect(lambda w: display_lag.append(time.perf_counter() - w.last_stamp))
+
+            def feed():
+                for i in range(40):
+                    now = time.perf_counter()
+                    worker.push(105.0 if i % 2 else 95.0, now)
+                    conflator.push(0.0, now)
+                    time.sleep(0.01)
+
+            worker.start()
+            feeder = threading.Thread(target=feed)
+            QTimer.singleShot(0, feeder.start)
+            QTimer.singleShot(20, lambda: time.sleep(block_s))  # A stuck dialog or repaint
+            QTimer.singleShot(600, app.quit)
+            app.exec()
+            feeder.join()
+            worker.stop()
+            return alert_lag, display_lag
+
+        idle_alerts, _ = run(0.0)
+        blocked_alerts, blocked_display = run(0.3)
+
+        self.assertEqual(len(idle_alerts), 39)
+        self.assertEqual(len(blocked_alerts), 39)
+        # The GUI really was stuck...
+        self.assertGreater(max(blocked_display), 0.15)
+        # ...but alert latency did not change
+        self.assertLess(max(blocked_alerts), 0.05)
+        self.assertLess(max(blocked_alerts), max(idle_alerts) + 0.02)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+import numpy as np
+
+# Add src to python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.append(src_dir)
+
+from services.audio_sink import StreamingSink, wav_bytes
+from test_tts_helper import fake_style, fake_tts
+
+
+class TestStreamingSink(unittest.TestCase):
+    def setUp(self):
+        self.played = []
+        self.sink = StreamingSink(100, lambda samples, sr: self.played.append((len(samples), time.perf_counter())))
+
+    def _play_in_background(self):
+        thread = threading.Thread(target=self.sink.play)
+        thread.start()
+        return thread
+
+    def test_plays_buffers_as_they_arrive(self):
+        player = self._play_in_background()
+        self.sink.write(np.zeros(3))
+        time.sleep(0.05)
+        self.assertEqual([n for n, _ in self.played], [3])  # Before the stream is closed
+        self.sink.write(np.zeros(5))
+        self.sink.close()
+        player.join(1)
+        self.assertFalse(player.is_alive())
+        self.assertEqual([n for n, _ in self.played], [3, 5])
+
+    def test_cancel(self):
+        self.sink.write(np.zeros(3))
+        self.sink.cancel()
+        self.sink.write(np.zeros(5))
+        self.sink.play(timeout=1)
+        self.assertEqual(self.played, [])
+        self.assertIsNone(self.sink.first_audio_ns)
+
+    def test_wav_bytes(self):
+        data = wav_bytes(np.zeros(10, dtype=np.float32), 44100)
+        self.assertEqual(data[:4], b"RIFF")
+        self.assertEqual(len(data), 44 + 10 * 2)
+
+    def test_first_audio_after_first_chunk(self):
+        """Streaming three sentences: playback starts after one chunk, not three."""
+        tts = fake_tts()
+        step_s = 0.01
+        run = tts.vector_est_ort.run
+        tts.vector_est_ort.run = lambda *args: (time.sleep(step_s), run(*args))[1]
+        text = "Bitcoin passed 95000 dollars. It is up 3 percent today. Volume is rising fast."
+
+        start = time.perf_counter()
+        player = self._play_in_background()
+        chunks = 0
+        for wav, _ in tts.stream(text, "en", fake_style(), total_step=5, max_len=40):
+            self.sink.write(wav.reshape(-1))
+            chunks += 1
+        self.sink.close()
+        total = time.perf_counter() - start
+        player.join(1)
+
+        self.assertEqual(chunks, 3)
+        self.assertEqual(len(self.played), 3)
+        first_audio = self.played[0][1] - start
+        self.assertLess(first_audio, total / 2)
+        self.assertGreaterEqual(first_audio, 5 * step_s)
+
+
+if __name__ == '__main__':
+    unittest.main()
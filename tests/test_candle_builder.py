@@ -0,0 +1,50 @@
+import sys
+import os
+import unittest
+
+# Add src to python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.append(src_dir)
+
+from core.candle_builder import CandleBuilder
+from core.trade_decoder import Tick
+
+
+class TestCandleBuilder(unittest.TestCase):
+    def setUp(self):
+        self.builder = CandleBuilder(timeframes={"1s": 1000, "1m": 60_000}, history=4)
+        self.closed = []
+        self.builder.bar_closed.connect(lambda tf, bar: self.closed.append((tf, bar)))
+
+    def test_ohlcv_and_close_event(self):
+        for t, p, q in [(0, 100.0, 1.0), (200, 105.0, 2.0), (400, 95.0, 1.0), (999, 98.0, 0.5)]:
+            self.builder.add(t, p, q)
+        self.assertEqual(self.closed, [])
+
+        self.builder.add(1000, 99.0, 1.0)
+        self.assertEqual(len(self.closed), 1)
+        tf, bar = self.closed[0]
+        self.assertEqual(tf, "1s")
+        self.assertEqual((bar.open_time, bar.open, bar.high, bar.low, bar.close, bar.volume, bar.trades),
+                         (0, 100.0, 105.0, 95.0, 98.0, 4.5, 4))
+        self.assertEqual(self.builder.current("1s").open, 99.0)
+        self.assertEqual(self.builder.current("1m").trades, 5)
+
+    def test_gap_produces_no_empty_bars(self):
+        self.builder.add(0, 100.0, 1.0)
+        self.builder.add(5500, 101.0, 1.0)
+        self.assertEqual([b.open_time for _, b in self.closed], [0])
+        self.assertEqual(self.builder.current("1s").open_time, 5000)
+
+    def test_bars_view_wraps(self):
+        for i in range(10):
+            self.builder.append(Tick("btcusdt", 100.0 + i, 1.0, i * 1000, i))
+        bars = self.builder.bars("1s")
+        self.assertEqual(list(bars["open"]), [105.0, 106.0, 107.0, 108.0])
+        self.assertEqual(self.builder.closed_count("1s"), 9)
+        self.assertEqual(len(self.builder.bars("1m")), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
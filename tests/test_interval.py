@@ -1,6 +1,7 @@
 import sys
 import os
 import unittest
+import numpy as np
 
 # Add src to python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,6 +9,7 @@ src_dir = os.path.join(os.path.dirname(current_dir), 'src')
 sys.path.append(src_dir)
 
 from core.interval_logic import IntervalTracker
+from simulator.price_paths import make_path
 
 class TestIntervalLogic(unittest.TestCase):
     def setUp(self):
@@ -37,6 +39,162 @@ class TestIntervalLogic(unittest.TestCase):
         self.assertEqual(self.events[0], (9450.0, "UP"))
         self.assertEqual(self.events[1], (9500.0, "UP"))
 
+    def test_equal_price_keeps_approach_side(self):
+        self.tracker.process_price(9440) # Init
+        self.tracker.process_price(9450) # Touch 9450 from below
+        self.tracker.process_price(9440) # Back down: never crossed
+        self.assertEqual(self.events, [])
+
+        self.tracker.process_price(9450)
+        self.tracker.process_price(9460) # Through 9450 via the touch
+        self.assertEqual(self.events, [(9450.0, "UP")])
+
+    def test_first_touch_then_through(self):
+        self.tracker.process_price(9440) # Init
+        self.tracker.process_price(9450) # First visit lands exactly on 9450
+        self.tracker.process_price(9460)
+        self.assertEqual(self.events, [(9450.0, "UP")])
+
+    def test_starting_on_boundary(self):
+        self.tracker.process_price(9450) # Init exactly on a boundary
+        self.tracker.process_price(9460)
+        self.assertEqual(self.events, [])
+        self.tracker.process_price(9440)
+        self.assertEqual(self.events, [(9450.0, "DOWN")])
+
+
+class TestGapMoves(unittest.TestCase):
+    # Liquidation-cascade style trades: several $10 intervals per trade
+    CASCADE = [95012.5, 95008.0, 94961.3, 94955.0, 94870.2, 94871.0, 94790.0, 94900.0, 94899.9]
+
+    def setUp(self):
+        self.events = []
+
+    def _tracker(self, interval, aggregate=False):
+        tracker = IntervalTracker(interval=interval, aggregate=aggregate)
+        tracker.interval_crossed.connect(lambda p, d: self.events.append((p, d)))
+        tracker.interval_jumped.connect(lambda *args: self.events.append(args))
+        return tracker
+
+    def test_every_boundary_in_order(self):
+        tracker = self._tracker(10.0)
+        tracker.process_price(95012.5)
+        tracker.process_price(94961.3)
+        self.assertEqual(self.events, [(b, "DOWN") for b in (95010.0, 95000.0, 94990.0, 94980.0, 94970.0)])
+
+    def test_cascade_matches_reference(self):
+        tracker = self._tracker(10.0)
+        for price in self.CASCADE:
+            tracker.process_price(price)
+        self.assertEqual(self.events, reference_crossings(self.CASCADE, 10.0))
+        # 94790 -> 94900 only touches 94900, so it is not announced
+        self.assertEqual(self.events[-2:], [(94880.0, "UP"), (94890.0, "UP")])
+
+    def test_gap_jump_path_matches_reference(self):
+        path = make_path("gap_jump", step=3.0, gap=125.0, gap_prob=0.05, seed=7)
+        prices = [round(path.next_price(), 1) for _ in range(2000)]
+        for interval in (10.0, 50.0):
+            self.events = []
+            tracker = self._tracker(interval)
+            for price in prices:
+                tracker.process_price(price)
+            self.assertEqual(self.events, reference_crossings(prices, interval))
+
+    def test_aggregate_mode(self):
+        tracker = self._tracker(10.0, aggregate=True)
+        tracker.process_price(95012.5)
+        tracker.process_price(95008.0) # Single crossing: normal event
+        tracker.process_price(94961.3) # Gap move: one aggregated event
+        self.assertEqual(self.events, [(95010.0, "DOWN"), (95000.0, 94970.0, "DOWN", 4)])
+
+
+class TestBoundedState(unittest.TestCase):
+    def test_soak_bounded_and_unchanged(self):
+        """Long drifting walk at a $1 interval: same alerts, bounded state."""
+        path = make_path("gap_jump", step=2.0, gap=40.0, gap_prob=0.002, seed=3)
+        bounded = IntervalTracker(interval=1.0, window=8)
+        unbounded = IntervalTracker(interval=1.0, window=None)
+        events = {id(bounded): [], id(unbounded): []}
+        for tracker in (bounded, unbounded):
+            tracker.interval_crossed.connect(lambda p, d, out=events[id(tracker)]: out.append((p, d)))
+
+        max_states = 0
+        for i in range(100000):
+            price = round(path.next_price() + i * 0.05, 2)
+            bounded.process_price(price)
+            unbounded.process_price(price)
+            max_states = max(max_states, len(bounded.boundary_states))
+
+        self.assertEqual(events[id(bounded)], events[id(unbounded)])
+        self.assertGreater(len(events[id(bounded)]), 10000)
+        self.assertLessEqual(max_states, 4 * 8 + 4)
+        self.assertGreater(len(unbounded.boundary_states), 4000)
+        self.assertTrue(all(isinstance(k, int) for k in bounded.boundary_states))
+
+
+class TestBatch(unittest.TestCase):
+    def _stream(self, tracker, prices):
+        events = []
+        tracker.interval_crossed.connect(lambda p, d: events.append((i, p, d)))
+        for i, price in enumerate(prices):
+            tracker.process_price(price)
+        return events
+
+    def _batch(self, tracker, prices):
+        return [(int(e["tick"]), float(e["boundary"]), "UP" if e["direction"] > 0 else "DOWN")
+                for e in tracker.process_prices(np.array(prices))]
+
+    def _prices(self, interval, seed):
+        # Many prices land exactly on boundaries and repeat
+        path = make_path("gap_jump", step=interval, gap=7 * interval, gap_prob=0.05, seed=seed)
+        return [round(path.next_price() / (interval / 2)) * (interval / 2) if i % 3 else round(path.next_price(), 2)
+                for i in range(3000)]
+
+    def test_matches_streaming(self):
+        for interval in (0.1, 1.0, 10.0, 50.0):
+            prices = self._prices(interval, seed=int(interval * 10))
+            self.assertEqual(self._batch(IntervalTracker(interval), prices),
+                             self._stream(IntervalTracker(interval), prices), interval)
+
+    def test_continues_streaming_state(self):
+        prices = self._prices(10.0, seed=5)
+        expected = self._stream(IntervalTracker(10.0), prices)
+
+        tracker = IntervalTracker(10.0)
+        events = []
+        tracker.interval_crossed.connect(lambda p, d: events.append((i, p, d)))
+        for i in range(0, 1000):
+            tracker.process_price(prices[i])
+        events += [(t + 1000, p, d) for t, p, d in self._batch(tracker, prices[1000:2000])]
+        for i in range(2000, len(prices)):
+            tracker.process_price(prices[i])
+        self.assertEqual(events, expected)
+
+    def test_starting_on_boundary(self):
+        tracker = IntervalTracker(50.0)
+        self.assertEqual(self._batch(tracker, [9450, 9450, 9460, 9440]), [(3, 9450.0, "DOWN")])
+        self.assertEqual(len(tracker.process_prices(np.array([]))), 0)
+
+
+def reference_crossings(prices, interval):
+    """Brute force: track every boundary in the whole price range after each trade."""
+    lo = int(min(prices) // interval) - 1
+    hi = int(max(prices) // interval) + 2
+    boundaries = [k * interval for k in range(lo, hi)]
+    side = {b: (prices[0] > b) - (prices[0] < b) or None for b in boundaries}
+    events = []
+    for prev, price in zip(prices, prices[1:]):
+        ordered = boundaries if price >= prev else boundaries[::-1]
+        for b in ordered:
+            now = (price > b) - (price < b)
+            if now == 0:
+                continue
+            if side[b] is not None and side[b] != now:
+                events.append((b, "UP" if now > 0 else "DOWN"))
+            side[b] = now
+    return events
+
+
 if __name__ == '__main__':
     # Initializing QApplication is needed for Signals to work? 
     # Actually pyqtSignal usually needs a QObject living in a QThread or just QCoreApplication. 
@@ -0,0 +1,66 @@
+import sys
+import os
+import random
+import unittest
+
+# Add src to python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.append(src_dir)
+
+from core.latency import LatencyHistogram, LatencyRecorder
+from core.tick_conflator import TickConflator
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_bucket_precision(self):
+        rng = random.Random(3)
+        values = sorted(int(rng.lognormvariate(9, 1.5)) for _ in range(20000))
+        hist = LatencyHistogram()
+        for v in values:
+            hist.record(v)
+        for q in (50, 90, 99, 99.9):
+            exact = values[int(len(values) * q / 100.0) - 1]
+            self.assertAlmostEqual(hist.percentile(q), exact, delta=exact * 0.04 + 1)
+        self.assertEqual(hist.max, values[-1])
+        self.assertLess(len(hist.counts), 1000)
+
+    def test_negative_values_clamped(self):
+        hist = LatencyHistogram()
+        hist.record(-5)
+        self.assertEqual((hist.clamped, hist.percentile(50)), (1, 0))
+
+
+class TestLatencyRecorder(unittest.TestCase):
+    def test_trace_stage_spans(self):
+        recorder = LatencyRecorder()
+        trace = recorder.trace(event_ms=1_000, recv_ns=1_002_000_000)
+        trace.mark("dispatch", 1_010_000_000)
+        trace.mark("emit", 1_010_500_000)
+        trace.mark("speak", 1_011_000_000)
+        trace.mark("cache_hit", 1_012_000_000)
+        trace.mark("play", 1_030_000_000)
+        trace.finish()
+        trace.finish()  # Only recorded once
+
+        hists = recorder.histograms()
+        self.assertEqual(hists["event -> recv"].max, 2_000)
+        self.assertEqual(hists["cache_hit -> play"].max, 18_000)
+        self.assertEqual(hists["event -> play (total)"].max, 30_000)
+        self.assertNotIn("synth_done -> play", hists)
+        self.assertEqual(recorder.traces, 1)
+        self.assertIn("event -> play (total)", recorder.dump())
+
+    def test_conflated_window_keeps_stamps(self):
+        conflator = TickConflator(interval_ms=50)
+        windows = []
+        conflator.window_ready.connect(windows.append)
+        for price, stamp in [(100.0, "a"), (90.0, "b"), (110.0, "c"), (105.0, "d")]:
+            conflator.push(price, stamp)
+        conflator.flush()
+        self.assertEqual(windows[0].stamped_path(), [(90.0, "b"), (110.0, "c"), (105.0, "d")])
+        self.assertEqual(windows[0].last_stamp, "d")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+import sys
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+# Add src to python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.append(src_dir)
+
+from PyQt6.QtCore import Qt
+
+from core.hub_protocol import HubRecordReader, PriceBoard, connect_hub, pack_record, parse_hub_address
+from core.price_hub import PriceHub
+from core.price_monitor import PriceMonitor
+from core.trade_decoder import Tick
+from simulator.binance_server import FakeBinanceServer
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestHubProtocol(unittest.TestCase):
+    def test_records_split_across_reads(self):
+        ticks = [Tick("btcusdt", 95000.5, 0.01, 1700000000000 + i, 100 + i) for i in range(3)]
+        data = b"".join(pack_record(t, 123) for t in ticks)
+        reader = HubRecordReader()
+        out = reader.feed(data[:70]) + reader.feed(data[70:100]) + reader.feed(data[100:])
+        self.assertEqual(out, ticks)
+
+    def test_address_parsing(self):
+        self.assertEqual(parse_hub_address("127.0.0.1:9560")[1], ("127.0.0.1", 9560))
+        self.assertEqual(parse_hub_address("/tmp/hub.sock")[1], "/tmp/hub.sock")
+
+    def test_path_without_unix_sockets(self):
+        """Windows: host:port still works, a socket path is a clear error."""
+        with mock.patch("core.hub_protocol.socket", SimpleNamespace(AF_INET=socket.AF_INET)):
+            self.assertEqual(parse_hub_address("127.0.0.1:9560")[0], socket.AF_INET)
+            with self.assertRaises(ValueError):
+                parse_hub_address("/tmp/hub.sock")
+
+
+class FakeUpstream:
+    """Stands in for the hub's PriceMonitor; remove_symbol blocks until released."""
+
+    def __init__(self):
+        self.symbols = set()
+        self.removing = threading.Event()
+        self.release = threading.Event()
+
+    def add_symbol(self, symbol):
+        self.symbols.add(symbol)
+
+    def remove_symbol(self, symbol):
+        self.removing.set()
+        self.release.wait(2.0)
+        self.symbols.discard(symbol)
+
+
+class TestHubSubscriptions(unittest.TestCase):
+    def test_subscribe_during_last_unsubscribe(self):
+        hub = PriceHub("127.0.0.1:0")
+        hub.monitor = FakeUpstream()
+        a = SimpleNamespace(symbols=set(), send=lambda data: None)
+        b = SimpleNamespace(symbols=set(), send=lambda data: None)
+        hub.subscribe(a, ["btcusdt"])
+        leave = threading.Thread(target=hub.unsubscribe, args=(a, ["btcusdt"]))
+        leave.start()
+        self.assertTrue(hub.monitor.removing.wait(2.0))
+        join = threading.Thread(target=hub.subscribe, args=(b, ["btcusdt"]))
+        join.start()
+        time.sleep(0.1)  # Let b's subscribe run as far as it can
+        hub.monitor.release.set()
+        leave.join()
+        join.join()
+        self.assertEqual(hub._refs, {"btcusdt": 1})
+        self.assertEqual(hub.monitor.symbols, {"btcusdt"})
+
+
+class TestPriceHub(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeBinanceServer(rate=100)
+        base_url = self.server.start()
+        tcp = not hasattr(os, "fork")
+        self.address = "127.0.0.1:0" if tcp else os.path.join(tempfile.mkdtemp(), "hub.sock")
+        self.board_name = f"bittalker_test_{os.getpid()}"
+        self.hub = PriceHub(self.address, board_name=self.board_name, base_url=base_url,
+                            rest_url=self.server.http_url)
+        self.hub.start()
+        if tcp:
+            self.hub.address = "127.0.0.1:%d" % self.hub.server.server_address[1]
+        self.monitors = []
+
+    def tearDown(self):
+        for monitor in self.monitors:
+            monitor.stop()
+        self.hub.stop()
+        self.server.stop()
+
+    def _client(self, symbol):
+        monitor = PriceMonitor(symbol, hub=self.hub.address)
+        prices = []
+        monitor.price_updated.connect(prices.append, Qt.ConnectionType.DirectConnection)
+        monitor.start()
+        self.monitors.append(monitor)
+        return monitor, prices
+
+    def test_clients_share_one_upstream_connection(self):
+        _, a = self._client("btcusdt")
+        _, b = self._client("btcusdt")
+        _, c = self._client("ethusdt")
+        self.assertTrue(wait_until(lambda: len(a) > 20 and len(b) > 20 and len(c) > 20))
+        self.assertEqual(len(self.server.clients), 1)
+        self.assertEqual(sorted(self.hub.upstream_symbols), ["btcusdt", "ethusdt"])
+
+    def test_last_subscriber_releases_symbol(self):
+        self._client("btcusdt")
+        eth, prices = self._client("ethusdt")
+        self.assertTrue(wait_until(lambda: len(prices) > 5))
+        eth.stop()
+        self.assertTrue(wait_until(lambda: self.hub.upstream_symbols == ["btcusdt"]))
+
+    def test_pinned_symbol_survives_last_subscriber(self):
+        self.hub.pin(["ethusdt"])
+        self._client("btcusdt")
+        eth, prices = self._client("ethusdt")
+        self.assertTrue(wait_until(lambda: len(prices) > 5))
+        eth.stop()
+        self.assertTrue(wait_until(lambda: self.hub.clients == 1))
+        time.sleep(0.1)
+        self.assertEqual(sorted(self.hub.upstream_symbols), ["btcusdt", "ethusdt"])
+
+    def test_no_duplicate_or_out_of_order_ticks(self):
+        monitor, _ = self._client("btcusdt")
+        ticks = []
+        monitor.tick_received.connect(ticks.append, Qt.ConnectionType.DirectConnection)
+        self.assertTrue(wait_until(lambda: len(ticks) > 50))
+        ids = [t.trade_id for t in list(ticks)]
+        self.assertEqual(ids, sorted(set(ids)))
+
+    def test_second_hub_does_not_take_over(self):
+        _, prices = self._client("btcusdt")
+        other_address = ("127.0.0.1:0" if self.address.startswith("127.") else
+                         os.path.join(tempfile.mkdtemp(), "other.sock"))
+        for address, board_name in ((self.hub.address, self.board_name + "_2"),
+                                    (other_address, self.board_name)):
+            with self.assertRaises(RuntimeError):
+                PriceHub(address, board_name=board_name, base_url="ws://127.0.0.1:1").start()
+        # The running hub keeps its socket and board
+        seen = len(prices)
+        self.assertTrue(wait_until(lambda: len(prices) > seen + 5))
+        board = PriceBoard.attach(self.board_name)
+        board.close()
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets only")
+    def test_replaces_stale_socket(self):
+        address = os.path.join(tempfile.mkdtemp(), "stale.sock")
+        stale = socket.socket(socket.AF_UNIX)
+        stale.bind(address)  # Never listens: like a hub that died
+        stale.close()
+        hub = PriceHub(address, board_name=self.board_name + "_3", base_url="ws://127.0.0.1:1")
+        hub.start()
+        try:
+            connect_hub(address).close()
+        finally:
+            hub.stop()
+
+    def test_board_has_latest_price(self):
+        monitor, prices = self._client("btcusdt")
+        self.assertTrue(wait_until(lambda: len(prices) > 5))
+        board = PriceBoard.attach(self.board_name)
+        try:
+            tick, recv_ns = board.read("btcusdt")
+            self.assertGreater(tick.price, 0)
+            self.assertGreaterEqual(tick.trade_id, monitor._last_trade["btcusdt"].trade_id - 50)
+            self.assertIsNone(board.read("dogeusdt"))
+        finally:
+            board.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+# Add src to python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.append(src_dir)
+
+from PyQt6.QtCore import Qt
+
+from core.price_monitor import PriceMonitor, RECONNECT_MAX_DELAY
+from simulator.binance_server import FakeBinanceServer, Market
+from simulator.price_paths import make_path
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestMultiSymbolMonitor(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeBinanceServer(rate=50)
+        self.base_url = self.server.start()
+        self.ticks = []
+        self.lock = threading.Lock()
+
+    def tearDown(self):
+        self.monitor.stop()
+        self.server.stop()
+
+    def _start(self, symbols):
+        self.monitor = PriceMonitor(symbols=symbols, base_url=self.base_url)
+        self.monitor.symbol_price_updated.connect(self._on_tick, Qt.ConnectionType.DirectConnection)
+        self.monitor.start()
+
+    def _on_tick(self, symbol, price):
+        with self.lock:
+            self.ticks.append((symbol, price))
+
+    def _symbols_seen(self):
+        with self.lock:
+            return {s for s, _ in self.ticks}
+
+    def test_combined_stream_demux(self):
+        self._start(["btcusdt", "ethusdt"])
+        self.assertTrue(wait_until(lambda: self._symbols_seen() == {"btcusdt", "ethusdt"}))
+        self.assertIn("/stream?streams=btcusdt@trade/ethusdt@trade", self.monitor.ws_url)
+
+    def test_add_and_remove_without_reconnect(self):
+        self._start(["btcusdt"])
+        self.assertTrue(wait_until(lambda: "btcusdt" in self._symbols_seen()))
+        ws = self.monitor.ws
+
+        self.monitor.add_symbol("ethusdt")
+        self.assertTrue(wait_until(lambda: "ethusdt" in self._symbols_seen()))
+
+        self.monitor.remove_symbol("btcusdt")
+        time.sleep(0.2)  # Let in-flight frames drain
+        with self.lock:
+            self.ticks.clear()
+        time.sleep(0.3)
+        self.assertEqual(self._symbols_seen(), {"ethusdt"})
+
+        # Same connection throughout
+        self.assertIs(self.monitor.ws, ws)
+
+    def test_empty_symbols_first_added_is_primary(self):
+        self.monitor = PriceMonitor(symbols=[], base_url=self.base_url)
+        self.assertIsNone(self.monitor.symbol)
+        self.monitor.add_symbol("ETHUSDT")
+        self.monitor.add_symbol("btcusdt")
+        self.assertEqual(self.monitor.symbol, "ethusdt")
+
+    def test_removing_primary_moves_price_updates_on(self):
+        self._start(["btcusdt", "ethusdt"])
+        prices = []
+        self.monitor.price_updated.connect(prices.append, Qt.ConnectionType.DirectConnection)
+        self.assertTrue(wait_until(lambda: len(prices) > 3))
+        self.monitor.remove_symbol("btcusdt")
+        self.assertEqual(self.monitor.symbol, "ethusdt")
+        time.sleep(0.2)  # Let in-flight frames drain
+        prices.clear()
+        self.assertTrue(wait_until(lambda: len(prices) > 3))
+        self.monitor.remove_symbol("ethusdt")
+        self.assertIsNone(self.monitor.symbol)
+
+
+    def test_frames_without_trade_id_are_not_dropped(self):
+        self.monitor = PriceMonitor("btcusdt", base_url=self.base_url)
+        prices = []
+        self.monitor.price_updated.connect(prices.append, Qt.ConnectionType.DirectConnection)
+        for price in ("95000.0", "95001.0", "95002.0"):
+            self.monitor._on_message(None, '{"s":"BTCUSDT","p":"%s","T":1700000000000}' % price)
+        self.assertEqual(prices, [95000.0, 95001.0, 95002.0])
+        # Ids still de-duplicate where the feed has them
+        for trade_id in (7, 8, 8, 6):
+            self.monitor._on_message(None, '{"e":"trade","E":1,"s":"BTCUSDT","t":%d,"p":"95003.0","q":"0.1",'
+                                           '"T":1700000000001,"m":true,"M":true}' % trade_id)
+        self.assertEqual(len(prices), 5)
+
+
+class TestStandInServer(unittest.TestCase):
+    def test_oscillation_path_crosses_boundary(self):
+        path = make_path("oscillation", boundary=95000.0, amplitude=20.0, period=20, seed=1)
+        sides = {path.next_price() > 95000.0 for _ in range(40)}
+        self.assertEqual(sides, {True, False})
+
+    def test_gap_jump_path_jumps(self):
+        path = make_path("gap_jump", step=1.0, gap=250.0, gap_prob=0.5, seed=1)
+        prices = [path.next_price() for _ in range(50)]
+        self.assertTrue(any(abs(b - a) >= 250.0 for a, b in zip(prices, prices[1:])))
+
+    def test_stream_types(self):
+        server = FakeBinanceServer(rate=200, market=Market(fills=4.0, seed=1))
+        base_url = server.start()
+        monitors, counts = [], {}
+        try:
+            for kind in ("trade", "aggTrade", "bookTicker", "miniTicker"):
+                monitor = PriceMonitor(base_url=base_url, stream_type=kind, backfill=False)
+                counts[kind] = []
+                monitor.tick_received.connect(counts[kind].append, Qt.ConnectionType.DirectConnection)
+                monitors.append(monitor)
+                monitor.start()
+            self.assertTrue(wait_until(lambda: len(counts["miniTicker"]) >= 1))
+        finally:
+            for monitor in monitors:
+                monitor.stop()
+            server.stop()
+
+        self.assertIn("/ws/btcusdt@aggTrade", monitors[1].ws_url)
+        self.assertLess(len(counts["aggTrade"]), len(counts["trade"]) / 2)
+        self.assertGreater(len(counts["bookTicker"]), len(counts["aggTrade"]))
+        # aggTrade ids are last trade ids, so they line up with the trade stream
+        trade_ids = {t.trade_id for t in counts["trade"]}
+        self.assertTrue(any(t.trade_id in trade_ids for t in counts["aggTrade"]))
+
+    def test_consecutive_trade_ids_and_scripted_drop(self):
+        server = FakeBinanceServer(rate=100)
+        monitor = PriceMonitor(base_url=server.start(), rest_url=server.http_url)
+        ids, status = [], []
+        monitor.tick_received.connect(lambda t: ids.append(t.trade_id), Qt.ConnectionType.DirectConnection)
+        monitor.connection_status.connect(status.append, Qt.ConnectionType.DirectConnection)
+        try:
+            monitor.start()
+            self.assertTrue(wait_until(lambda: len(ids) >= 20))
+            self.assertEqual(ids[:20], list(range(ids[0], ids[0] + 20)))
+
+            server.drop_clients()
+            # First retry is immediate, so the monitor may already be back up
+            self.assertTrue(wait_until(lambda: status.count(False) >= 2))
+        finally:
+            monitor.stop()
+            server.stop()
+
+
+class TestReconnectBackfill(unittest.TestCase):
+    def test_backoff_delays(self):
+        monitor = PriceMonitor(backfill=False)
+        delays = [monitor._next_reconnect_delay() for _ in range(12)]
+        self.assertEqual(delays[0], 0.0)
+        self.assertTrue(all(0 < d <= RECONNECT_MAX_DELAY for d in delays[1:]))
+        self.assertGreater(delays[-1], delays[1])
+
+    def test_backfill_fills_outage_gap(self):
+        server = FakeBinanceServer(rate=100)
+        base_url = server.start()
+        monitor = PriceMonitor(base_url=base_url, rest_url=server.http_url)
+        ids, batches = [], []
+        monitor.tick_received.connect(lambda t: ids.append(t.trade_id), Qt.ConnectionType.DirectConnection)
+        monitor.backfilled.connect(batches.append, Qt.ConnectionType.DirectConnection)
+        try:
+            monitor.start()
+            self.assertTrue(wait_until(lambda: len(ids) >= 10))
+            server.drop_clients(downtime=0.5)
+            self.assertTrue(wait_until(lambda: monitor.outage_count == 1))
+            count = len(ids)
+            self.assertTrue(wait_until(lambda: len(ids) >= count + 10))
+        finally:
+            monitor.stop()
+            server.stop()
+
+        self.assertTrue(batches and len(batches[0]) > 0)
+        # No gaps and no duplicates across the outage
+        self.assertEqual(ids, list(range(ids[0], ids[0] + len(ids))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import sys
+import os
+import unittest
+
+# Add src to python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.append(src_dir)
+
+from core.tick_conflator import TickConflator
+from core.interval_logic import IntervalTracker
+
+
+class TestTickConflator(unittest.TestCase):
+    def setUp(self):
+        self.conflator = TickConflator(interval_ms=50)
+        self.windows = []
+        self.conflator.window_ready.connect(self.windows.append)
+
+    def test_window_extremes_and_count(self):
+        for price in [100.0, 105.0, 95.0, 98.0]:
+            self.conflator.push(price)
+        self.conflator.flush()
+
+        self.assertEqual(len(self.windows), 1)
+        w = self.windows[0]
+        self.assertEqual((w.low, w.high, w.last, w.count), (95.0, 105.0, 98.0, 4))
+        self.assertEqual(w.path(), [105.0, 95.0, 98.0])
+        self.assertEqual(self.conflator.coalesced_total, 3)
+
+    def test_path_order_low_first(self):
+        for price in [100.0, 90.0, 110.0]:
+            self.conflator.push(price)
+        self.conflator.flush()
+        self.assertEqual(self.windows[0].path(), [90.0, 110.0])
+
+    def test_empty_flush_emits_nothing(self):
+        self.conflator.flush()
+        self.assertEqual(self.windows, [])
+
+    def test_disabled_passes_through(self):
+        self.conflator.set_interval(0)
+        self.conflator.push(1.0)
+        self.conflator.push(2.0)
+        self.assertEqual([w.last for w in self.windows], [1.0, 2.0])
+        self.assertEqual(self.conflator.coalesced_total, 0)
+
+    def test_push_path_keeps_order_with_live_ticks(self):
+        self.conflator.push(100.0)
+        self.conflator.push(101.0)
+        self.conflator.push_path([102.0, 99.0, 103.0])
+        self.conflator.push(104.0)
+        self.conflator.flush()
+
+        self.assertEqual([w.path() for w in self.windows], [[100.0, 101.0], [102.0, 99.0, 103.0], [104.0]])
+        self.assertEqual(self.conflator.ticks_total, 6)
+
+    def test_round_trip_crossing_is_not_lost(self):
+        tracker = IntervalTracker(interval=50.0)
+        events = []
+        tracker.interval_crossed.connect(lambda p, d: events.append((p, d)))
+        tracker.process_price(9440)
+        tracker.process_price(9441)
+
+        # Up through 9450 and back down inside one frame
+        for price in [9452, 9455, 9448, 9445]:
+            self.conflator.push(price)
+        self.conflator.flush()
+        for price in self.windows[0].path():
+            tracker.process_price(price)
+
+        self.assertEqual(events, [(9450.0, "UP"), (9450.0, "DOWN")])
+
+
+if __name__ == '__main__':
+    unittest.main()
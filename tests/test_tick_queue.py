@@ -0,0 +1,106 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+# Add src to python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.append(src_dir)
+
+from core.tick_conflator import ConflatedWindow, TickConflator
+from core.tick_queue import TickQueue
+
+
+def window(*prices):
+    return ConflatedWindow(min(prices), max(prices), prices[-1], len(prices), path=list(prices))
+
+
+class TestTickQueue(unittest.TestCase):
+    def test_drop_oldest_keeps_extremes(self):
+        q = TickQueue(maxsize=3, policy="drop_oldest")
+        for w in [window(100, 90), window(95, 120), window(101), window(102), window(103)]:
+            q.put(w)
+        self.assertEqual(len(q), 3)
+        items = q.drain()
+        # The two merges folded the first three windows into one
+        self.assertEqual(items[0].path(), [90, 120, 101])
+        self.assertEqual([w.last for w in items], [101, 102, 103])
+        self.assertEqual(sum(w.count for w in items), 7)
+        self.assertEqual(q.stats()["dropped"], 2)
+        self.assertEqual(q.stats()["max_depth"], 3)
+
+    def test_keep_latest(self):
+        q = TickQueue(policy="keep_latest")
+        for w in [window(100), window(80), window(130), window(110)]:
+            q.put(w)
+        items = q.drain()
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0].path(), [80, 130, 110])
+
+    def test_block_waits_for_consumer(self):
+        q = TickQueue(maxsize=2, policy="block", block_timeout=5.0)
+        q.put(window(1))
+        q.put(window(2))
+        waited = []
+
+        def producer():
+            start = time.monotonic()
+            q.wait_for_space()
+            waited.append(time.monotonic() - start)
+            q.put(window(3))
+
+        t = threading.Thread(target=producer)
+        t.start()
+        time.sleep(0.2)
+        self.assertEqual(waited, [])
+        self.assertEqual([w.last for w in q.drain()], [1, 2])
+        t.join(2.0)
+        self.assertGreaterEqual(waited[0], 0.15)
+        self.assertEqual(q.stats()["blocked"], 1)
+        self.assertEqual(q.stats()["dropped"], 0)
+
+    def test_block_times_out_to_merge(self):
+        q = TickQueue(maxsize=2, policy="block", block_timeout=0.05)
+        q.put(window(1))
+        q.put(window(2))
+        self.assertFalse(q.wait_for_space())
+        q.put(window(3))
+        self.assertEqual([w.path() for w in q.drain()], [[1, 2], [3]])
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            TickQueue(policy="drop_newest")
+
+
+class TestConflatorBackpressure(unittest.TestCase):
+    def test_stalled_consumer_stays_bounded(self):
+        conflator = TickConflator(interval_ms=1, queue_size=8)
+        windows = []
+        conflator.window_ready.connect(windows.append)
+
+        # Producer thread; nobody drains (GUI thread stalled)
+        prices = [100.0 + (i % 50) for i in range(400)] + [10.0, 500.0, 250.0]
+
+        def produce():
+            for price in prices:
+                conflator.push(price)
+                time.sleep(0.0005)
+
+        t = threading.Thread(target=produce)
+        t.start()
+        t.join()
+        self.assertLessEqual(len(conflator.queue), 8)
+
+        conflator.flush()
+        points = [p for w in windows for p in w.path()]
+        self.assertIn(10.0, points)
+        self.assertIn(500.0, points)
+        self.assertEqual(points[-1], 250.0)
+        self.assertEqual(sum(w.count for w in windows), len(prices))
+        self.assertGreater(conflator.stats()["dropped_windows"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import sys
+import os
+import tempfile
+import time
+import unittest
+
+# Add src to python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.append(src_dir)
+
+from PyQt6.QtCore import Qt
+
+from core.tick_recorder import TickRecorder, load_tick_log, TICK_DTYPE
+from core.replay_monitor import ReplayPriceMonitor
+from core.trade_decoder import Tick
+
+
+class TestTickRecorder(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".ticks")
+        os.close(fd)
+        self.ticks = [Tick("btcusdt", 95000.0 + i, 0.01 * (i + 1), 1700000000000 + 10 * i, i) for i in range(10)]
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def _write(self, ticks, buffer_size=4):
+        recorder = TickRecorder(self.path, buffer_size=buffer_size)
+        for i, tick in enumerate(ticks):
+            recorder.record(tick, recv_time=i)
+        recorder.close()
+        return recorder
+
+    def test_round_trip_memmap(self):
+        recorder = self._write(self.ticks)
+        self.assertEqual(recorder.records_written, 10)
+
+        records = load_tick_log(self.path)
+        self.assertEqual(records.dtype, TICK_DTYPE)
+        self.assertEqual(TICK_DTYPE.itemsize, 32)
+        self.assertEqual(len(records), 10)
+        self.assertEqual(records["price"].tolist(), [t.price for t in self.ticks])
+        self.assertEqual(records["event_time"].tolist(), [t.trade_time for t in self.ticks])
+        self.assertEqual(records["recv_time"].tolist(), list(range(10)))
+
+    def test_append_to_existing_log(self):
+        self._write(self.ticks[:4])
+        self._write(self.ticks[4:])
+        self.assertEqual(len(load_tick_log(self.path, mmap=False)), 10)
+
+    def test_flushes_without_further_ticks(self):
+        recorder = TickRecorder(self.path, buffer_size=64, flush_interval=0.05)
+        try:
+            recorder.record(self.ticks[0])
+            self.assertEqual(len(load_tick_log(self.path, mmap=False)), 0)
+            deadline = time.monotonic() + 2
+            while recorder.records_written == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(len(load_tick_log(self.path, mmap=False)), 1)
+        finally:
+            recorder.close()
+
+    def test_replay_max_speed(self):
+        self._write(self.ticks)
+        replay = ReplayPriceMonitor(self.path, speed=0)
+        prices, status = [], []
+        replay.price_updated.connect(prices.append, Qt.ConnectionType.DirectConnection)
+        replay.connection_status.connect(status.append, Qt.ConnectionType.DirectConnection)
+        replay.start()
+        replay.thread.join(timeout=5.0)
+
+        self.assertEqual(prices, [t.price for t in self.ticks])
+        self.assertEqual(status, [True, False])
+
+    def test_replay_paced_by_event_time(self):
+        self._write(self.ticks)  # 90 ms of recorded time
+        replay = ReplayPriceMonitor(self.path, speed=0.5)
+        start = time.perf_counter()
+        replay.start()
+        replay.thread.join(timeout=5.0)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.18)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import sys
+import os
+import random
+import unittest
+
+import numpy as np
+
+# Add src to python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.append(src_dir)
+
+from core.tick_store import TickStore
+from core.trade_decoder import Tick
+
+
+class TestTickStore(unittest.TestCase):
+    def _feed(self, store, n, seed=1):
+        rng = random.Random(seed)
+        ticks = []
+        t, price = 1_700_000_000_000, 95000.0
+        for _ in range(n):
+            t += rng.randint(0, 400)
+            price += rng.uniform(-5, 5)
+            qty = rng.uniform(0.001, 2.0)
+            store.add(t, price, qty)
+            ticks.append((t, price, qty))
+        return ticks
+
+    def test_stats_match_brute_force(self):
+        store = TickStore(capacity=4096, windows={"1m": 60_000, "5m": 300_000})
+        ticks = self._feed(store, 3000)
+        now = ticks[-1][0]
+        for name, span in (("1m", 60_000), ("5m", 300_000)):
+            inside = [tk for tk in ticks if tk[0] > now - span]
+            s = store.stats(name)
+            prices = [p for _, p, _ in inside]
+            volume = sum(q for _, _, q in inside)
+            self.assertEqual(s.count, len(inside))
+            self.assertEqual((s.high, s.low), (max(prices), min(prices)))
+            self.assertAlmostEqual(s.volume, volume, places=6)
+            self.assertAlmostEqual(s.vwap, sum(p * q for _, p, q in inside) / volume, places=4)
+            self.assertAlmostEqual(s.ret, prices[-1] / prices[0] - 1.0)
+
+    def test_window_clamped_to_capacity(self):
+        store = TickStore(capacity=100, windows={"1h": 3_600_000})
+        ticks = self._feed(store, 1000)
+        s = store.stats("1h")
+        self.assertEqual(s.count, 100)
+        self.assertEqual(s.high, max(p for _, p, _ in ticks[-100:]))
+        self.assertEqual(s.low, min(p for _, p, _ in ticks[-100:]))
+
+    def test_view_is_contiguous_and_read_only(self):
+        store = TickStore(capacity=64)
+        ticks = self._feed(store, 150)  # Wrapped twice
+        v = store.view()
+        self.assertEqual(len(v), 64)
+        np.testing.assert_array_equal(v["price"], [p for _, p, _ in ticks[-64:]])
+        self.assertTrue(np.shares_memory(v, store._buf))
+        with self.assertRaises(ValueError):
+            v["price"][0] = 0.0
+
+    def test_memory_is_bounded(self):
+        store = TickStore(capacity=256)
+        nbytes = store._buf.nbytes
+        # Monotonic price: the low deque keeps every tick in the window
+        for i in range(5000):
+            store.add(i, 100.0 + i, 1.0)
+        self.assertEqual(store._buf.nbytes, nbytes)
+        for w in store._windows.values():
+            self.assertLessEqual(len(w.lows), 256)
+            self.assertLessEqual(len(w.highs), 256)
+        self.assertEqual(len(store), 256)
+        self.assertEqual(store.total, 5000)
+
+    def test_append_tick(self):
+        store = TickStore(capacity=8)
+        self.assertIsNone(store.stats("1m"))
+        store.append(Tick("btcusdt", 95000.0, 0.5, 1_700_000_000_000, 1))
+        self.assertEqual(store.stats("1m").vwap, 95000.0)
+        self.assertEqual(float(store.last()["qty"]), 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
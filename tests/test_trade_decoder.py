@@ -0,0 +1,77 @@
+import sys
+import os
+import unittest
+
+# Add src to python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.append(src_dir)
+
+from core.trade_decoder import FastTradeDecoder, JsonTradeDecoder, Tick, make_decoder
+
+DATA_FILE = os.path.join(current_dir, 'data', 'binance_trades.jsonl')
+
+
+class TestTradeDecoder(unittest.TestCase):
+    def setUp(self):
+        with open(DATA_FILE) as f:
+            self.payloads = [line.strip() for line in f if line.strip()]
+        self.fast = FastTradeDecoder()
+        self.json = JsonTradeDecoder()
+
+    def test_fast_matches_json_on_recorded_payloads(self):
+        for m in self.payloads:
+            self.assertEqual(self.fast.decode(m), self.json.decode(m))
+        self.assertEqual(self.fast.fallbacks, 0)
+
+    def test_fields(self):
+        m = '{"e":"trade","E":123456789,"s":"BTCUSDT","t":12345,"p":"9450.01","q":"0.100","T":123456785,"m":true,"M":true}'
+        self.assertEqual(self.fast.decode(m), Tick("btcusdt", 9450.01, 0.1, 123456785, 12345))
+
+    def test_combined_and_bytes(self):
+        m = self.payloads[0]
+        expected = self.json.decode(m)
+        combined = '{"stream":"btcusdt@trade","data":%s}' % m
+        self.assertEqual(self.fast.decode(combined), expected)
+        self.assertEqual(self.fast.decode(m.encode()), expected)
+        self.assertEqual(self.fast.fallbacks, 0)
+
+    def test_non_trade_frames_fall_back(self):
+        self.assertIsNone(self.fast.decode('{"result":null,"id":1}'))
+        self.assertEqual(self.fast.fallbacks, 1)
+
+    def test_reordered_trade_falls_back_to_json(self):
+        m = '{"e":"trade","p":"100.5","s":"ETHUSDT","q":"2","t":7,"T":99,"E":100}'
+        self.assertEqual(self.fast.decode(m), Tick("ethusdt", 100.5, 2.0, 99, 7))
+        self.assertEqual(self.fast.fallbacks, 1)
+
+
+class TestStreamDecoders(unittest.TestCase):
+    def test_agg_trade_uses_last_trade_id(self):
+        msg = ('{"e":"aggTrade","E":1700000000001,"s":"BTCUSDT","a":26129,"p":"95000.10","q":"0.30",'
+               '"f":100,"l":105,"T":1700000000000,"m":true,"M":true}')
+        self.assertEqual(make_decoder("aggTrade").decode(msg),
+                         Tick("btcusdt", 95000.10, 0.30, 1700000000000, 105))
+
+    def test_book_ticker_mid_price(self):
+        msg = '{"stream":"btcusdt@bookTicker","data":{"u":400900217,"s":"BTCUSDT","b":"95000.00","B":"1.2","a":"95000.20","A":"0.4"}}'
+        tick = make_decoder("bookTicker").decode(msg)
+        self.assertAlmostEqual(tick.price, 95000.10)
+        self.assertEqual((tick.symbol, tick.qty, tick.trade_id), ("btcusdt", 0.0, 400900217))
+
+    def test_mini_ticker_close(self):
+        msg = ('{"e":"24hrMiniTicker","E":1700000000000,"s":"BTCUSDT","c":"95010.5","o":"94000.0",'
+               '"h":"95500.0","l":"93900.0","v":"1000.0","q":"95000000.0"}')
+        self.assertEqual(make_decoder("miniTicker").decode(msg),
+                         Tick("btcusdt", 95010.5, 0.0, 1700000000000, 1700000000000))
+
+    def test_other_frames_ignored(self):
+        reply = '{"result":null,"id":1}'
+        for kind in ("aggTrade", "bookTicker", "miniTicker"):
+            self.assertIsNone(make_decoder(kind).decode(reply))
+        with self.assertRaises(ValueError):
+            make_decoder("depth")
+
+
+if __name__ == '__main__':
+    unittest.main()
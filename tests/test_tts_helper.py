@@ -0,0 +1,210 @@
+import sys
+import os
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import onnxruntime as ort
+
+# Add src to python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.join(os.path.dirname(current_dir), 'src')
+sys.path.append(src_dir)
+
+import services.helper as helper
+from services.helper import (Style, TextToSpeech, length_buckets, load_cfgs, load_text_processor,
+                             optimized_model_path, repeat_style, session_options, trim_batch)
+
+ONNX_DIR = os.path.join(os.path.dirname(current_dir), 'assets', 'onnx')
+
+
+class FakeBinding:
+    """Stands in for ort.IOBinding: remembers the bound OrtValues."""
+
+    def __init__(self):
+        self.inputs = {}
+        self.outputs = {}
+
+    def bind_ortvalue_input(self, name, value):
+        self.inputs[name] = value
+
+    def bind_ortvalue_output(self, name, value):
+        self.outputs[name] = value
+
+    def get_outputs(self):
+        return list(self.outputs.values())
+
+
+class FakeSession:
+    """Stands in for an ort.InferenceSession with the model's inputs and output shapes."""
+
+    def __init__(self, name, cfgs):
+        self.name = name
+        self.cfgs = cfgs
+        self.calls = 0
+
+    def get_outputs(self):
+        return [SimpleNamespace(name="denoised_latent" if self.name == "vector_est" else "output")]
+
+    def io_binding(self):
+        return FakeBinding()
+
+    def run_with_iobinding(self, binding, run_options=None):
+        # OrtValue.numpy() shares the bound buffer on CPU, so this writes in place
+        out, = self.run(None, {name: value.numpy() for name, value in binding.inputs.items()}, run_options)
+        np.copyto(binding.get_outputs()[0].numpy(), out)
+
+    def run(self, output_names, feeds, run_options=None):
+        if run_options is not None and run_options.terminate:
+            raise RuntimeError("Exiting due to terminate flag being set to true.")
+        self.calls += 1
+        if self.name == "dp":
+            # 0.05 s of audio per character
+            return [feeds["text_mask"].sum(axis=(1, 2)).astype(np.float32) * 0.05]
+        if self.name == "text_enc":
+            ids = feeds["text_ids"]
+            return [np.ones((ids.shape[0], 4, ids.shape[1]), dtype=np.float32)]
+        if self.name == "vector_est":
+            # Depends on the step and on the previous latent, so a wrong buffer or step shows
+            step = feeds["current_step"][:, None, None]
+            return [(feeds["noisy_latent"] * 0.5 + step + feeds["total_step"][:, None, None]) * feeds["latent_mask"]]
+        latent = feeds["latent"]
+        samples = latent.shape[2] * self.cfgs["ae"]["base_chunk_size"] * self.cfgs["ttl"]["chunk_compress_factor"]
+        return [np.ones((latent.shape[0], samples), dtype=np.float32)]
+
+
+def fake_tts():
+    cfgs = load_cfgs(ONNX_DIR)
+    sessions = [FakeSession(name, cfgs) for name in ("dp", "text_enc", "vector_est", "vocoder")]
+    return TextToSpeech(cfgs, load_text_processor(ONNX_DIR), *sessions)
+
+
+def fake_style(n=1):
+    return Style(np.zeros((n, 50, 256), dtype=np.float32), np.zeros((n, 8, 16), dtype=np.float32))
+
+
+class TestBatchHelpers(unittest.TestCase):
+    def test_length_buckets(self):
+        lengths = [30, 31, 29, 60, 62, 40, 33, 34, 35, 36, 37, 38]
+        buckets = length_buckets(lengths, 4)
+        self.assertEqual(sorted(i for b in buckets for i in b), list(range(len(lengths))))
+        for bucket in buckets:
+            self.assertLessEqual(len(bucket), 4)
+            sizes = [lengths[i] for i in bucket]
+            self.assertLessEqual(max(sizes), min(sizes) * 1.3)
+        self.assertIn([3, 4], buckets)  # The two long ones are not padded into a short batch
+        self.assertEqual(length_buckets([], 4), [])
+
+    def test_trim_batch(self):
+        wav = np.arange(20, dtype=np.float32).reshape(2, 10)
+        clips = trim_batch(wav, np.array([0.4, 2.0]), 10)
+        self.assertEqual([len(c) for c in clips], [4, 10])
+        np.testing.assert_array_equal(clips[0], [0, 1, 2, 3])
+
+    def test_batch_clips_match_single_calls(self):
+        tts = fake_tts()
+        texts = ["Bitcoin passed 95000 dollars.", "Bitcoin dropped below 100000 dollars."]
+        wav, duration = tts.batch(texts, ["en", "en"], repeat_style(fake_style(), 2), total_step=5)
+        clips = trim_batch(wav, duration, tts.sample_rate)
+        for text, clip in zip(texts, clips):
+            single, single_duration = tts(text, "en", fake_style(), total_step=5)
+            self.assertEqual(len(clip), int(tts.sample_rate * float(single_duration[0])))
+            self.assertLessEqual(len(clip), single.shape[1])
+        self.assertLess(len(clips[0]), len(clips[1]))
+        self.assertEqual(tts.vector_est_ort.calls, 5 * 3)
+
+    def test_stream_matches_call(self):
+        tts = fake_tts()
+        text = ("Bitcoin passed 95000 dollars. " * 6).strip() + " " + ("It is up 3 percent today. " * 6).strip()
+        chunks = list(tts.stream(text, "en", fake_style(), total_step=5))
+        self.assertEqual(len(chunks), 2)
+        wav, duration = tts(text, "en", fake_style(), total_step=5)
+        self.assertEqual(np.concatenate([w for w, _ in chunks], axis=1).shape, wav.shape)
+        self.assertAlmostEqual(sum(float(d[0]) for _, d in chunks), float(duration[0]), places=5)
+        # Chunks after the first start with the silence between them
+        self.assertTrue(np.all(chunks[1][0][0, :int(0.3 * tts.sample_rate)] == 0))
+        # Smaller chunks: one per sentence
+        self.assertEqual(len(list(tts.stream(text, "en", fake_style(), total_step=5, max_len=40))), 12)
+
+    def test_iobinding_matches_run(self):
+        tts = fake_tts()
+        rng = np.random.default_rng(0)
+        for bsz, total_step in ((1, 5), (2, 4), (3, 1)):
+            xt = rng.standard_normal((bsz, 8, 12)).astype(np.float32)
+            text_emb = np.ones((bsz, 4, 10), dtype=np.float32)
+            text_mask = np.ones((bsz, 1, 10), dtype=np.float32)
+            latent_mask = np.ones((bsz, 1, 12), dtype=np.float32)
+            latent_mask[0, :, 9:] = 0
+            style_ttl = fake_style(bsz).ttl
+            # Same noise for both; _denoise_iobinding reuses its xt as a buffer
+            expected = tts._denoise(xt.copy(), text_emb, style_ttl, text_mask, latent_mask, total_step)
+            got = tts._denoise_iobinding(xt.copy(), text_emb, style_ttl, text_mask, latent_mask, total_step)
+            # Odd and even total_step: the result is in either ping-pong buffer
+            np.testing.assert_array_equal(got, expected)
+        self.assertTrue(tts.use_iobinding)  # The default path is the one tested here
+
+    def test_warm_up_and_stage_times(self):
+        tts = fake_tts()
+        tts.warm_up(["Bitcoin passed 95000 dollars.", "Bitcoin dropped below 95000 dollars."], ["en", "en"],
+                    fake_style(), total_step=5)
+        self.assertEqual(tts.vector_est_ort.calls, 10)
+        self.assertIsNone(tts.stage_times)  # Off unless asked for
+        tts.stage_times = {}
+        tts("Bitcoin passed 95000 dollars.", "en", fake_style(), total_step=5)
+        self.assertEqual(sorted(tts.stage_times), ["dp", "text_enc", "vector_est", "vocoder"])
+
+
+class TestSessionOptions(unittest.TestCase):
+    def test_options(self):
+        opts = session_options({"intra_op_threads": 2, "execution_mode": "parallel", "graph_optimization": "basic",
+                                "mem_pattern": False})
+        self.assertEqual(opts.intra_op_num_threads, 2)
+        self.assertEqual(opts.execution_mode, ort.ExecutionMode.ORT_PARALLEL)
+        self.assertEqual(opts.graph_optimization_level, ort.GraphOptimizationLevel.ORT_ENABLE_BASIC)
+        self.assertFalse(opts.enable_mem_pattern)
+        self.assertTrue(opts.enable_cpu_mem_arena)
+        with self.assertRaises(Exception):  # Not set: ORT's own default applies
+            opts.get_session_config_entry("session.intra_op.allow_spinning")
+        quiet = session_options({"allow_spinning": False})
+        self.assertEqual(quiet.get_session_config_entry("session.intra_op.allow_spinning"), "0")
+        pinned = session_options({"cpu_affinity": [2, 3, 5]})
+        self.assertEqual(pinned.intra_op_num_threads, 3)
+        # The calling thread is the first intra-op thread; ORT counts CPUs from 1
+        self.assertEqual(pinned.get_session_config_entry("session.intra_op_thread_affinities"), "4;6")
+        for bad in ({"threads": 2}, {"graph_optimization": "max"}, {"intra_op_threads": 2, "cpu_affinity": [1]}):
+            with self.assertRaises(ValueError):
+                session_options(bad)
+
+    def test_optimized_model_path(self):
+        model = os.path.join(ONNX_DIR, "tts.json")  # Any file: only its name, size and mtime matter
+        path = optimized_model_path(model, "cache")
+        self.assertEqual(os.path.dirname(path), "cache")
+        self.assertTrue(os.path.basename(path).startswith("tts."))
+        self.assertEqual(path, optimized_model_path(model, "cache", {"intra_op_threads": 4}))
+        self.assertNotEqual(path, optimized_model_path(model, "cache", {"graph_optimization": "basic"}))
+
+
+class TestLoadOnnxAll(unittest.TestCase):
+    def test_parallel_keeps_order(self):
+        threads = set()
+
+        def fake_load(onnx_path, opts, providers, optimized_path=None):
+            threads.add(threading.current_thread().name)
+            time.sleep(0.1)
+            return os.path.basename(onnx_path)
+
+        with mock.patch.object(helper, "load_onnx", fake_load):
+            start = time.perf_counter()
+            sessions = helper.load_onnx_all(ONNX_DIR, None, ["CPUExecutionProvider"])
+            elapsed = time.perf_counter() - start
+        self.assertEqual(sessions, ("duration_predictor.onnx", "text_encoder.onnx", "vector_estimator.onnx",
+                                    "vocoder.onnx"))
+        self.assertEqual(len(threads), 4)
+        self.assertLess(elapsed, 0.3)
+
+
+if __name__ == '__main__':
+    unittest.main()